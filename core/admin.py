@@ -0,0 +1,162 @@
+from django import forms
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.admin import helpers
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.exceptions import ValidationError
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.db.models import Max, Min
+from django.template.response import TemplateResponse
+from django.utils.functional import cached_property
+
+from . import audit, changelog, counters, display
+from .models import ChangeLogEntry, Webhook
+
+
+class AtLeast(int):
+    """A lower bound on a row count; the changelist prints "more than N"."""
+
+    def __str__(self):
+        return f"more than {int(self) - 1}"
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Counts exactly up to ADMIN_EXACT_COUNT_LIMIT rows. Beyond that, an
+    unfiltered changelist estimates its size from the primary key range, so
+    it never scans a large table just to print its size; a filtered or
+    searched one only reports "more than ADMIN_EXACT_COUNT_LIMIT", and pages
+    past that bound are shown empty rather than rejected.
+    """
+
+    @cached_property
+    def count(self):
+        limit = settings.ADMIN_EXACT_COUNT_LIMIT
+        bounded = self.object_list[:limit + 1].count()
+        if bounded <= limit:
+            return bounded
+        if self.object_list.query.where:
+            return AtLeast(bounded)
+        model = self.object_list.model
+        bounds = model._base_manager.aggregate(low=Min('pk'), high=Max('pk'))
+        return max(bounds['high'] - bounds['low'] + 1, bounded)
+
+    def validate_number(self, number):
+        if not isinstance(self.count, AtLeast):
+            return super().validate_number(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger("That page number is not an integer")
+        if number < 1:
+            raise EmptyPage("That page number is less than 1")
+        return number
+
+    def page(self, number):
+        if not isinstance(self.count, AtLeast):
+            return super().page(number)
+        # The real end is unknown, so a page is never cut short at the bound.
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        return self._get_page(self.object_list[bottom:bottom + self.per_page], number, self)
+
+
+class BoundedRelatedFieldListFilter(admin.RelatedFieldListFilter):
+    """Offers at most ADMIN_FILTER_CHOICES_LIMIT related objects in the sidebar."""
+
+    def field_choices(self, field, request, model_admin):
+        queryset = field.remote_field.model._default_manager.all()
+        ordering = self.field_admin_ordering(field, request, model_admin)
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        else:
+            queryset = queryset.order_by('pk')
+        choices = [(obj.pk, str(obj)) for obj in queryset[:settings.ADMIN_FILTER_CHOICES_LIMIT]]
+        shown = {str(pk) for pk, label in choices}
+        selected = []
+        for value in self.lookup_val or []:
+            try:
+                pk = field.target_field.to_python(value)
+            except ValidationError:
+                continue
+            if str(pk) not in shown:
+                selected.append(pk)
+        if selected:
+            choices.extend((obj.pk, str(obj)) for obj in queryset.filter(pk__in=selected))
+        return choices
+
+
+class ScalableModelAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
+
+
+def update_selected(queryset, **values):
+    """
+    Apply `values` to every selected row in one UPDATE and record a single
+    change log batch and the audit trail for them, instead of a save() and
+    signal per row.
+    """
+    object_ids = list(queryset.values_list('pk', flat=True))
+    values = display.with_names(queryset.model, values)
+    with counters.recounting(queryset.model, object_ids, values), audit.auditing(queryset.model, object_ids, values):
+        updated = queryset.update(**values)
+    changelog.record(queryset.model, object_ids, ChangeLogEntry.UPDATE)
+    return updated
+
+
+def move_action(field_name, description):
+    """
+    Build an admin action that moves the selected rows to another value of
+    the foreign key `field_name`, picked on an intermediate page.
+    """
+
+    def move_selected(modeladmin, request, queryset):
+        opts = modeladmin.model._meta
+        field = opts.get_field(field_name)
+        related_model = field.remote_field.model
+
+        class MoveForm(forms.Form):
+            destination = forms.ModelChoiceField(
+                queryset=related_model._default_manager.all(),
+                widget=AutocompleteSelect(field, modeladmin.admin_site),
+                label=field.verbose_name.capitalize(),
+            )
+
+        if 'apply' in request.POST:
+            form = MoveForm(request.POST)
+            if form.is_valid():
+                destination = form.cleaned_data['destination']
+                updated = update_selected(queryset, **{field_name: destination})
+                modeladmin.message_user(request, f"Moved {updated} {opts.verbose_name_plural} to {destination}.")
+                return None
+        else:
+            form = MoveForm()
+
+        select_across = request.POST.get('select_across') == '1'
+        selected = request.POST.getlist(helpers.ACTION_CHECKBOX_NAME)
+        context = {
+            **modeladmin.admin_site.each_context(request),
+            'title': description,
+            'opts': opts,
+            'objects_name': opts.verbose_name_plural,
+            'form': form,
+            'media': modeladmin.media + form.media,
+            'action': move_selected.__name__,
+            'action_checkbox_name': helpers.ACTION_CHECKBOX_NAME,
+            'selected': selected,
+            'selected_count': queryset.count() if select_across else len(selected),
+            'select_across': select_across,
+        }
+        return TemplateResponse(request, 'admin/core/move_selected.html', context)
+
+    move_selected.__name__ = f'move_to_{field_name}'
+    return admin.action(description=description)(move_selected)
+
+
+@admin.register(Webhook)
+class WebhookAdmin(admin.ModelAdmin):
+    list_display = ('name', 'url', 'collections', 'is_active', 'delivered_version', 'delivered_at')
+    list_filter = ('is_active',)
+    readonly_fields = ('delivered_version', 'delivered_at')
@@ -0,0 +1,14 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'core'
+
+    def ready(self):
+        from . import audit, counters, display, images, signals
+        signals.connect()
+        counters.connect()
+        audit.connect()
+        images.connect()
+        display.connect()
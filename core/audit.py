@@ -0,0 +1,252 @@
+"""
+Field-level audit trail of changes to the CMS collections.
+
+Model signals turn each save or delete into an AuditEntry holding
+{field: [old, new]} and the user behind the current request. Entries are
+queued in memory once the surrounding transaction commits, and a background
+writer inserts them in batches, so admin saves never wait on the audit table.
+A batch the database refuses is put back and retried on the next flush,
+keeping at most AUDIT_MAX_QUEUE entries. The queue is flushed when the process
+exits. Encrypted fields are recorded as changed but never with their values.
+"""
+import atexit
+import logging
+import os
+import threading
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+
+from django.conf import settings
+from django.db import DatabaseError, connections, transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from . import crypto
+from .fields import Ciphertext, EncryptedCharField
+from .models import AuditEntry, ChangeLogEntry
+from .registry import get_collection, get_models
+from .signals import deletes_are_quiet
+
+logger = logging.getLogger(__name__)
+
+REDACTED = '[redacted]'
+
+current_request = ContextVar('audit_request', default=None)
+
+
+class AuditMiddleware:
+    """Makes the current request's user available to the audit signals."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = current_request.set(request)
+        try:
+            return self.get_response(request)
+        finally:
+            current_request.reset(token)
+
+
+def current_user():
+    """(id, username) of the authenticated user behind this request, if any."""
+    user = getattr(current_request.get(), 'user', None)
+    if user is None or not user.is_authenticated:
+        return None, ''
+    return user.pk, user.get_username()
+
+
+class AuditWriter:
+    def __init__(self):
+        self.queue = deque()
+        self.flush_lock = threading.Lock()
+        self.start_lock = threading.Lock()
+        self.wake = threading.Event()
+        self.stopping = threading.Event()
+        self.thread = None
+        self.pid = None
+
+    def put(self, entry):
+        self.queue.append(entry)
+        if settings.AUDIT_WRITER_THREAD:
+            self.start()
+            if len(self.queue) >= settings.AUDIT_BATCH_SIZE:
+                self.wake.set()
+        elif len(self.queue) >= settings.AUDIT_BATCH_SIZE:
+            self.flush()
+
+    def start(self):
+        # Started on first use, and again in a forked worker.
+        if self.pid == os.getpid() and self.thread.is_alive():
+            return
+        with self.start_lock:
+            if self.pid != os.getpid() or not self.thread.is_alive():
+                self.stopping.clear()
+                self.thread = threading.Thread(target=self.run, name='audit-writer', daemon=True)
+                self.thread.start()
+                self.pid = os.getpid()
+
+    def run(self):
+        try:
+            while not self.stopping.is_set():
+                self.wake.wait(settings.AUDIT_FLUSH_INTERVAL)
+                self.wake.clear()
+                self.flush()
+        finally:
+            connections.close_all()
+
+    def flush(self):
+        """Insert everything queued so far; return how many entries were written."""
+        written = 0
+        with self.flush_lock:
+            while self.queue:
+                batch = []
+                while self.queue and len(batch) < settings.AUDIT_BATCH_SIZE:
+                    batch.append(self.queue.popleft())
+                try:
+                    with transaction.atomic():
+                        AuditEntry.objects.bulk_create(batch)
+                except DatabaseError:
+                    logger.exception("Could not write %d audit entries; retrying on the next flush.", len(batch))
+                    self.requeue(batch)
+                    break
+                written += len(batch)
+        return written
+
+    def requeue(self, batch):
+        """Put a failed batch back in front; past AUDIT_MAX_QUEUE the oldest entries are dropped."""
+        self.queue.extendleft(reversed(batch))
+        overflow = len(self.queue) - settings.AUDIT_MAX_QUEUE
+        if overflow > 0:
+            for _ in range(overflow):
+                self.queue.popleft()
+            logger.error("Dropped %d audit entries; the queue is full.", overflow)
+
+    def stop(self):
+        """Stop the writer thread and flush what is left in this thread."""
+        self.stopping.set()
+        self.wake.set()
+        if self.thread is not None and self.pid == os.getpid():
+            self.thread.join(timeout=10)
+        self.thread = self.pid = None
+        return self.flush()
+
+
+writer = AuditWriter()
+
+
+def audited_fields(model, field_names=None):
+    return [
+        field for field in model._meta.concrete_fields
+        if not field.primary_key and (field_names is None or field.name in field_names or field.attname in field_names)
+    ]
+
+
+def prepare(field, value):
+    if isinstance(field, EncryptedCharField):
+        return REDACTED
+    return field.get_prep_value(value)
+
+
+def has_changed(field, old, new):
+    if isinstance(field, EncryptedCharField):
+        # `values()` returns the stored token; the instance holds the same
+        # token if the field was never read, or the plaintext otherwise.
+        if isinstance(new, Ciphertext) or old is None or new is None:
+            return old != new
+        return (crypto.decrypt(old) if isinstance(old, Ciphertext) else old) != new
+    return field.get_prep_value(old) != field.get_prep_value(new)
+
+
+def diff(fields, before, after):
+    return {
+        field.name: [prepare(field, before[field.attname]), prepare(field, after[field.attname])]
+        for field in fields if has_changed(field, before[field.attname], after[field.attname])
+    }
+
+
+def snapshot(instance, fields):
+    return {field.attname: instance.__dict__.get(field.attname) for field in fields}
+
+
+def record(model, object_id, action, changes):
+    """Queue one entry for writing once the current transaction commits."""
+    user_id, username = current_user()
+    entry = AuditEntry(
+        collection=get_collection(model), object_id=object_id, action=action,
+        changes=changes, user_id=user_id, username=username,
+    )
+    transaction.on_commit(partial(writer.put, entry))
+
+
+def remember_state(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or instance._state.adding:
+        return
+    fields = audited_fields(sender, update_fields)
+    instance._audit_before = (
+        sender._base_manager.filter(pk=instance.pk).values(*(field.attname for field in fields)).first()
+    )
+
+
+def record_created(model, instances):
+    """Record new rows as inserted; for rows created without save(), e.g. by bulk_create()."""
+    fields = audited_fields(model)
+    for instance in instances:
+        changes = diff(fields, dict.fromkeys(field.attname for field in fields), snapshot(instance, fields))
+        record(model, instance.pk, ChangeLogEntry.INSERT, changes)
+
+
+def audit_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    before = instance.__dict__.pop('_audit_before', None)
+    if created:
+        record_created(sender, [instance])
+    elif before is not None:
+        fields = audited_fields(sender, update_fields)
+        changes = diff(fields, before, snapshot(instance, fields))
+        if changes:
+            record(sender, instance.pk, ChangeLogEntry.UPDATE, changes)
+
+
+def audit_delete(sender, instance, **kwargs):
+    if deletes_are_quiet(sender):
+        return
+    fields = audited_fields(sender)
+    changes = diff(fields, snapshot(instance, fields), dict.fromkeys(field.attname for field in fields))
+    record(sender, instance.pk, ChangeLogEntry.DELETE, changes)
+
+
+def rows(model, object_ids, fields):
+    return {
+        row.pop('pk'): row
+        for row in model._base_manager.filter(pk__in=object_ids).values('pk', *(field.attname for field in fields))
+    }
+
+
+@contextmanager
+def auditing(model, object_ids, field_names=None):
+    """Record the changes a bulk update inside the block makes to the rows."""
+    fields = audited_fields(model, field_names)
+    before = rows(model, object_ids, fields)
+    yield
+    for object_id, after in rows(model, object_ids, fields).items():
+        changes = diff(fields, before[object_id], after)
+        if changes:
+            record(model, object_id, ChangeLogEntry.UPDATE, changes)
+
+
+def history(collection, object_id):
+    """Every recorded change to one object, newest first."""
+    return AuditEntry.objects.filter(collection=collection, object_id=object_id).order_by('-id')
+
+
+def connect():
+    for collection, model in get_models().items():
+        pre_save.connect(remember_state, sender=model, dispatch_uid=f'audit-pre-save-{collection}')
+        post_save.connect(audit_save, sender=model, dispatch_uid=f'audit-save-{collection}')
+        post_delete.connect(audit_delete, sender=model, dispatch_uid=f'audit-delete-{collection}')
+    # Registered once, however often connect() runs.
+    atexit.unregister(writer.stop)
+    atexit.register(writer.stop)
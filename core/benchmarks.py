@@ -0,0 +1,174 @@
+"""
+Micro-benchmarks run by `manage.py benchmark`. Each scenario seeds its own
+rows in a throwaway test database and returns a list of (label, value) rows.
+"""
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, override_settings
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils.module_loading import import_string
+
+from . import crypto
+
+SCENARIOS = {}
+
+
+def scenario(name):
+    def register(func):
+        SCENARIOS[name] = func
+        return func
+    return register
+
+
+@contextmanager
+def throwaway_database():
+    """Point the default connection at a fresh, migrated test database."""
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def median_ms(samples):
+    return statistics.median(samples) * 1000
+
+
+def time_requests(client, path, repeat, **extra):
+    client.get(path, **extra)
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get(path, **extra)
+        samples.append(time.perf_counter() - started)
+        assert response.status_code == 200, response.status_code
+    return samples
+
+
+@contextmanager
+def replaced(module, name, value):
+    """Temporarily set `module.name` to `value`."""
+    original = getattr(module, name)
+    setattr(module, name, value)
+    try:
+        yield
+    finally:
+        setattr(module, name, original)
+
+
+@contextmanager
+def timed(module, name, samples):
+    """Temporarily wrap `module.name`, appending each call's duration to `samples`."""
+    original = getattr(module, name)
+
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            samples.append(time.perf_counter() - started)
+
+    setattr(module, name, wrapper)
+    try:
+        yield
+    finally:
+        setattr(module, name, original)
+
+
+@scenario('testing-accounts')
+def testing_accounts(rows, repeat):
+    from technical_information.models import TestingAccount, TestingAccountEnvironment
+
+    crypto.get_fernet.cache_clear()
+    started = time.perf_counter()
+    crypto.get_fernet()
+    key_derivation = time.perf_counter() - started
+
+    environment = TestingAccountEnvironment.objects.create(name='Benchmark')
+    TestingAccount.objects.bulk_create([
+        TestingAccount(
+            label=f'Account {index}', description='Benchmark account', username=f'user{index}',
+            password=f'password-{index}', environment=environment, environment_name=environment.name,
+        )
+        for index in range(rows)
+    ])
+
+    client = Client()
+    path = '/api/testing-accounts/'
+    # The baseline hands the stored tokens through undecrypted, as a plain
+    # CharField column would.
+    with replaced(crypto, 'decrypt_many', lambda tokens: [str(token) for token in tokens]):
+        plaintext_ms = median_ms(time_requests(client, path, repeat))
+    decrypt_samples = []
+    with timed(crypto, 'decrypt_many', decrypt_samples):
+        encrypted_ms = median_ms(time_requests(client, path, repeat))
+    return [
+        ('rows', rows),
+        ('key derivation, once per process (ms)', round(key_derivation * 1000, 2)),
+        (f'GET {path} plaintext baseline median (ms)', round(plaintext_ms, 2)),
+        (f'GET {path} median (ms)', round(encrypted_ms, 2)),
+        ('decryption of every row per request (ms)', round(median_ms(decrypt_samples), 2)),
+        ('overhead vs. plaintext (%)', round((encrypted_ms - plaintext_ms) / plaintext_ms * 100, 1)),
+    ]
+
+
+STOCK_MIDDLEWARE = {
+    'core.middleware.LightSessionMiddleware': 'django.contrib.sessions.middleware.SessionMiddleware',
+    'core.middleware.LightCsrfViewMiddleware': 'django.middleware.csrf.CsrfViewMiddleware',
+    'core.middleware.LightAuthenticationMiddleware': 'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.LightMessageMiddleware': 'django.contrib.messages.middleware.MessageMiddleware',
+}
+
+
+def middleware_chain(paths):
+    """The middleware in `paths` wrapped around a view that does nothing."""
+    handler = lambda request: HttpResponse()
+    for path in reversed(paths):
+        try:
+            handler = import_string(path)(handler)
+        except MiddlewareNotUsed:
+            pass
+    return handler
+
+
+@scenario('middleware')
+def middleware(rows, repeat):
+    from general.models import Tool, ToolCategory
+
+    category = ToolCategory.objects.create(name='Benchmark')
+    Tool.objects.bulk_create([
+        Tool(name=f'Tool {index}', description='Benchmark tool', link='https://example.com', category=category)
+        for index in range(rows)
+    ])
+    light = list(settings.MIDDLEWARE)
+    stock = [STOCK_MIDDLEWARE.get(path, path) for path in light]
+    request = RequestFactory().get('/api/tools/')
+    calls = 200
+
+    results = [('rows', rows)]
+    chain_us = {}
+    for label, paths in (('stock', stock), ('light', light)):
+        chain = middleware_chain(paths)
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for _ in range(calls):
+                chain(request)
+            samples.append((time.perf_counter() - started) / calls)
+        chain_us[label] = statistics.median(samples) * 1_000_000
+        results.append((f'middleware only, {label} (us/request)', round(chain_us[label], 1)))
+    results.append(('saved per request (us)', round(chain_us['stock'] - chain_us['light'], 1)))
+
+    for label, paths in (('stock', stock), ('light', light)):
+        with override_settings(MIDDLEWARE=paths):
+            request_ms = median_ms(time_requests(Client(), '/api/tools/', repeat))
+        results.append((f'GET /api/tools/ median, {label} (ms)', round(request_ms, 3)))
+    return results
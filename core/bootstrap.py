@@ -0,0 +1,89 @@
+"""
+Builds the /api/bootstrap/ payload: the portal's first-paint collections in a
+single response, keyed by the path segment of the endpoint they mirror.
+"""
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, connections
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from general.views import ImportantLinksListView, TeamMemberListView, ToolCategoryListView
+from technical_information.views import SyntheticEventsListView
+
+from . import changelog
+from .dispatch import internal_request
+
+SECTIONS = {
+    'tools': (ToolCategoryListView, ['tool-categories', 'tools']),
+    'important-links': (ImportantLinksListView, ['link-categories', 'important-links']),
+    'team-members': (TeamMemberListView, ['roles', 'team-members']),
+    'synthetic-events': (SyntheticEventsListView, ['synthetic-event-targets', 'synthetic-event-types', 'synthetic-events']),
+}
+
+_executor = ThreadPoolExecutor(max_workers=len(SECTIONS), thread_name_prefix='bootstrap')
+
+
+def render_section(view_class, request):
+    """The section's JSON, as rendered by the view or already built by SQLite."""
+    view = view_class(request=request, args=(), kwargs={}, format_kwarg=None)
+    response = view.list(request)
+    if isinstance(response, Response):
+        return JSONRenderer().render(response.data)
+    return response.content
+
+
+def render_section_in_thread(view_class, request):
+    # Pool threads keep their connections between builds and, like request
+    # threads, only drop them once CONN_MAX_AGE has passed or they broke.
+    for conn in connections.all(initialized_only=True):
+        conn.close_if_unusable_or_obsolete()
+    return render_section(view_class, request)
+
+
+def fans_out():
+    if connection.in_atomic_block:
+        # Other connections cannot see rows written by an open transaction.
+        return False
+    if settings.BOOTSTRAP_CONCURRENT is None:
+        # SQLite queries run in this process, so threads only add connections.
+        return connection.vendor != 'sqlite'
+    return settings.BOOTSTRAP_CONCURRENT
+
+
+def build(request):
+    """{section name: rendered JSON}"""
+    internal = Request(internal_request(request, request.path))
+    if fans_out():
+        futures = {
+            name: _executor.submit(render_section_in_thread, view_class, internal)
+            for name, (view_class, collections) in SECTIONS.items()
+        }
+        return {name: future.result() for name, future in futures.items()}
+    return {name: render_section(view_class, internal) for name, (view_class, collections) in SECTIONS.items()}
+
+
+def cache_key(request):
+    versions = changelog.collection_versions()
+    parts = [request.scheme, request.get_host()]
+    for name, (view_class, collections) in SECTIONS.items():
+        parts.extend(f'{collection}={versions.get(collection, 0)}' for collection in collections)
+    return 'bootstrap:' + hashlib.sha256('|'.join(parts).encode()).hexdigest()
+
+
+def get_content(request):
+    """Return the rendered payload, reusing the cached copy until a collection changes."""
+    key = cache_key(request)
+    content = cache.get(key)
+    if content is None:
+        # The same bytes JSONRenderer would write for the whole dict.
+        content = b'{' + b','.join(
+            json.dumps(name).encode() + b':' + section for name, section in build(request).items()
+        ) + b'}'
+        cache.set(key, content, settings.BOOTSTRAP_CACHE_TIMEOUT)
+    return content
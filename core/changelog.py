@@ -0,0 +1,116 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models import Max, Subquery
+
+from . import webhooks
+from .models import ChangeLogEntry
+from .registry import COLLECTIONS, FEEDS, get_collection, get_model
+
+_feed_serializers = {}
+
+
+def record(model, object_ids, action):
+    """Append one change log entry per object id and return the new version."""
+    collection = get_collection(model)
+    if collection is None or not object_ids:
+        return None
+    entries = ChangeLogEntry.objects.bulk_create([
+        ChangeLogEntry(collection=collection, object_id=object_id, action=action)
+        for object_id in object_ids
+    ])
+    transaction.on_commit(partial(webhooks.notify, collection))
+    return entries[-1].pk
+
+
+def current_version(collection=None):
+    queryset = ChangeLogEntry.objects.all()
+    if collection is not None:
+        queryset = queryset.filter(collection=collection)
+    return queryset.aggregate(version=Max('id'))['version'] or 0
+
+
+def collection_versions():
+    """{collection: latest version} for every collection with changes."""
+    # One seek per collection on changelog_collection_id_idx, in one query,
+    # rather than a GROUP BY over the whole (unpruned) log.
+    latest = {
+        f'v{index}': Subquery(ChangeLogEntry.objects.filter(collection=collection).order_by('-id').values('id')[:1])
+        for index, collection in enumerate(COLLECTIONS)
+    }
+    row = ChangeLogEntry.objects.order_by().annotate(**latest).values(*latest)[:1]
+    versions = next(iter(row), {})
+    return {
+        collection: versions[f'v{index}']
+        for index, collection in enumerate(COLLECTIONS) if versions.get(f'v{index}')
+    }
+
+
+def get_feed(collection):
+    """(serializer class, queryset) for `collection`'s rows in the change feed."""
+    if collection not in _feed_serializers:
+        # Imported here so worker boot (signals connect at ready()) doesn't pay
+        # for DRF's serializer machinery.
+        from django.utils.module_loading import import_string
+        from rest_framework import serializers
+
+        feed = FEEDS[collection]
+        model = get_model(collection)
+        base = import_string(feed['serializer'])
+        declared = base._declared_fields
+        fields = [
+            name for name in base.Meta.fields
+            # Child rows (e.g. a category's tools) are fed as their own collection.
+            if name not in feed.get('exclude', ())
+            and not isinstance(declared.get(name), serializers.ListSerializer)
+        ]
+        # Foreign keys the endpoint conveys by nesting; the others are sent as ids.
+        nested = [field.name for field in model._meta.concrete_fields if field.is_relation and field.name in declared]
+        fields += [field.name for field in model._meta.concrete_fields if field.is_relation and field.name not in fields]
+        # The endpoint's list serializer may prepare fields the feed drops
+        # (e.g. batch-decrypting passwords), so rows are listed plainly.
+        meta = type('Meta', (base.Meta,), {'fields': fields, 'list_serializer_class': serializers.ListSerializer})
+        serializer = type(f'{model.__name__}FeedSerializer', (base,), {'Meta': meta})
+        queryset = model._default_manager.filter(**feed.get('filter', {})).select_related(*nested)
+        _feed_serializers[collection] = (serializer, queryset)
+    return _feed_serializers[collection]
+
+
+def changes_since(cursor, limit, context=None):
+    """
+    Collapse the log entries after `cursor` into the current row for every
+    changed object and a tombstone id for every deleted one, or one the
+    collection's public endpoint no longer shows.
+    """
+    entries = list(
+        ChangeLogEntry.objects.filter(id__gt=cursor)
+        .order_by('id')
+        .values_list('id', 'collection', 'object_id', 'action')[:limit]
+    )
+
+    latest = {}
+    for entry_id, collection, object_id, action in entries:
+        latest[(collection, object_id)] = action
+
+    changed = {}
+    for (collection, object_id), action in latest.items():
+        bucket = changed.setdefault(collection, {'upserted': [], 'deleted': []})
+        bucket['deleted' if action == ChangeLogEntry.DELETE else 'upserted'].append(object_id)
+
+    result = {}
+    for collection, bucket in changed.items():
+        serializer, queryset = get_feed(collection)
+        rows = queryset.filter(pk__in=bucket['upserted']).order_by('pk')
+        data = serializer(rows, many=True, context=context or {}).data
+        found = {row['id'] for row in data}
+        missing = [object_id for object_id in bucket['upserted'] if object_id not in found]
+        result[collection] = {
+            'upserted': data,
+            'deleted': sorted(bucket['deleted'] + missing),
+        }
+
+    return {
+        'cursor': entries[-1][0] if entries else cursor,
+        'has_more': len(entries) == limit,
+        'changes': result,
+    }
@@ -0,0 +1,160 @@
+"""
+Denormalized child counts on parent rows, e.g. ToolCategory.tool_count.
+
+Single saves and deletes adjust the parent with an atomic
+`UPDATE ... SET count = count + 1`, so concurrent writers never lose an
+increment. Bulk writes that bypass signals (queryset.update(), bulk_create())
+and fixture loads recount the affected parents from the child table instead.
+"""
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from . import changelog
+from .signals import deletes_are_quiet
+from .models import ChangeLogEntry
+from .registry import get_collection
+
+# child model, foreign key on the child, counter field on the parent
+COUNTERS = [
+    ('general.Tool', 'category', 'tool_count'),
+    ('general.ImportantLinks', 'category', 'link_count'),
+    ('general.TeamMember', 'role', 'member_count'),
+    ('technical_information.SyntheticEvent', 'target', 'event_count'),
+]
+
+
+def get_counters(model, field_names=None):
+    """[(foreign key field, counter field)] kept for `model`'s parents."""
+    return [
+        (model._meta.get_field(fk_name), counter)
+        for label, fk_name, counter in COUNTERS
+        if label == model._meta.label and (field_names is None or fk_name in field_names)
+    ]
+
+
+def count_subquery(child_model, fk_name):
+    """Number of `child_model` rows pointing at the outer parent row."""
+    counts = (
+        child_model._default_manager.filter(**{fk_name: OuterRef('pk')})
+        .order_by().values(fk_name).annotate(count=Count('pk')).values('count')
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+def adjust(field, counter, parent_id, delta):
+    if parent_id is None:
+        return
+    parent_model = field.remote_field.model
+    # Never below zero, even if the counter missed an insert.
+    parent_model._default_manager.filter(pk=parent_id).update(**{counter: Greatest(F(counter) + delta, 0)})
+    changelog.record(parent_model, [parent_id], ChangeLogEntry.UPDATE)
+
+
+def recount(field, counter, parent_ids):
+    parent_ids = [parent_id for parent_id in parent_ids if parent_id is not None]
+    if not parent_ids:
+        return
+    parent_model = field.remote_field.model
+    parent_model._default_manager.filter(pk__in=parent_ids).update(
+        **{counter: count_subquery(field.model, field.name)}
+    )
+    changelog.record(parent_model, parent_ids, ChangeLogEntry.UPDATE)
+
+
+def parent_ids(model, object_ids, field_names=None):
+    """{(foreign key field, counter): parent ids} referenced by the given rows."""
+    return {
+        (field, counter): set(
+            model._default_manager.filter(pk__in=object_ids).order_by()
+            .values_list(field.attname, flat=True).distinct()
+        )
+        for field, counter in get_counters(model, field_names)
+    }
+
+
+def recount_parents(model, object_ids):
+    """Recount every parent the given rows point at, e.g. after bulk_create()."""
+    for key, ids in parent_ids(model, object_ids).items():
+        recount(*key, ids)
+
+
+@contextmanager
+def recounting(model, object_ids, field_names=None):
+    """Recount the parents the rows point at before and after the block."""
+    before = parent_ids(model, object_ids, field_names)
+    yield
+    after = parent_ids(model, object_ids, field_names)
+    for key, ids in before.items():
+        recount(*key, ids | after[key])
+
+
+def remember_parents(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or instance._state.adding:
+        return
+    counted = get_counters(sender, update_fields)
+    if counted:
+        instance._counted_parents = (
+            sender._default_manager.filter(pk=instance.pk)
+            .values(*(field.attname for field, counter in counted)).first()
+        )
+
+
+def count_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        # Fixtures (loaddata) may replace rows wholesale, so count from scratch.
+        for field, counter in get_counters(sender):
+            recount(field, counter, [getattr(instance, field.attname)])
+        return
+    previous = instance.__dict__.pop('_counted_parents', None)
+    for field, counter in get_counters(sender):
+        current = getattr(instance, field.attname)
+        if created:
+            adjust(field, counter, current, 1)
+        elif previous is not None and field.attname in previous and previous[field.attname] != current:
+            adjust(field, counter, previous[field.attname], -1)
+            adjust(field, counter, current, 1)
+
+
+def recount_loaded_parent(sender, instance, raw=False, **kwargs):
+    # A parent loaded from a fixture brings its own counter value, which may
+    # not match the children already in the table.
+    if not raw:
+        return
+    for label, fk_name, counter in COUNTERS:
+        field = apps.get_model(label)._meta.get_field(fk_name)
+        if field.remote_field.model is sender:
+            recount(field, counter, [instance.pk])
+
+
+def count_delete(sender, instance, **kwargs):
+    if deletes_are_quiet(sender):
+        return
+    for field, counter in get_counters(sender):
+        adjust(field, counter, getattr(instance, field.attname), -1)
+
+
+def summary():
+    """{parent collection: [{id, name, count}]}, one single-table read each."""
+    result = {}
+    for label, fk_name, counter in COUNTERS:
+        parent_model = apps.get_model(label)._meta.get_field(fk_name).remote_field.model
+        result[get_collection(parent_model)] = list(
+            parent_model._default_manager.order_by('pk').values('id', 'name', count=F(counter))
+        )
+    return result
+
+
+def connect():
+    for label in {label for label, fk_name, counter in COUNTERS}:
+        model = apps.get_model(label)
+        uid = f'counters-{label}'
+        pre_save.connect(remember_parents, sender=model, dispatch_uid=f'{uid}-pre-save')
+        post_save.connect(count_save, sender=model, dispatch_uid=f'{uid}-save')
+        post_delete.connect(count_delete, sender=model, dispatch_uid=f'{uid}-delete')
+    for label, fk_name, counter in COUNTERS:
+        parent_model = apps.get_model(label)._meta.get_field(fk_name).remote_field.model
+        post_save.connect(recount_loaded_parent, sender=parent_model, dispatch_uid=f'counters-parent-{parent_model._meta.label}')
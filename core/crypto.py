@@ -0,0 +1,59 @@
+"""
+Symmetric encryption for secrets stored in the database.
+
+The Fernet key is derived from FIELD_ENCRYPTION_KEY with PBKDF2 once per
+process; every encrypt and decrypt afterwards re-uses the same cipher.
+Plaintexts are never cached: each read decrypts again, so secrets only stay
+in memory as long as the objects that asked for them.
+"""
+import base64
+import functools
+
+from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from django.conf import settings
+
+TOKEN_PREFIX = 'gAAAAA'
+SALT = b'renovators.core.crypto'
+
+
+@functools.cache
+def get_fernet():
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=SALT,
+        iterations=settings.FIELD_ENCRYPTION_KDF_ITERATIONS,
+    )
+    key = kdf.derive(settings.FIELD_ENCRYPTION_KEY.encode())
+    return Fernet(base64.urlsafe_b64encode(key))
+
+
+def looks_like_token(value):
+    """Cheap pre-check: every Fernet token starts with TOKEN_PREFIX."""
+    return value.startswith(TOKEN_PREFIX)
+
+
+def is_token(value):
+    """Whether `value` is a token this key decrypts, not a plaintext that merely looks like one."""
+    if not looks_like_token(value):
+        return False
+    try:
+        decrypt(value)
+    except InvalidToken:
+        return False
+    return True
+
+
+def encrypt(value):
+    return get_fernet().encrypt(value.encode()).decode()
+
+
+def decrypt(token):
+    return get_fernet().decrypt(token.encode()).decode()
+
+
+def decrypt_many(tokens):
+    """Decrypt a page of tokens; the one call list serializers make per response."""
+    return [decrypt(str(token)) for token in tokens]
@@ -0,0 +1,96 @@
+"""
+Denormalized parent names on child rows, e.g. TestingAccount.environment_name,
+so a child's __str__ never loads its foreign key.
+
+A save copies the name from the related object when it is already loaded
+(model forms and `create(environment=...)` always have it) and reads it
+otherwise. A save restricted by `update_fields` to the foreign key writes
+the copy with a follow-up UPDATE. Renaming a parent rewrites its children's
+copies in one UPDATE.
+Bulk writes that change the foreign key go through `with_names()`.
+"""
+from django.apps import apps
+from django.db.models.signals import post_save, pre_save
+
+from . import changelog
+from .models import ChangeLogEntry
+
+# child model, foreign key on the child, copy on the child, field on the parent
+DISPLAY_NAMES = [
+    ('technical_information.TestingAccount', 'environment', 'environment_name', 'name'),
+    ('technical_information.SyntheticEvent', 'event_type', 'event_type_name', 'name'),
+    ('technical_information.ArchivedSyntheticEvent', 'event_type', 'event_type_name', 'name'),
+]
+
+
+def get_names(model, field_names=None):
+    """[(foreign key field, copy, parent field)] kept on `model`."""
+    return [
+        (model._meta.get_field(fk_name), copy, source)
+        for label, fk_name, copy, source in DISPLAY_NAMES
+        if label == model._meta.label and (field_names is None or fk_name in field_names)
+    ]
+
+
+def get_children(parent_model, field_names=None):
+    """[(foreign key field, copy, parent field)] pointing at `parent_model`."""
+    return [
+        (field, copy, source)
+        for label, fk_name, copy, source in DISPLAY_NAMES
+        for field in [apps.get_model(label)._meta.get_field(fk_name)]
+        if field.remote_field.model is parent_model and (field_names is None or source in field_names)
+    ]
+
+
+def parent_value(field, source, parent):
+    if parent is None:
+        return ''
+    if isinstance(parent, field.remote_field.model):
+        return getattr(parent, source)
+    return field.remote_field.model._default_manager.filter(pk=parent).values_list(source, flat=True).first() or ''
+
+
+def with_names(model, values):
+    """`values` for a bulk update of `model`, plus the copies of any foreign key it changes."""
+    values = dict(values)
+    for field, copy, source in get_names(model, values):
+        values[copy] = parent_value(field, source, values[field.name])
+    return values
+
+
+def copy_names(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    for field, copy, source in get_names(sender, update_fields):
+        parent = field.get_cached_value(instance) if field.is_cached(instance) else getattr(instance, field.attname)
+        setattr(instance, copy, parent_value(field, source, parent))
+
+
+def write_names(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Write copies that a save limited to `update_fields` left out."""
+    if raw or update_fields is None:
+        return
+    values = {copy: getattr(instance, copy) for field, copy, source in get_names(sender, update_fields) if copy not in update_fields}
+    if values:
+        sender._base_manager.filter(pk=instance.pk).update(**values)
+
+
+def rename_children(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or created:
+        return
+    for field, copy, source in get_children(sender, update_fields):
+        name = getattr(instance, source)
+        stale = field.model._default_manager.filter(**{field.name: instance}).exclude(**{copy: name})
+        child_ids = list(stale.values_list('pk', flat=True))
+        if child_ids:
+            field.model._default_manager.filter(pk__in=child_ids).update(**{copy: name})
+            changelog.record(field.model, child_ids, ChangeLogEntry.UPDATE)
+
+
+def connect():
+    for label, fk_name, copy, source in DISPLAY_NAMES:
+        model = apps.get_model(label)
+        parent_model = model._meta.get_field(fk_name).remote_field.model
+        pre_save.connect(copy_names, sender=model, dispatch_uid=f'display-{label}')
+        post_save.connect(write_names, sender=model, dispatch_uid=f'display-names-{label}')
+        post_save.connect(rename_children, sender=parent_model, dispatch_uid=f'display-{parent_model._meta.label}')
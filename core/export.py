@@ -0,0 +1,151 @@
+"""
+Static export of the public read endpoints (`manage.py export_static`), for
+nginx or a CDN to serve without reaching Python.
+
+Each endpoint is written to <root><path>index.json with precompressed .gz
+(and .br, when the `brotli` package is installed) siblings, e.g.
+api/tools/index.json. manifest.json records, per endpoint, the change log
+versions of the collections it shows and the SHA-256 of its body. A later
+run skips endpoints whose collections haven't changed, re-renders the rest
+and rewrites only files whose hash differs. Every file is written to a
+temporary name and moved into place with os.replace(), so readers never see
+a partial file; the manifest goes last.
+
+Only plain GETs are exported: a request with a query string (filters,
+`?page=`, `?fields=`) may answer differently, so it always goes to Django.
+/api/testing-accounts/ is never exported, because its body holds
+credentials that must not sit in a public directory or a CDN cache. An nginx
+location serving the export:
+
+    location /api/ {
+        root /srv/export;
+        gzip_static on;  # brotli_static on; with ngx_brotli
+        error_page 418 = @django;
+        if ($args) {
+            return 418;
+        }
+        try_files $uri/index.json @django;
+    }
+"""
+import hashlib
+import json
+import os
+import tempfile
+
+from django.http import HttpRequest
+from django.urls import resolve
+from django.utils import timezone
+
+from . import changelog
+from .bootstrap import SECTIONS
+from .staticfiles import MIN_COMPRESS_SIZE, compress
+
+MANIFEST = 'manifest.json'
+INDEX = 'index.json'
+SUFFIXES = ('.gz', '.br')
+
+# path: collections whose changes it reflects
+ENDPOINTS = {
+    '/api/tools/': ['tool-categories', 'tools'],
+    '/api/important-links/': ['link-categories', 'important-links'],
+    '/api/team-members/': ['roles', 'team-members'],
+    '/api/synthetic-events/': ['synthetic-event-targets', 'synthetic-event-types', 'synthetic-events'],
+    '/api/bootstrap/': [collection for view_class, collections in SECTIONS.values() for collection in collections],
+    '/api/summary/': [
+        'tool-categories', 'tools', 'link-categories', 'important-links', 'roles', 'team-members',
+        'synthetic-event-targets', 'synthetic-events',
+    ],
+}
+
+
+class ExportError(Exception):
+    pass
+
+
+class ExportRequest(HttpRequest):
+    def __init__(self, path, host, scheme):
+        super().__init__()
+        self.method = 'GET'
+        self.path = self.path_info = path
+        self.scheme_name = scheme
+        self.META = {
+            'SERVER_NAME': host, 'SERVER_PORT': '443' if scheme == 'https' else '80',
+            'HTTP_HOST': host, 'REMOTE_ADDR': '127.0.0.1', 'QUERY_STRING': '',
+        }
+
+    def _get_scheme(self):
+        return self.scheme_name
+
+
+def render(path, host, scheme='https'):
+    """The body the view behind `path` returns to an anonymous GET, as bytes."""
+    request = ExportRequest(path, host, scheme)
+    request.resolver_match = match = resolve(path)
+    response = match.func(request, *match.args, **match.kwargs)
+    if hasattr(response, 'render'):
+        response.render()
+    if response.status_code != 200:
+        raise ExportError(f"{path} answered {response.status_code}.")
+    return response.content
+
+
+def write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, temporary = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(temporary, 0o644)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def write_endpoint(root, path, body):
+    target = os.path.join(root, path.strip('/'), INDEX)
+    variants = compress(body) if len(body) >= MIN_COMPRESS_SIZE else {}
+    # Variants first, so the plain file is never newer than its siblings.
+    for suffix in SUFFIXES:
+        if suffix in variants:
+            write_atomic(target + suffix, variants[suffix])
+        elif os.path.exists(target + suffix):
+            os.unlink(target + suffix)
+    write_atomic(target, body)
+
+
+def load_manifest(root):
+    try:
+        with open(os.path.join(root, MANIFEST), 'rb') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def export(root, host, scheme='https', force=False):
+    """Bring the export in `root` up to date; return {path: 'written' | 'unchanged' | 'skipped'}."""
+    manifest = load_manifest(root)
+    origin = f'{scheme}://{host}'
+    # URLs in the bodies are absolute, so a new origin invalidates everything.
+    previous = manifest.get('endpoints', {}) if manifest.get('origin') == origin and not force else {}
+    versions = changelog.collection_versions()
+    endpoints, outcome = {}, {}
+    for path, collections in ENDPOINTS.items():
+        current = {collection: versions.get(collection, 0) for collection in collections}
+        entry = previous.get(path)
+        target = os.path.join(root, path.strip('/'), INDEX)
+        if entry and entry['versions'] == current and os.path.exists(target):
+            endpoints[path], outcome[path] = entry, 'skipped'
+            continue
+        body = render(path, host, scheme)
+        digest = hashlib.sha256(body).hexdigest()
+        if entry and entry['sha256'] == digest and os.path.exists(target):
+            outcome[path] = 'unchanged'
+        else:
+            write_endpoint(root, path, body)
+            outcome[path] = 'written'
+        endpoints[path] = {'versions': current, 'sha256': digest, 'size': len(body)}
+    write_atomic(os.path.join(root, MANIFEST), json.dumps({
+        'origin': origin, 'exported_at': timezone.now().isoformat(), 'endpoints': endpoints,
+    }, indent=2).encode())
+    return outcome
@@ -0,0 +1,56 @@
+from django.db import models
+from django.db.models.query_utils import DeferredAttribute
+
+from . import crypto
+
+
+class Ciphertext(str):
+    """A Fernet token loaded from the database and not yet decrypted."""
+
+
+class EncryptedAttribute(DeferredAttribute):
+    # A data descriptor, so reads go through __get__ even once the value is
+    # in the instance __dict__.
+    def __set__(self, instance, value):
+        instance.__dict__[self.field.attname] = value
+
+    def __get__(self, instance, cls=None):
+        value = super().__get__(instance, cls)
+        if isinstance(value, Ciphertext):
+            value = instance.__dict__[self.field.attname] = crypto.decrypt(value)
+        return value
+
+
+class EncryptedCharField(models.CharField):
+    """
+    Stores its value encrypted with `core.crypto`.
+
+    Loaded values stay encrypted until the attribute is first read, so rows
+    that are listed but never displayed are not decrypted at all, and list
+    serializers can decrypt a whole page at once with `decrypt_instances`.
+    `values()` and `values_list()` return the raw tokens.
+    """
+
+    descriptor_class = EncryptedAttribute
+
+    def from_db_value(self, value, expression, connection):
+        # Every value written through the field is a token (migration 0005
+        # encrypted the rest), so the prefix is enough to defer decryption.
+        if value is None or not crypto.looks_like_token(value):
+            return value
+        return Ciphertext(value)
+
+    def get_prep_value(self, value):
+        value = super().get_prep_value(value)
+        if value is None or isinstance(value, Ciphertext):
+            return value
+        return crypto.encrypt(value)
+
+
+def decrypt_instances(instances, attname):
+    """Decrypt `attname` on every instance that still holds a token."""
+    pending = [instance for instance in instances if isinstance(instance.__dict__.get(attname), Ciphertext)]
+    if pending:
+        values = crypto.decrypt_many([instance.__dict__[attname] for instance in pending])
+        for instance, value in zip(pending, values):
+            instance.__dict__[attname] = value
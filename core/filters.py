@@ -0,0 +1,48 @@
+from rest_framework import filters
+from rest_framework.exceptions import ValidationError
+
+# Primary keys are positive 64-bit integers; anything larger overflows SQLite.
+MAX_ID = 2 ** 63 - 1
+
+
+class AllowListFilter(filters.BaseFilterBackend):
+    """
+    Filters a queryset by the query parameters listed in the view's
+    `filter_params`, a mapping of parameter name to ORM lookup.
+
+    Values are primary keys, optionally comma separated (`?target=1,2`).
+    Unknown parameters are ignored; malformed or out of range values raise a
+    400.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        filter_params = getattr(view, 'filter_params', {})
+        for param, lookup in filter_params.items():
+            raw = request.query_params.get(param)
+            if raw is None:
+                continue
+            try:
+                values = [int(value) for value in raw.split(',') if value.strip()]
+            except ValueError:
+                raise ValidationError({param: 'Expected a comma separated list of ids.'})
+            if not values or not all(1 <= value <= MAX_ID for value in values):
+                raise ValidationError({param: 'Expected a comma separated list of ids.'})
+            if len(values) == 1:
+                queryset = queryset.filter(**{lookup: values[0]})
+            else:
+                queryset = queryset.filter(**{f'{lookup}__in': values})
+        return queryset
+
+
+class AllowListOrderingFilter(filters.OrderingFilter):
+    """
+    `OrderingFilter` that rejects fields outside the view's `ordering_fields`
+    with a 400 instead of silently dropping them.
+    """
+
+    def remove_invalid_fields(self, queryset, fields, view, request):
+        valid_fields = super().remove_invalid_fields(queryset, fields, view, request)
+        invalid_fields = [field for field in fields if field not in valid_fields]
+        if invalid_fields:
+            raise ValidationError({self.ordering_param: f"Unsupported ordering: {', '.join(invalid_fields)}."})
+        return valid_fields
@@ -0,0 +1,162 @@
+"""
+Metadata kept next to an ImageField so API clients can reserve layout space
+and paint a placeholder without fetching or measuring the image: its pixel
+size (as displayed, i.e. after EXIF rotation), its dominant colour and a
+BlurHash (https://blurha.sh) of 4x3 components.
+
+For an image field `image` the model has `image_width`, `image_height`,
+`image_color` and `image_blurhash`. They are filled in pre_save when a file
+is uploaded (and cleared with the image), so reading them never opens the
+file; images stored before the fields existed were measured by migration.
+"""
+import logging
+import math
+
+from django.apps import apps
+from django.db.models.signals import pre_save
+
+logger = logging.getLogger(__name__)
+
+# model, image field
+IMAGE_FIELDS = [
+    ('general.Tool', 'image'),
+    ('general.TeamMember', 'image'),
+]
+
+EMPTY = {'width': None, 'height': None, 'color': '', 'blurhash': ''}
+
+SAMPLE_SIZE = 32
+PALETTE_SIZE = 8
+COMPONENTS = (4, 3)
+BASE83 = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~'
+# EXIF orientations that swap width and height.
+TRANSPOSED = {5, 6, 7, 8}
+
+
+def encode83(value, length):
+    return ''.join(BASE83[value // 83 ** (length - index) % 83] for index in range(1, length + 1))
+
+
+def to_linear(value):
+    value /= 255
+    return value / 12.92 if value <= 0.04045 else ((value + 0.055) / 1.055) ** 2.4
+
+
+def to_srgb(value):
+    value = max(0.0, min(1.0, value))
+    if value <= 0.0031308:
+        return int(value * 12.92 * 255 + 0.5)
+    return int((1.055 * value ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def blurhash(image, x_components=COMPONENTS[0], y_components=COMPONENTS[1]):
+    """BlurHash of an RGB image; meant for a small sample of the original."""
+    width, height = image.size
+    linear = [tuple(to_linear(channel) for channel in pixel) for pixel in image.getdata()]
+    factors = []
+    for j in range(y_components):
+        row_basis = [math.cos(math.pi * j * y / height) for y in range(height)]
+        for i in range(x_components):
+            column_basis = [math.cos(math.pi * i * x / width) for x in range(width)]
+            red = green = blue = 0.0
+            for y in range(height):
+                for x in range(width):
+                    basis = row_basis[y] * column_basis[x]
+                    r, g, b = linear[y * width + x]
+                    red += basis * r
+                    green += basis * g
+                    blue += basis * b
+            scale = (1 if i == j == 0 else 2) / (width * height)
+            factors.append((red * scale, green * scale, blue * scale))
+
+    dc, ac = factors[0], factors[1:]
+    result = encode83((x_components - 1) + (y_components - 1) * 9, 1)
+    if ac:
+        quantised_max = int(max(0, min(82, math.floor(max(abs(c) for factor in ac for c in factor) * 166 - 0.5))))
+        maximum = (quantised_max + 1) / 166
+        result += encode83(quantised_max, 1)
+    else:
+        maximum = 1
+        result += encode83(0, 1)
+    result += encode83((to_srgb(dc[0]) << 16) + (to_srgb(dc[1]) << 8) + to_srgb(dc[2]), 4)
+
+    def quantise(value):
+        return int(max(0, min(18, math.floor(math.copysign(abs(value / maximum) ** 0.5, value) * 9 + 9.5))))
+
+    for r, g, b in ac:
+        result += encode83(quantise(r) * 19 * 19 + quantise(g) * 19 + quantise(b), 2)
+    return result
+
+
+def dominant_color(image):
+    """The most common colour of `image` reduced to a small palette, as #rrggbb."""
+    quantised = image.quantize(colors=PALETTE_SIZE)
+    count, index = max(quantised.getcolors())
+    red, green, blue = quantised.getpalette()[index * 3:index * 3 + 3]
+    return f'#{red:02x}{green:02x}{blue:02x}'
+
+
+def image_metadata(file):
+    """{width, height, color, blurhash} of the image in the open file `file`."""
+    # Pillow is imported on the first upload, not at boot: CoreConfig.ready()
+    # loads this module in every worker, including SERVER_ROLE=api.
+    from PIL import Image, ImageOps
+
+    with Image.open(file) as image:
+        width, height = image.size
+        if image.getexif().get(0x0112) in TRANSPOSED:
+            width, height = height, width
+        # Let JPEGs decode at a fraction of their size.
+        image.draft('RGB', (SAMPLE_SIZE * 2, SAMPLE_SIZE * 2))
+        sample = ImageOps.exif_transpose(image)
+        sample.thumbnail((SAMPLE_SIZE, SAMPLE_SIZE))
+        if sample.mode in ('RGBA', 'LA', 'P', 'PA'):
+            # Transparent areas show the page behind them, assumed white.
+            sample = sample.convert('RGBA')
+            background = Image.new('RGB', sample.size, (255, 255, 255))
+            background.paste(sample, mask=sample.getchannel('A'))
+            sample = background
+        sample = sample.convert('RGB')
+        return {'width': width, 'height': height, 'color': dominant_color(sample), 'blurhash': blurhash(sample)}
+
+
+def read_metadata(fieldfile):
+    """Metadata of a FieldFile's image, whether freshly assigned or stored."""
+    from PIL import Image
+
+    try:
+        if not fieldfile._committed:
+            content = fieldfile.file
+            content.seek(0)
+            try:
+                return image_metadata(content)
+            finally:
+                content.seek(0)
+        with fieldfile.storage.open(fieldfile.name, 'rb') as content:
+            return image_metadata(content)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        logger.warning("Could not read image metadata from %s.", fieldfile.name, exc_info=True)
+        return EMPTY
+
+
+def set_metadata(instance, field_name, values):
+    for key, value in values.items():
+        setattr(instance, f'{field_name}_{key}', value)
+
+
+def update_metadata(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    for label, field_name in IMAGE_FIELDS:
+        if label != sender._meta.label or (update_fields is not None and field_name not in update_fields):
+            continue
+        fieldfile = getattr(instance, field_name)
+        if not fieldfile:
+            set_metadata(instance, field_name, EMPTY)
+        elif not fieldfile._committed:
+            set_metadata(instance, field_name, read_metadata(fieldfile))
+
+
+def connect():
+    for label in {label for label, field_name in IMAGE_FIELDS}:
+        pre_save.connect(update_metadata, sender=apps.get_model(label), dispatch_uid=f'images-{label}')
@@ -0,0 +1,20 @@
+"""
+What a job pool thread or process runs. This module imports no models, so
+spawned pool processes can load it before Django is set up.
+"""
+import django
+from django.db import connections
+
+
+def setup():
+    django.setup()
+    from . import jobs
+    jobs.autodiscover()
+
+
+def execute(name, kwargs):
+    from . import jobs
+    try:
+        return jobs.get_task(name)(**kwargs)
+    finally:
+        connections.close_all()
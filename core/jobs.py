@@ -0,0 +1,242 @@
+"""
+Background jobs kept in the database, run by `manage.py run_worker`.
+
+Functions decorated with `@task` in an app's `tasks` module can be queued
+with `enqueue()`; the job row is written in the caller's transaction, so it
+only becomes visible to workers if that transaction commits.
+
+Workers claim due jobs with a single UPDATE, which also takes over jobs whose
+claim lapsed because their worker died. A claim lasts JOBS_LEASE_SECONDS and
+is renewed while the job runs. Failed jobs are retried with exponential
+backoff and jitter until they have run `max_attempts` times.
+"""
+import logging
+import multiprocessing
+import os
+import random
+import socket
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import FIRST_COMPLETED, BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Avg, Count, DurationField, ExpressionWrapper, F, Min, Q
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from . import jobprocess
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+TASKS = {}
+
+PRUNE_EVERY = 3600
+
+
+class UnknownTask(Exception):
+    pass
+
+
+def task(func):
+    """Register `func` so it can be queued by its dotted name."""
+    TASKS[f'{func.__module__}.{func.__name__}'] = func
+    return func
+
+
+def autodiscover():
+    autodiscover_modules('tasks')
+
+
+def get_task(name):
+    try:
+        return TASKS[name]
+    except KeyError:
+        raise UnknownTask(name) from None
+
+
+def enqueue(func, run_at=None, max_attempts=None, **kwargs):
+    """Queue `func` (a task or its name) to run with `kwargs`."""
+    name = func if isinstance(func, str) else f'{func.__module__}.{func.__name__}'
+    return Job.objects.create(
+        name=name, kwargs=kwargs, run_at=run_at or timezone.now(),
+        max_attempts=max_attempts or settings.JOBS_MAX_ATTEMPTS,
+    )
+
+
+def backoff(attempts):
+    """Seconds to wait before retrying a job that has failed `attempts` times."""
+    delay = min(settings.JOBS_BACKOFF_BASE * 2 ** (attempts - 1), settings.JOBS_BACKOFF_MAX)
+    return random.uniform(delay / 2, delay)
+
+
+def lease():
+    return timezone.now() + timedelta(seconds=settings.JOBS_LEASE_SECONDS)
+
+
+def claimable(now):
+    return Q(status=Job.QUEUED, run_at__lte=now) | Q(
+        status=Job.RUNNING, locked_until__lt=now, attempts__lt=F('max_attempts'),
+    )
+
+
+def claim(worker_id, limit):
+    """Atomically take up to `limit` due jobs for `worker_id` and return them."""
+    now = timezone.now()
+    lock = f'{worker_id}:{uuid.uuid4().hex[:8]}'
+    due = Job.objects.filter(claimable(now)).order_by('run_at', 'id').values('id')[:limit]
+    # The outer filter repeats the condition, so on databases that run
+    # UPDATEs concurrently a job another worker just took is skipped.
+    claimed = Job.objects.filter(claimable(now), pk__in=due).update(
+        status=Job.RUNNING, locked_by=lock, locked_until=lease(),
+        attempts=F('attempts') + 1, started_at=now,
+    )
+    if not claimed:
+        return []
+    return list(Job.objects.filter(locked_by=lock).order_by('run_at', 'id'))
+
+
+def reap():
+    """Fail jobs whose claim lapsed on their last attempt; return how many."""
+    return Job.objects.filter(
+        status=Job.RUNNING, locked_until__lt=timezone.now(), attempts__gte=F('max_attempts'),
+    ).update(status=Job.FAILED, finished_at=timezone.now(), last_error='Worker lost while running the job.')
+
+
+def heartbeat(jobs):
+    for job in jobs:
+        Job.objects.filter(pk=job.pk, locked_by=job.locked_by).update(locked_until=lease())
+
+
+def complete(job):
+    Job.objects.filter(pk=job.pk, locked_by=job.locked_by).update(
+        status=Job.DONE, finished_at=timezone.now(), locked_by='', locked_until=None, last_error='',
+    )
+
+
+def fail(job, error, retry=True):
+    now = timezone.now()
+    values = {'finished_at': now, 'locked_by': '', 'locked_until': None, 'last_error': error}
+    if retry and job.attempts < job.max_attempts:
+        values.update(status=Job.QUEUED, run_at=now + timedelta(seconds=backoff(job.attempts)))
+    else:
+        values.update(status=Job.FAILED)
+    Job.objects.filter(pk=job.pk, locked_by=job.locked_by).update(**values)
+
+
+def prune():
+    cutoff = timezone.now() - timedelta(days=settings.JOBS_KEEP_DONE_DAYS)
+    return Job.objects.filter(status=Job.DONE, finished_at__lt=cutoff).delete()[0]
+
+
+def seconds(duration):
+    return None if duration is None else duration.total_seconds()
+
+
+def metrics():
+    """Queue depth per status, how late due jobs are, and recent wait/run times."""
+    now = timezone.now()
+    counts = dict(Job.objects.order_by().values_list('status').annotate(count=Count('id')))
+    oldest_due = Job.objects.filter(status=Job.QUEUED, run_at__lte=now).aggregate(oldest=Min('run_at'))['oldest']
+    recent = Job.objects.filter(status=Job.DONE, finished_at__gte=now - timedelta(hours=1)).aggregate(
+        wait=Avg(ExpressionWrapper(F('started_at') - F('run_at'), output_field=DurationField())),
+        runtime=Avg(ExpressionWrapper(F('finished_at') - F('started_at'), output_field=DurationField())),
+    )
+    return {
+        **{status: counts.get(status, 0) for status, label in Job.STATUS_CHOICES},
+        'due': Job.objects.filter(status=Job.QUEUED, run_at__lte=now).count(),
+        'lag_seconds': (now - oldest_due).total_seconds() if oldest_due else 0.0,
+        'wait_seconds': seconds(recent['wait']),
+        'runtime_seconds': seconds(recent['runtime']),
+    }
+
+
+class Worker:
+    """
+    Claims due jobs and runs up to `concurrency` at a time on a thread or
+    process pool. With `burst` it exits once nothing is due; `stop()` lets
+    the running jobs finish, then exits.
+    """
+
+    def __init__(self, pool='thread', concurrency=4, poll_interval=1.0, burst=False, max_jobs=None):
+        if pool not in ('thread', 'process'):
+            raise ValueError(f"Unknown pool '{pool}'.")
+        self.pool = pool
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.burst = burst
+        self.max_jobs = max_jobs
+        self.worker_id = f'{socket.gethostname()}:{os.getpid()}'
+        self.stopping = threading.Event()
+        self.processed = 0
+        self.pool_executor = None
+
+    def stop(self, *args):
+        self.stopping.set()
+
+    def executor(self):
+        if self.pool == 'process':
+            return ProcessPoolExecutor(
+                self.concurrency, mp_context=multiprocessing.get_context('spawn'), initializer=jobprocess.setup,
+            )
+        return ThreadPoolExecutor(self.concurrency, thread_name_prefix='job')
+
+    def submit(self, job):
+        try:
+            return self.pool_executor.submit(jobprocess.execute, job.name, job.kwargs)
+        except BrokenExecutor:
+            # A job took a pool process down with it; carry on with a new pool.
+            self.pool_executor.shutdown(wait=False)
+            self.pool_executor = self.executor()
+            return self.pool_executor.submit(jobprocess.execute, job.name, job.kwargs)
+
+    def wants_more(self, running):
+        if self.stopping.is_set():
+            return 0
+        if self.max_jobs is not None:
+            return min(self.concurrency - len(running), self.max_jobs - self.processed - len(running))
+        return self.concurrency - len(running)
+
+    def finish(self, job, future):
+        error = future.exception()
+        if error is None:
+            complete(job)
+            logger.info("Job %s done.", job)
+        else:
+            logger.warning("Job %s failed on attempt %d: %r", job, job.attempts, error)
+            fail(job, ''.join(traceback.format_exception(error)), retry=not isinstance(error, UnknownTask))
+        self.processed += 1
+
+    def run(self):
+        """Work until stopped (or, in burst mode, idle); return how many jobs ran."""
+        running = {}
+        last_prune = 0.0
+        last_heartbeat = time.monotonic()
+        self.pool_executor = self.executor()
+        try:
+            while running or not self.stopping.is_set():
+                if time.monotonic() - last_prune > PRUNE_EVERY:
+                    prune()
+                    reap()
+                    last_prune = time.monotonic()
+                wanted = self.wants_more(running)
+                if wanted > 0:
+                    for job in claim(self.worker_id, wanted):
+                        running[self.submit(job)] = job
+                if not running:
+                    if self.burst or wanted <= 0:
+                        break
+                    self.stopping.wait(self.poll_interval)
+                    continue
+                done, _ = wait(running, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self.finish(running.pop(future), future)
+                if running and time.monotonic() - last_heartbeat > settings.JOBS_LEASE_SECONDS / 3:
+                    heartbeat(running.values())
+                    last_heartbeat = time.monotonic()
+        finally:
+            self.pool_executor.shutdown()
+        return self.processed
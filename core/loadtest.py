@@ -0,0 +1,169 @@
+"""
+Closed-loop load generator for `manage.py loadtest`. Many asyncio clients
+call an ASGI application in process, with no sockets in between, each
+sending its next request as soon as the previous one has completed.
+Routes are picked from a weighted mix.
+"""
+import asyncio
+import random
+import statistics
+import time
+from dataclasses import dataclass, field
+
+from . import dispatch
+
+DEFAULT_MIX = {
+    '/api/tools/': 4,
+    '/api/important-links/': 2,
+    '/api/team-members/': 2,
+    '/api/synthetic-events/': 1,
+    '/api/changes/': 1,
+    '/api/bootstrap/': 2,
+    '/api/summary/': 1,
+}
+
+
+@dataclass
+class RouteStats:
+    latencies: list = field(default_factory=list)
+    errors: int = 0
+
+    @property
+    def requests(self):
+        return len(self.latencies)
+
+
+def parse_route(value):
+    """'4:/api/tools/' -> ('/api/tools/', 4); the weight defaults to 1."""
+    weight, separator, path = value.partition(':')
+    if separator and weight.isdigit():
+        return path, int(weight)
+    return value, 1
+
+
+async def asgi_get(application, url, client, host='localhost'):
+    path, _, query = url.partition('?')
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': query.encode(),
+        'root_path': '',
+        'headers': [(b'host', host.encode())],
+        'client': client,
+        'server': (host, 80),
+    }
+    pending = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+    status = None
+
+    async def receive():
+        if pending:
+            return pending.pop()
+        # Never disconnect; Django cancels this once the response is sent.
+        await asyncio.Future()
+
+    async def send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+
+    await application(scope, receive, send)
+    return status
+
+
+async def run(application, mix, concurrency, duration=None, requests=None, seed=0):
+    """
+    Drive `application` with `concurrency` clients until `duration` seconds
+    have passed or `requests` requests were sent. Returns ({route: RouteStats},
+    elapsed seconds).
+    """
+    routes, weights = list(mix), list(mix.values())
+    host = dispatch.default_host()
+    stats = {route: RouteStats() for route in routes}
+    remaining = requests
+    deadline = None if duration is None else time.perf_counter() + duration
+
+    def more():
+        nonlocal remaining
+        if deadline is not None and time.perf_counter() >= deadline:
+            return False
+        if remaining is not None:
+            if remaining <= 0:
+                return False
+            remaining -= 1
+        return True
+
+    async def client(number):
+        rng = random.Random(seed * 100003 + number)
+        address = (f'10.{number // 65536 % 256}.{number // 256 % 256}.{number % 256}', 40000 + number % 20000)
+        while more():
+            route = rng.choices(routes, weights)[0]
+            started = time.perf_counter()
+            try:
+                status = await asgi_get(application, route, address, host)
+            except Exception:
+                status = None
+            stats[route].latencies.append(time.perf_counter() - started)
+            if status is None or status >= 400:
+                stats[route].errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(number) for number in range(concurrency)))
+    return stats, time.perf_counter() - started
+
+
+def summarize(latencies, errors, elapsed):
+    """requests, errors, error rate, req/s and p50/p95/p99 in ms."""
+    count = len(latencies)
+    if count >= 2:
+        cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = latencies[0] if latencies else 0.0
+    return {
+        'requests': count,
+        'errors': errors,
+        'error_rate': errors / count if count else 0.0,
+        'throughput': count / elapsed if elapsed else 0.0,
+        'p50': p50 * 1000,
+        'p95': p95 * 1000,
+        'p99': p99 * 1000,
+    }
+
+
+def seed(rows):
+    """Create `rows` rows for each listed collection, spread over a few categories."""
+    from general.models import ImportantLinks, LinkCategory, Role, TeamMember, Tool, ToolCategory
+    from technical_information.models import SyntheticEvent, SyntheticEventTarget, SyntheticEventType
+
+    groups = max(rows // 10, 1)
+    tool_categories = ToolCategory.objects.bulk_create([ToolCategory(name=f'Category {n}') for n in range(groups)])
+    link_categories = LinkCategory.objects.bulk_create([LinkCategory(name=f'Category {n}') for n in range(groups)])
+    roles = Role.objects.bulk_create([Role(name=f'Role {n}') for n in range(groups)])
+    targets = SyntheticEventTarget.objects.bulk_create([SyntheticEventTarget(name=f'Target {n}') for n in range(groups)])
+    event_types = SyntheticEventType.objects.bulk_create([
+        SyntheticEventType(name=f'Type {n}', description='Load test type') for n in range(groups)
+    ])
+    Tool.objects.bulk_create([
+        Tool(name=f'Tool {n}', description='Load test tool', link='https://example.com', category=tool_categories[n % groups])
+        for n in range(rows)
+    ])
+    ImportantLinks.objects.bulk_create([
+        ImportantLinks(label=f'Link {n}', link='https://example.com', category=link_categories[n % groups])
+        for n in range(rows)
+    ])
+    TeamMember.objects.bulk_create([
+        TeamMember(name=f'Member {n}', email=f'member{n}@example.com', contact_number='0100', role=roles[n % groups])
+        for n in range(rows)
+    ])
+    SyntheticEvent.objects.bulk_create([
+        SyntheticEvent(
+            name=f'Event {n}', description='Load test event', target=targets[n % groups], event_type=event_types[n % groups],
+            event_type_name=event_types[n % groups].name,
+        )
+        for n in range(rows)
+    ])
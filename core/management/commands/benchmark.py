@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmarks import SCENARIOS, throwaway_database
+
+
+class Command(BaseCommand):
+    help = "Run a micro-benchmark against a throwaway test database."
+
+    def add_arguments(self, parser):
+        parser.add_argument('scenario', choices=sorted(SCENARIOS))
+        parser.add_argument('--rows', type=int, default=1000, help="Rows to seed.")
+        parser.add_argument('--repeat', type=int, default=30, help="Timed iterations.")
+
+    def handle(self, *args, **options):
+        if options['rows'] < 1 or options['repeat'] < 1:
+            raise CommandError("--rows and --repeat must be positive.")
+
+        with throwaway_database():
+            results = SCENARIOS[options['scenario']](options['rows'], options['repeat'])
+
+        width = max(len(label) for label, value in results)
+        for label, value in results:
+            self.stdout.write(f"{label.ljust(width)}  {value}")
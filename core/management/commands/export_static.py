@@ -0,0 +1,35 @@
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.exceptions import DisallowedHost
+from django.core.management.base import BaseCommand, CommandError
+
+from core import export
+from core.dispatch import default_host
+
+
+class Command(BaseCommand):
+    help = (
+        "Render the public read endpoints to static JSON files (with .gz/.br "
+        "variants) for nginx or a CDN, rewriting only those whose content changed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help="Export directory (default: EXPORT_STATIC_ROOT).")
+        parser.add_argument('--origin', help="Scheme and host the files are served from, e.g. https://cms.example.com (default: EXPORT_ORIGIN).")
+        parser.add_argument('--force', action='store_true', help="Render and rewrite every endpoint.")
+
+    def handle(self, *args, **options):
+        origin = urlsplit(options['origin'] or settings.EXPORT_ORIGIN or f'https://{default_host()}')
+        if origin.scheme not in ('http', 'https') or not origin.netloc:
+            raise CommandError("--origin must look like https://host.")
+        root = options['output'] or settings.EXPORT_STATIC_ROOT
+        try:
+            outcome = export.export(root, origin.netloc, origin.scheme, force=options['force'])
+        except (export.ExportError, DisallowedHost) as error:
+            raise CommandError(error)
+        width = max(len(path) for path in outcome)
+        for path, result in outcome.items():
+            self.stdout.write(f"{path.ljust(width)}  {result}")
+        written = sum(result == 'written' for result in outcome.values())
+        self.stdout.write(f"Wrote {written} of {len(outcome)} endpoints to {root}.")
@@ -0,0 +1,82 @@
+import asyncio
+import logging
+from contextlib import nullcontext
+from unittest import mock
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.views import APIView
+
+from core import loadtest, warmup
+from core.benchmarks import throwaway_database
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive renovators.asgi.application in process with concurrent asyncio clients "
+        "against a throwaway test database and report throughput, latency percentiles "
+        "and error rates per route."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=200, help="Concurrent clients.")
+        parser.add_argument('--duration', type=float, default=10.0, help="Seconds to run.")
+        parser.add_argument('--requests', type=int, help="Stop after this many requests instead.")
+        parser.add_argument(
+            '--route', action='append', type=loadtest.parse_route, metavar='[WEIGHT:]PATH',
+            help="Route in the mix, repeatable (default: the portal's list endpoints).",
+        )
+        parser.add_argument('--rows', type=int, default=200, help="Rows to seed per collection.")
+        parser.add_argument('--seed', type=int, default=0, help="Seed for the route choices.")
+        parser.add_argument('--cold', action='store_true', help="Skip warming before the run.")
+        parser.add_argument('--ratelimit', action='store_true', help="Keep API throttling on.")
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1 or options['rows'] < 0:
+            raise CommandError("--concurrency must be positive and --rows non-negative.")
+        if options['requests'] is not None and options['requests'] < 1:
+            raise CommandError("--requests must be positive.")
+        mix = dict(options['route'] or loadtest.DEFAULT_MIX)
+        duration = None if options['requests'] else options['duration']
+
+        # Imported here so loading the command doesn't build the ASGI application.
+        from renovators.asgi import application
+
+        with throwaway_database():
+            loadtest.seed(options['rows'])
+            if not options['cold']:
+                warmup.warm()
+            # Every client would otherwise share the same few token buckets.
+            throttling = nullcontext() if options['ratelimit'] else mock.patch.object(APIView, 'throttle_classes', [])
+            # Errors are counted in the report rather than logged one by one.
+            request_logger = logging.getLogger('django.request')
+            level = request_logger.level
+            request_logger.setLevel(logging.ERROR)
+            try:
+                with throttling:
+                    stats, elapsed = asyncio.run(loadtest.run(
+                        application, mix, options['concurrency'],
+                        duration=duration, requests=options['requests'], seed=options['seed'],
+                    ))
+            finally:
+                request_logger.setLevel(level)
+
+        width = max(len(route) for route in mix)
+        self.stdout.write(
+            f"{'route'.ljust(width)}  {'requests':>8}  {'errors':>6}  {'req/s':>8}  "
+            f"{'p50 ms':>8}  {'p95 ms':>8}  {'p99 ms':>8}"
+        )
+        rows = [(route, loadtest.summarize(s.latencies, s.errors, elapsed)) for route, s in stats.items()]
+        total = loadtest.summarize(
+            [latency for s in stats.values() for latency in s.latencies],
+            sum(s.errors for s in stats.values()),
+            elapsed,
+        )
+        for route, summary in rows + [('all', total)]:
+            self.stdout.write(
+                f"{route.ljust(width)}  {summary['requests']:>8}  {summary['errors']:>6}  "
+                f"{summary['throughput']:>8.1f}  {summary['p50']:>8.2f}  {summary['p95']:>8.2f}  {summary['p99']:>8.2f}"
+            )
+        self.stdout.write(
+            f"{options['concurrency']} clients, {elapsed:.1f} s, {total['requests']} requests, "
+            f"{total['throughput']:.1f} req/s, error rate {total['error_rate']:.2%}"
+        )
@@ -0,0 +1,176 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+ENTRYPOINTS = {
+    'wsgi': 'renovators.wsgi',
+    'asgi': 'renovators.asgi',
+}
+
+# Runs in a fresh interpreter: import the application module, send it one GET
+# and print the timings as JSON on the last line of stdout.
+FIRST_REQUEST_SCRIPT = '''
+import asyncio, importlib, json, sys, time
+started = time.perf_counter()
+application = importlib.import_module(sys.argv[1]).application
+booted = time.perf_counter()
+
+from django.apps import apps
+from django.conf import settings
+host = next((h for h in settings.ALLOWED_HOSTS if h and h[0] not in '*.'), '127.0.0.1')
+path = sys.argv[2]
+
+def wsgi_request():
+    from wsgiref.util import setup_testing_defaults
+    environ = {'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'HTTP_HOST': host, 'SERVER_NAME': host}
+    setup_testing_defaults(environ)
+    statuses = []
+    body = application(environ, lambda status, headers, exc_info=None: statuses.append(status))
+    for chunk in body:
+        pass
+    getattr(body, 'close', lambda: None)()
+    return int(statuses[0].split()[0])
+
+async def asgi_request():
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+        'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': b'',
+        'root_path': '', 'headers': [(b'host', host.encode())],
+        'client': ('127.0.0.1', 0), 'server': (host, 80),
+    }
+    sent = []
+    pending = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+
+    async def receive():
+        if pending:
+            return pending.pop()
+        await asyncio.Future()
+
+    async def send(message):
+        sent.append(message)
+
+    await application(scope, receive, send)
+    return sent[0]['status']
+
+status = asyncio.run(asgi_request()) if sys.argv[1].endswith('asgi') else wsgi_request()
+finished = time.perf_counter()
+print(json.dumps({
+    'boot_ms': (booted - started) * 1000,
+    'first_request_ms': (finished - booted) * 1000,
+    'status': status,
+    'modules': len(sys.modules),
+    'admin_installed': apps.is_installed('django.contrib.admin'),
+}))
+'''
+
+
+def child_env(role=None):
+    env = dict(os.environ)
+    env.setdefault('DJANGO_SETTINGS_MODULE', settings.SETTINGS_MODULE)
+    if role:
+        env['SERVER_ROLE'] = role
+    return env
+
+
+def parse_importtime(output):
+    """Return [(module, self_us, cumulative_us, depth)] from `-X importtime` output."""
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        if not self_us.strip().isdigit():
+            continue  # header row
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def by_package(rows):
+    """Self time per top-level package; these add up to the total import time."""
+    totals = defaultdict(int)
+    for name, self_us, cumulative_us, depth in rows:
+        totals[name.split('.')[0]] += self_us
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def profile_imports(module, env):
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+    )
+    if result.returncode:
+        raise CommandError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def measure_first_request(module, path, env):
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-c', FIRST_REQUEST_SCRIPT, module, path],
+        cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+    )
+    process_ms = (time.perf_counter() - started) * 1000
+    if result.returncode:
+        raise CommandError(f"First request to {path} failed:\n{result.stderr[-2000:]}")
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    timings['process_ms'] = process_ms
+    return timings
+
+
+class Command(BaseCommand):
+    help = (
+        "Report the import-time breakdown of the WSGI/ASGI entrypoint and the "
+        "time from process start to the first response, each in a fresh interpreter."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--entrypoint', choices=sorted(ENTRYPOINTS), default='wsgi')
+        parser.add_argument('--role', choices=['full', 'api'], help="SERVER_ROLE for the profiled process.")
+        parser.add_argument('--path', default='/api/tools/', help="Path of the first request.")
+        parser.add_argument('--runs', type=int, default=5, help="Fresh processes to time.")
+        parser.add_argument('--top', type=int, default=15, help="Packages and modules to list.")
+        parser.add_argument('--budget', type=float, help="Fail above this many ms (default STARTUP_BUDGET_MS).")
+
+    def handle(self, *args, **options):
+        if options['runs'] < 1 or options['top'] < 1:
+            raise CommandError("--runs and --top must be positive.")
+        module = ENTRYPOINTS[options['entrypoint']]
+        env = child_env(options['role'])
+        budget = options['budget'] if options['budget'] is not None else settings.STARTUP_BUDGET_MS
+        role = options['role'] or settings.SERVER_ROLE
+
+        rows = profile_imports(module, env)
+        total_us = sum(self_us for name, self_us, cumulative_us, depth in rows)
+        self.stdout.write(f"Import time for {module} (role {role}): {total_us / 1000:.1f} ms, {len(rows)} modules")
+        for package, self_us in by_package(rows)[:options['top']]:
+            self.stdout.write(f"  {package:<28} {self_us / 1000:8.1f} ms  {self_us * 100 / total_us:5.1f}%")
+        self.stdout.write("Slowest imports (cumulative):")
+        slowest = sorted(rows, key=lambda row: row[2], reverse=True)
+        for name, self_us, cumulative_us, depth in slowest[:options['top']]:
+            self.stdout.write(f"  {name:<48} {cumulative_us / 1000:8.1f} ms")
+
+        runs = [measure_first_request(module, options['path'], env) for _ in range(options['runs'])]
+        last = runs[-1]
+        self.stdout.write(f"Time to first request (GET {options['path']}, median of {len(runs)}):")
+        for label, key in (('boot', 'boot_ms'), ('first request', 'first_request_ms'), ('process total', 'process_ms')):
+            self.stdout.write(f"  {label:<14} {statistics.median(run[key] for run in runs):8.1f} ms")
+        self.stdout.write(
+            f"  status {last['status']}, {last['modules']} modules loaded, "
+            f"admin {'installed' if last['admin_installed'] else 'not installed'}"
+        )
+        if last['status'] >= 400:
+            hint = " (is the database migrated?)" if last['status'] >= 500 else ""
+            self.stderr.write(f"Warning: GET {options['path']} returned {last['status']}{hint}")
+
+        total = statistics.median(run['process_ms'] for run in runs)
+        if total > budget:
+            raise CommandError(f"Time to first request {total:.0f} ms exceeds the {budget:.0f} ms budget.")
+        self.stdout.write(f"Within the {budget:.0f} ms budget.")
@@ -0,0 +1,44 @@
+import json
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core import jobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued background jobs on a thread or process pool until stopped "
+        "with SIGINT/SIGTERM, letting running jobs finish first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pool', choices=['thread', 'process'], help="Pool type (default: JOBS_POOL).")
+        parser.add_argument('--concurrency', type=int, help="Jobs run at once (default: JOBS_CONCURRENCY).")
+        parser.add_argument('--poll-interval', type=float, help="Seconds between polls when idle (default: JOBS_POLL_INTERVAL).")
+        parser.add_argument('--burst', action='store_true', help="Exit once no job is due.")
+        parser.add_argument('--max-jobs', type=int, help="Exit after running this many jobs.")
+        parser.add_argument('--stats', action='store_true', help="Print queue metrics as JSON and exit.")
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            self.stdout.write(json.dumps(jobs.metrics(), indent=2))
+            return
+        concurrency = options['concurrency'] or settings.JOBS_CONCURRENCY
+        if concurrency < 1 or (options['max_jobs'] is not None and options['max_jobs'] < 1):
+            raise CommandError("--concurrency and --max-jobs must be positive.")
+
+        jobs.autodiscover()
+        worker = jobs.Worker(
+            pool=options['pool'] or settings.JOBS_POOL,
+            concurrency=concurrency,
+            poll_interval=options['poll_interval'] or settings.JOBS_POLL_INTERVAL,
+            burst=options['burst'],
+            max_jobs=options['max_jobs'],
+        )
+        signal.signal(signal.SIGTERM, worker.stop)
+        signal.signal(signal.SIGINT, worker.stop)
+        self.stdout.write(f"Worker {worker.worker_id}: {worker.concurrency} {worker.pool} workers, tasks: {', '.join(sorted(jobs.TASKS))}")
+        processed = worker.run()
+        self.stdout.write(f"Ran {processed} jobs.")
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core import warmup
+
+
+class Command(BaseCommand):
+    help = (
+        "Pre-execute the list endpoints, URL patterns and templates listed in "
+        "WARM_PATHS/WARM_TEMPLATES and report what each step cost cold."
+    )
+
+    def handle(self, *args, **options):
+        results = warmup.warm()
+        width = max(len(label) for label, outcome, ms in results)
+        for label, outcome, ms in results:
+            self.stdout.write(f"{label.ljust(width)}  {str(outcome):>8}  {ms:8.1f} ms")
+        self.stdout.write(f"Warmed in {sum(ms for label, outcome, ms in results):.1f} ms.")
+        failed = warmup.failures(results)
+        if failed:
+            raise CommandError(f"Not warm: {', '.join(failed)} answered with an error.")
@@ -0,0 +1,61 @@
+"""
+Helpers for core.views.serve_media: single byte-range parsing and a bounded
+file reader for 206 responses.
+"""
+import re
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class UnsatisfiableRange(ValueError):
+    pass
+
+
+def parse_range(header, size):
+    """
+    Return the inclusive `(start, end)` byte range requested by a Range
+    header, or None to serve the whole file. Multiple ranges are not
+    supported and fall back to the whole file.
+    """
+    if not header:
+        return None
+    match = RANGE_RE.match(header.strip())
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)
+        if length == 0:
+            raise UnsatisfiableRange(header)
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise UnsatisfiableRange(header)
+    return start, end
+
+
+class RangeFile:
+    """
+    Reads `length` bytes from `start`. It deliberately has no fileno(), so
+    servers fall back to reading it instead of sendfile()-ing the whole file.
+    """
+
+    def __init__(self, file, start, length):
+        self.file = file
+        self.file.seek(start)
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
@@ -0,0 +1,50 @@
+"""
+Route-aware variants of Django's session, CSRF, auth and message middleware.
+
+Anonymous reads of the API (a safe method, a path under
+LIGHT_MIDDLEWARE_PREFIXES and no session cookie) have no session to load, no
+user to resolve, no form to protect and no messages to show, so these
+middleware pass such requests straight through. Everything else, /admin/ and
+any request carrying a session cookie included, gets the stock behaviour.
+"""
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.messages.middleware import MessageMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.middleware.csrf import CsrfViewMiddleware
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def is_light_request(request):
+    return (
+        request.method in SAFE_METHODS
+        and request.path_info.startswith(settings.LIGHT_MIDDLEWARE_PREFIXES)
+        and settings.SESSION_COOKIE_NAME not in request.COOKIES
+    )
+
+
+class LightPathMixin:
+    def __call__(self, request):
+        if is_light_request(request):
+            return self.get_response(request)
+        return super().__call__(request)
+
+
+class LightSessionMiddleware(LightPathMixin, SessionMiddleware):
+    pass
+
+
+class LightCsrfViewMiddleware(LightPathMixin, CsrfViewMiddleware):
+    def process_view(self, request, callback, callback_args, callback_kwargs):
+        if is_light_request(request):
+            return None
+        return super().process_view(request, callback, callback_args, callback_kwargs)
+
+
+class LightAuthenticationMiddleware(LightPathMixin, AuthenticationMiddleware):
+    pass
+
+
+class LightMessageMiddleware(LightPathMixin, MessageMiddleware):
+    pass
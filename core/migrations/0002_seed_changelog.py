@@ -0,0 +1,41 @@
+from django.db import migrations
+
+# The collections as they were when the change log was introduced; later
+# registry changes must not alter what this migration seeds.
+COLLECTIONS = {
+    'tool-categories': 'general.ToolCategory',
+    'tools': 'general.Tool',
+    'link-categories': 'general.LinkCategory',
+    'important-links': 'general.ImportantLinks',
+    'roles': 'general.Role',
+    'team-members': 'general.TeamMember',
+    'testing-account-environments': 'technical_information.TestingAccountEnvironment',
+    'testing-accounts': 'technical_information.TestingAccount',
+    'synthetic-event-targets': 'technical_information.SyntheticEventTarget',
+    'synthetic-event-types': 'technical_information.SyntheticEventType',
+    'synthetic-events': 'technical_information.SyntheticEvent',
+}
+
+
+def seed_changelog(apps, schema_editor):
+    ChangeLogEntry = apps.get_model('core', 'ChangeLogEntry')
+    for collection, model_label in COLLECTIONS.items():
+        model = apps.get_model(model_label)
+        object_ids = model.objects.order_by('pk').values_list('pk', flat=True)
+        ChangeLogEntry.objects.bulk_create(
+            [ChangeLogEntry(collection=collection, object_id=object_id, action='insert') for object_id in object_ids],
+            batch_size=500,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('general', '0007_teammember_name_idx'),
+        ('technical_information', '0003_testingaccount_syntheticevent_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_changelog, migrations.RunPython.noop),
+    ]
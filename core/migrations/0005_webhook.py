@@ -0,0 +1,28 @@
+# Generated by Django 6.1.2 on 2026-10-19 06:35
+
+import core.fields
+import core.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Webhook',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('url', models.URLField(max_length=500)),
+                ('secret', core.fields.EncryptedCharField(default=core.models.generate_secret, max_length=255)),
+                ('collections', models.JSONField(blank=True, default=list)),
+                ('is_active', models.BooleanField(default=True)),
+                ('delivered_version', models.BigIntegerField(default=0, editable=False)),
+                ('delivered_at', models.DateTimeField(blank=True, editable=False, null=True)),
+            ],
+        ),
+    ]
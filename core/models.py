@@ -0,0 +1,127 @@
+import secrets
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+from .fields import EncryptedCharField
+from .registry import COLLECTIONS
+
+
+class ChangeLogEntry(models.Model):
+    INSERT = 'insert'
+    UPDATE = 'update'
+    DELETE = 'delete'
+    ACTION_CHOICES = [
+        (INSERT, 'Insert'),
+        (UPDATE, 'Update'),
+        (DELETE, 'Delete'),
+    ]
+
+    collection = models.CharField(max_length=64)
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=6, choices=ACTION_CHOICES)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.action} {self.collection}#{self.object_id}"
+
+    class Meta:
+        verbose_name_plural = "Change Log Entries"
+        indexes = [
+            models.Index(fields=['collection', 'id'], name='changelog_collection_id_idx'),
+        ]
+
+
+class AuditEntry(models.Model):
+    collection = models.CharField(max_length=64)
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=6, choices=ChangeLogEntry.ACTION_CHOICES)
+    # {field name: [old value, new value]}
+    changes = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    # Not a foreign key, so the trail outlives the user account.
+    user_id = models.IntegerField(null=True, blank=True)
+    username = models.CharField(max_length=150, blank=True)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.action} {self.collection}#{self.object_id}"
+
+    class Meta:
+        verbose_name_plural = "Audit Entries"
+        indexes = [
+            models.Index(fields=['collection', 'object_id', 'id'], name='audit_object_idx'),
+        ]
+
+
+class Job(models.Model):
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    # A task registered with core.jobs.task, and its keyword arguments.
+    name = models.CharField(max_length=200)
+    kwargs = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    status = models.CharField(max_length=7, choices=STATUS_CHOICES, default=QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # The claim holding a running job, and when it lapses if not renewed.
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    def __str__(self):
+        return f"{self.name}#{self.pk} ({self.status})"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_at', 'id'], name='job_status_run_at_idx'),
+        ]
+
+
+def generate_secret():
+    return secrets.token_urlsafe(32)
+
+
+class Webhook(models.Model):
+    name = models.CharField(max_length=100)
+    url = models.URLField(max_length=500)
+    # Signs every delivery (HMAC-SHA256), see core.webhooks.
+    secret = EncryptedCharField(max_length=255, default=generate_secret)
+    # Collection names from core.registry to watch; empty watches them all.
+    collections = models.JSONField(default=list, blank=True)
+    is_active = models.BooleanField(default=True)
+    # The change log version the last successful delivery covered.
+    delivered_version = models.BigIntegerField(default=0, editable=False)
+    delivered_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    def __str__(self):
+        return self.name
+
+    def save(self, *args, **kwargs):
+        if self._state.adding and not self.delivered_version:
+            # Start from now rather than replaying the whole change log.
+            self.delivered_version = ChangeLogEntry.objects.aggregate(version=models.Max('id'))['version'] or 0
+        super().save(*args, **kwargs)
+
+    def clean(self):
+        if not isinstance(self.collections, list):
+            raise ValidationError({'collections': "Enter a list of collection names."})
+        unknown = sorted(set(self.collections) - set(COLLECTIONS))
+        if unknown:
+            raise ValidationError({'collections': f"Unknown collections: {', '.join(map(str, unknown))}."})
+
+    def watches(self, collection):
+        return not self.collections or collection in self.collections
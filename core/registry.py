@@ -0,0 +1,55 @@
+from django.apps import apps
+
+
+# Every CMS collection exposed through the change feed, keyed by the name
+# clients use to address it.
+COLLECTIONS = {
+    'tool-categories': 'general.ToolCategory',
+    'tools': 'general.Tool',
+    'link-categories': 'general.LinkCategory',
+    'important-links': 'general.ImportantLinks',
+    'roles': 'general.Role',
+    'team-members': 'general.TeamMember',
+    'testing-account-environments': 'technical_information.TestingAccountEnvironment',
+    'testing-accounts': 'technical_information.TestingAccount',
+    'synthetic-event-targets': 'technical_information.SyntheticEventTarget',
+    'synthetic-event-types': 'technical_information.SyntheticEventType',
+    'synthetic-events': 'technical_information.SyntheticEvent',
+}
+
+# What the change feed (/api/changes/) sends for each collection: rows
+# serialized like the collection's public endpoint does, only the rows that
+# endpoint shows, and never the fields listed in 'exclude'.
+FEEDS = {
+    'tool-categories': {'serializer': 'general.serializers.ToolCategorySerializer'},
+    'tools': {'serializer': 'general.serializers.ToolSerializer'},
+    'link-categories': {'serializer': 'general.serializers.LinkCategorySerializer'},
+    'important-links': {'serializer': 'general.serializers.ImportantLinksSerializer'},
+    'roles': {'serializer': 'general.serializers.RoleSerializer'},
+    'team-members': {'serializer': 'general.serializers.TeamMemberSerializer'},
+    'testing-account-environments': {'serializer': 'technical_information.serializers.TestingAccountEnvironmentSerializer'},
+    'testing-accounts': {
+        'serializer': 'technical_information.serializers.TestingAccountSerializer',
+        'filter': {'is_active': True},
+        'exclude': ['password'],
+    },
+    'synthetic-event-targets': {'serializer': 'technical_information.serializers.SyntheticEventTargetSerializer'},
+    'synthetic-event-types': {'serializer': 'technical_information.serializers.SyntheticEventTypeSerializer'},
+    'synthetic-events': {'serializer': 'technical_information.serializers.SyntheticEventSerializer'},
+}
+
+
+def get_model(collection):
+    return apps.get_model(COLLECTIONS[collection])
+
+
+def get_collection(model):
+    label = model._meta.label
+    for collection, model_label in COLLECTIONS.items():
+        if model_label == label:
+            return collection
+    return None
+
+
+def get_models():
+    return {collection: get_model(collection) for collection in COLLECTIONS}
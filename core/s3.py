@@ -0,0 +1,11 @@
+"""
+S3 media storage. Lives apart from core.storage because importing
+storages.backends.s3 loads boto3, which filesystem deployments never need.
+"""
+from storages.backends.s3 import S3Storage
+
+from .storage import HashedNameMixin
+
+
+class HashedS3Storage(HashedNameMixin, S3Storage):
+    pass
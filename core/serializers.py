@@ -0,0 +1,23 @@
+from rest_framework import serializers
+
+from . import storage
+from .models import AuditEntry
+
+
+class CachedURLImageField(serializers.ImageField):
+    """An `ImageField` whose URL comes from the per-process URL memo."""
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        url = storage.cached_url(value)
+        request = self.context.get('request', None)
+        if request is not None:
+            return request.build_absolute_uri(url)
+        return url
+
+
+class AuditEntrySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AuditEntry
+        fields = ['id', 'action', 'changes', 'user_id', 'username', 'changed_at']
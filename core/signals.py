@@ -0,0 +1,47 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db.models.signals import post_delete, post_save
+
+from . import changelog
+from .models import ChangeLogEntry
+from .registry import get_models
+
+# Models whose per-row delete bookkeeping is skipped in the current context.
+_quiet_deletes = ContextVar('quiet_deletes', default=frozenset())
+
+
+@contextmanager
+def quiet_deletes(model):
+    """
+    Skip the change log, counter and audit handlers for deletes of `model`
+    inside the block, for callers that record the whole batch themselves.
+    """
+    token = _quiet_deletes.set(_quiet_deletes.get() | {model})
+    try:
+        yield
+    finally:
+        _quiet_deletes.reset(token)
+
+
+def deletes_are_quiet(model):
+    return model in _quiet_deletes.get()
+
+
+def record_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    action = ChangeLogEntry.INSERT if created else ChangeLogEntry.UPDATE
+    changelog.record(sender, [instance.pk], action)
+
+
+def record_delete(sender, instance, **kwargs):
+    if deletes_are_quiet(sender):
+        return
+    changelog.record(sender, [instance.pk], ChangeLogEntry.DELETE)
+
+
+def connect():
+    for collection, model in get_models().items():
+        post_save.connect(record_save, sender=model, dispatch_uid=f'changelog-save-{collection}')
+        post_delete.connect(record_delete, sender=model, dispatch_uid=f'changelog-delete-{collection}')
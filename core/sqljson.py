@@ -0,0 +1,83 @@
+"""
+JSON_ENGINE = 'sqlite': list endpoints whose serializers only copy columns
+can build their whole response body in one query with SQLite's json_object()
+and json_group_array(), and return that text as it comes back, with no
+per-row work in Python.
+
+The text matches what DRF's JSONRenderer would produce byte for byte: SQLite
+writes compact JSON and escapes strings the way json.dumps() does with
+ensure_ascii=False, and the two line separators JSONRenderer escapes are
+replaced in SQL. Values SQLite cannot reproduce (media names that
+storage.url() would percent-encode, storages other than the filesystem) make
+the view fall back to its serializer.
+"""
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.db import connections, router
+from django.db.models import Aggregate, BooleanField, Case, F, Func, Q, TextField, Value, When
+from django.db.models.functions import Concat
+from django.http import HttpResponse
+
+# Characters storage.url() passes through unchanged; anything else, and
+# leading or embedded dot segments, is left to the serializer.
+UNSAFE_NAME_GLOBS = ['*[^-A-Za-z0-9_./]*', '.*', '*/.*']
+
+
+class JSONGroupArray(Aggregate):
+    function = 'JSON_GROUP_ARRAY'
+    output_field = TextField()
+
+
+class JSON(Func):
+    # Marks text as JSON so it nests as a value rather than as a string;
+    # results of subqueries lose that mark in SQLite.
+    function = 'JSON'
+    output_field = TextField()
+
+
+class Glob(Func):
+    function = 'GLOB'
+    output_field = BooleanField()
+
+
+def enabled(model):
+    return settings.JSON_ENGINE == 'sqlite' and connections[router.db_for_read(model)].vendor == 'sqlite'
+
+
+def media_url(request, model, field_name):
+    """What CachedURLImageField renders for `field_name`, or None if SQL can't build it."""
+    storage = model._meta.get_field(field_name).storage
+    if not isinstance(storage, FileSystemStorage):
+        return None
+    prefix = request.build_absolute_uri(storage.url(''))
+    return Case(
+        When(Q(**{f'{field_name}__isnull': True}) | Q(**{field_name: ''}), then=Value(None)),
+        default=Concat(Value(prefix), F(field_name)),
+        output_field=TextField(),
+    )
+
+
+def unsafe_name(field_name):
+    condition = Q()
+    for pattern in UNSAFE_NAME_GLOBS:
+        condition |= Q(Glob(Value(pattern), F(field_name)))
+    return condition
+
+
+def fetch(queryset, body, check):
+    """
+    Run SELECT <body>, <check> FROM (<queryset>) and return both values, the
+    JSON text in `body` with U+2028/U+2029 escaped as JSONRenderer does.
+    """
+    inner, params = queryset.query.sql_with_params()
+    sql = (
+        f"SELECT replace(replace({body}, char(8232), '\\u2028'), char(8233), '\\u2029'), {check} "
+        f"FROM ({inner})"
+    )
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchone()
+
+
+def response(content):
+    return HttpResponse(content, content_type='application/json')
@@ -0,0 +1,181 @@
+"""
+In-process static file serving for deployments without a separate web server.
+
+`collectstatic` with CompressedManifestStaticFilesStorage writes hashed
+copies of every asset, a manifest, and gzip (and brotli, when the `brotli`
+package is installed) siblings for text assets. StaticFilesMiddleware indexes
+STATIC_ROOT once at startup and answers /static/ requests from that index:
+no filesystem lookups per request, the smallest encoding the client accepts
+with the highest q-value, and far-future caching for hashed names. Each
+encoding is its own representation with its own ETag, and responses for
+files with compressed siblings carry `Vary: Accept-Encoding`.
+"""
+import gzip
+import mimetypes
+import os
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.files.base import ContentFile
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils.http import http_date, parse_etags
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.mjs', '.map', '.json', '.svg', '.txt', '.html', '.xml', '.ico')
+MIN_COMPRESS_SIZE = 256
+IMMUTABLE = 'public, max-age=31536000, immutable'
+# Preferred first when the client accepts several equally.
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def parse_accept_encoding(header):
+    """{coding: q-value} from an Accept-Encoding header."""
+    qvalues = {}
+    for item in header.split(','):
+        coding, *params = [part.strip() for part in item.split(';')]
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qvalues[coding.lower()] = q
+    return qvalues
+
+
+def choose_encoding(header, available):
+    """The encoding in `available` to send, or None for the plain file."""
+    qvalues = parse_accept_encoding(header)
+    default = qvalues.get('*', 0.0)
+    best, best_q = None, 0.0
+    for encoding, suffix in ENCODINGS:
+        q = qvalues.get(encoding, default)
+        if encoding in available and q > best_q:
+            best, best_q = encoding, q
+    # The plain file is always acceptable, but only beats a compressed
+    # variant when the client explicitly prefers it.
+    if best is not None and qvalues.get('identity', 0.0) > best_q:
+        return None
+    return best
+
+
+def compress(data):
+    variants = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['.br'] = brotli.compress(data)
+    # Only keep variants that are meaningfully smaller than the original.
+    return {suffix: body for suffix, body in variants.items() if len(body) < len(data) * 0.95}
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        names = set(paths) | set(self.hashed_files.values())
+        for name in sorted(names):
+            if name.endswith(COMPRESSIBLE_EXTENSIONS) and self.exists(name):
+                with self.open(name) as original:
+                    data = original.read()
+                if len(data) < MIN_COMPRESS_SIZE:
+                    continue
+                for suffix, body in compress(data).items():
+                    if self.exists(name + suffix):
+                        self.delete(name + suffix)
+                    self._save(name + suffix, ContentFile(body))
+
+
+@dataclass
+class StaticFile:
+    path: str
+    size: int
+    content_type: str
+    last_modified: str
+    etag: str
+    cache_control: str
+    variants: dict = field(default_factory=dict)
+
+
+def build_index(root, url_prefix, immutable_names, max_age):
+    index = {}
+    for directory, dirnames, filenames in os.walk(root):
+        for filename in filenames:
+            if filename.endswith(('.gz', '.br')) or filename == 'staticfiles.json':
+                continue
+            path = os.path.join(directory, filename)
+            name = os.path.relpath(path, root).replace(os.sep, '/')
+            stat = os.stat(path)
+            variants = {}
+            for encoding, suffix in ENCODINGS:
+                if os.path.exists(path + suffix):
+                    variants[encoding] = (path + suffix, os.path.getsize(path + suffix))
+            etag = f'{stat.st_size:x}-{int(stat.st_mtime):x}'
+            index[url_prefix + name] = StaticFile(
+                path=path,
+                size=stat.st_size,
+                content_type=mimetypes.guess_type(filename)[0] or 'application/octet-stream',
+                last_modified=http_date(stat.st_mtime),
+                etag=etag,
+                cache_control=IMMUTABLE if name in immutable_names else f'public, max-age={max_age}',
+                variants=variants,
+            )
+    return index
+
+
+def load_immutable_names(root):
+    storage = ManifestStaticFilesStorage(location=root)
+    try:
+        hashed_files, _ = storage.load_manifest()
+        return set(hashed_files.values())
+    except ValueError:
+        return set()
+
+
+class StaticFilesMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        root = settings.STATIC_ROOT
+        if not settings.STATIC_SERVE or not root or not os.path.isdir(root):
+            raise MiddlewareNotUsed
+        self.prefix = settings.STATIC_URL
+        self.index = build_index(root, self.prefix, load_immutable_names(root), settings.STATIC_MAX_AGE)
+
+    def __call__(self, request):
+        if request.method in ('GET', 'HEAD') and request.path_info.startswith(self.prefix):
+            static_file = self.index.get(request.path_info)
+            if static_file is not None:
+                return self.serve(request, static_file)
+        return self.get_response(request)
+
+    def serve(self, request, static_file):
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''), static_file.variants)
+        if encoding:
+            path, size = static_file.variants[encoding]
+            etag = f'"{static_file.etag}-{encoding}"'
+        else:
+            path, size = static_file.path, static_file.size
+            etag = f'"{static_file.etag}"'
+        if_none_match = parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))
+        if etag in if_none_match or '*' in if_none_match:
+            response = HttpResponseNotModified()
+        else:
+            response = FileResponse(open(path, 'rb'), content_type=static_file.content_type)
+            response['Content-Length'] = size
+            if encoding:
+                response['Content-Encoding'] = encoding
+        if static_file.variants:
+            response['Vary'] = 'Accept-Encoding'
+        response['Cache-Control'] = static_file.cache_control
+        response['Last-Modified'] = static_file.last_modified
+        response['ETag'] = etag
+        return response
@@ -0,0 +1,162 @@
+"""
+Server-Sent Events change stream.
+
+Each worker runs a single `ChangeBroker` inside its event loop. The broker
+polls the change log once per interval, no matter how many clients are
+connected, and fans "collection X changed at version N" notifications out
+to the subscribers. A subscriber only ever holds the latest version per
+collection, so a slow client coalesces notifications instead of buffering
+them.
+"""
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from . import changelog
+
+STREAM_PATH = '/api/stream/'
+
+
+class Subscription:
+    def __init__(self, since=None):
+        # `since` is the client's Last-Event-ID, replayed once versions are known.
+        self.since = since
+        self.pending = {}
+        self.ready = asyncio.Event()
+
+    def catch_up(self, versions):
+        if self.since is not None:
+            for collection, version in versions.items():
+                if version > self.since:
+                    self.push(collection, version)
+            self.since = None
+
+    def push(self, collection, version):
+        self.pending[collection] = version
+        self.ready.set()
+
+    def drain(self):
+        pending, self.pending = self.pending, {}
+        self.ready.clear()
+        return sorted(pending.items(), key=lambda item: item[1])
+
+
+class ChangeBroker:
+    def __init__(self):
+        self.subscribers = set()
+        self.versions = None
+        self._task = None
+
+    def subscribe(self, last_event_id=None):
+        subscription = Subscription(last_event_id)
+        self.subscribers.add(subscription)
+        if self.versions is not None:
+            subscription.catch_up(self.versions)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run())
+        return subscription
+
+    def unsubscribe(self, subscription):
+        self.subscribers.discard(subscription)
+
+    def publish(self, versions):
+        previous = self.versions
+        self.versions = versions
+        if previous is None:
+            for subscription in self.subscribers:
+                subscription.catch_up(versions)
+            return
+        for collection, version in versions.items():
+            if version > previous.get(collection, 0):
+                for subscription in self.subscribers:
+                    subscription.push(collection, version)
+
+    async def run(self):
+        # The poller only lives while someone is listening.
+        while self.subscribers:
+            versions = await sync_to_async(changelog.collection_versions)()
+            self.publish(versions)
+            await asyncio.sleep(settings.STREAM_POLL_INTERVAL)
+        self.versions = None
+
+
+broker = ChangeBroker()
+
+
+def format_event(collection, version):
+    data = json.dumps({'collection': collection, 'version': version}, separators=(',', ':'))
+    return f'id: {version}\nevent: change\ndata: {data}\n\n'.encode()
+
+
+async def stream(scope, receive, send):
+    if scope['method'] not in ('GET', 'HEAD'):
+        await send({'type': 'http.response.start', 'status': 405, 'headers': [(b'allow', b'GET, HEAD')]})
+        await send({'type': 'http.response.body', 'body': b''})
+        return
+
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [
+            (b'content-type', b'text/event-stream'),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no'),
+        ],
+    })
+    if scope['method'] == 'HEAD':
+        await send({'type': 'http.response.body', 'body': b''})
+        return
+
+    last_event_id = None
+    for name, value in scope.get('headers', []):
+        if name == b'last-event-id' and value.isdigit():
+            last_event_id = int(value)
+
+    disconnected = asyncio.Event()
+
+    async def watch_disconnect():
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                disconnected.set()
+                return
+
+    watcher = asyncio.create_task(watch_disconnect())
+    subscription = broker.subscribe(last_event_id)
+    try:
+        await send({'type': 'http.response.body', 'body': b'retry: 5000\n\n', 'more_body': True})
+        while not disconnected.is_set():
+            ready = asyncio.create_task(subscription.ready.wait())
+            gone = asyncio.create_task(disconnected.wait())
+            await asyncio.wait(
+                {ready, gone},
+                timeout=settings.STREAM_HEARTBEAT_INTERVAL,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            ready.cancel()
+            gone.cancel()
+            if disconnected.is_set():
+                break
+            events = subscription.drain()
+            body = b''.join(format_event(collection, version) for collection, version in events)
+            await send({'type': 'http.response.body', 'body': body or b': heartbeat\n\n', 'more_body': True})
+    except OSError:
+        pass
+    finally:
+        broker.unsubscribe(subscription)
+        watcher.cancel()
+
+
+class StreamRouter:
+    """Serves the change stream and hands every other scope to `app`."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http' and scope['path'] == STREAM_PATH:
+            await stream(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
@@ -0,0 +1,7 @@
+from .jobs import task
+from . import webhooks
+
+
+@task
+def deliver_webhook(webhook_id):
+    return webhooks.deliver(webhook_id)
@@ -0,0 +1,22 @@
+import os
+import tempfile
+
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    """DiscoverRunner that keeps RATELIMIT_DATABASE out of the project directory."""
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.ratelimit_directory = tempfile.TemporaryDirectory()
+        self.ratelimit_settings = override_settings(
+            RATELIMIT_DATABASE=os.path.join(self.ratelimit_directory.name, 'ratelimit.sqlite3'),
+        )
+        self.ratelimit_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.ratelimit_settings.disable()
+        self.ratelimit_directory.cleanup()
+        super().teardown_test_environment(**kwargs)
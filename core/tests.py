@@ -0,0 +1,1391 @@
+import asyncio
+import gzip
+import hashlib
+import hmac
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from unittest import mock, skipUnless
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.contrib.auth.models import User
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed, ValidationError
+from django.core.management import CommandError
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import DatabaseError, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import ResolverMatch, reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework import status
+from general.models import ToolCategory, Tool, LinkCategory, ImportantLinks, Role, TeamMember
+from general.serializers import ToolSerializer, TeamMemberSerializer
+from technical_information.models import (
+    TestingAccountEnvironment, TestingAccount,
+    SyntheticEventTarget, SyntheticEventType, SyntheticEvent
+)
+from renovators.asgi import application
+from .admin import EstimatedCountPaginator
+from .management.commands.profile_startup import by_package, parse_importtime
+from .models import AuditEntry, ChangeLogEntry, Job, Webhook
+from . import audit, bootstrap, changelog, dispatch, export, jobs, loadtest, stream, throttling, warmup, webhooks
+from . import storage as media_storage
+from .staticfiles import StaticFilesMiddleware
+from .storage import HashedFileSystemStorage
+from .throttling import TokenBucketStore
+
+try:
+    import boto3
+    from moto.server import ThreadedMotoServer
+    from storages.backends.s3 import S3Storage
+except ImportError:
+    ThreadedMotoServer = None
+
+
+class ChangeLogSignalTest(TestCase):
+    def test_insert_update_delete_are_recorded(self):
+        category = ToolCategory.objects.create(name="Design")
+        category.name = "Design Tools"
+        category.save()
+        category_id = category.id
+        category.delete()
+        
+        actions = list(
+            ChangeLogEntry.objects.filter(collection='tool-categories', object_id=category_id)
+            .order_by('id').values_list('action', flat=True)
+        )
+        self.assertEqual(actions, ['insert', 'update', 'delete'])
+
+    def test_cascade_delete_records_tombstones(self):
+        category = ToolCategory.objects.create(name="Design")
+        tool = Tool.objects.create(name='Figma', description='Design tool', link='https://figma.com', category=category)
+        category.delete()
+        
+        self.assertTrue(
+            ChangeLogEntry.objects.filter(collection='tools', object_id=tool.id, action='delete').exists()
+        )
+
+    def test_collection_versions(self):
+        ToolCategory.objects.create(name="Design")
+        TestingAccountEnvironment.objects.create(name="Staging")
+        
+        with self.assertNumQueries(1):
+            versions = changelog.collection_versions()
+        self.assertEqual(versions['tool-categories'], changelog.current_version('tool-categories'))
+        self.assertEqual(versions['testing-account-environments'], changelog.current_version())
+        self.assertNotIn('tools', versions)
+
+
+class ChangesAPITest(APITestCase):
+    def setUp(self):
+        self.category = ToolCategory.objects.create(name="Design")
+        self.tool = Tool.objects.create(name='Figma', description='Design tool', link='https://figma.com', category=self.category)
+        self.cursor = changelog.current_version()
+
+    def test_full_sync_from_zero(self):
+        response = self.client.get(reverse('changes'))
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['cursor'], self.cursor)
+        self.assertFalse(response.data['has_more'])
+        tools = response.data['changes']['tools']
+        self.assertEqual(tools['upserted'][0]['name'], 'Figma')
+        self.assertEqual(tools['upserted'][0]['category'], self.category.id)
+        self.assertEqual(tools['deleted'], [])
+
+    def test_only_changed_rows_since_cursor(self):
+        self.tool.name = 'Figma Pro'
+        self.tool.save()
+        
+        response = self.client.get(reverse('changes'), {'since': self.cursor})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(response.data['changes']), ['tools'])
+        self.assertEqual([row['name'] for row in response.data['changes']['tools']['upserted']], ['Figma Pro'])
+
+    def test_deleted_rows_become_tombstones(self):
+        tool_id = self.tool.id
+        self.tool.save()
+        self.tool.delete()
+        
+        response = self.client.get(reverse('changes'), {'since': self.cursor})
+        
+        self.assertEqual(response.data['changes']['tools'], {'upserted': [], 'deleted': [tool_id]})
+
+    def test_no_changes_keeps_cursor(self):
+        response = self.client.get(reverse('changes'), {'since': self.cursor})
+        
+        self.assertEqual(response.data, {'cursor': self.cursor, 'has_more': False, 'changes': {}})
+
+    def test_rows_look_like_the_public_endpoints(self):
+        environment = TestingAccountEnvironment.objects.create(name="Staging")
+        active = TestingAccount.objects.create(
+            label='Active', description='Account', username='user', password='secret', environment=environment
+        )
+        inactive = TestingAccount.objects.create(
+            label='Retired', description='Account', username='old', password='secret', environment=environment,
+            is_active=False,
+        )
+        
+        changes = self.client.get(reverse('changes'), {'since': self.cursor}).data['changes']
+        
+        [account] = changes['testing-accounts']['upserted']
+        self.assertEqual(account['id'], active.pk)
+        self.assertEqual(account['environment'], {'id': environment.pk, 'name': 'Staging'})
+        self.assertNotIn('password', account)
+        self.assertEqual(changes['testing-accounts']['deleted'], [inactive.pk])
+        category = self.client.get(reverse('changes')).data['changes']['tool-categories']['upserted'][0]
+        self.assertEqual(set(category), {'id', 'name'})
+
+    def test_limit_pages_through_log(self):
+        environment = TestingAccountEnvironment.objects.create(name="Staging")
+        TestingAccount.objects.create(
+            label='Account', description='Account', username='user', password='pass', environment=environment
+        )
+        
+        first = self.client.get(reverse('changes'), {'since': self.cursor, 'limit': 1})
+        self.assertTrue(first.data['has_more'])
+        self.assertEqual(list(first.data['changes']), ['testing-account-environments'])
+        
+        second = self.client.get(reverse('changes'), {'since': first.data['cursor'], 'limit': 1})
+        self.assertEqual(list(second.data['changes']), ['testing-accounts'])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse('changes'), {'since': 'yesterday'})
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('since', response.data)
+
+
+@override_settings(STREAM_POLL_INTERVAL=0.01, STREAM_HEARTBEAT_INTERVAL=0.05)
+class ChangeStreamTest(TestCase):
+    def make_client(self, headers=()):
+        disconnect = asyncio.Event()
+        sent = []
+
+        async def receive():
+            await disconnect.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {'type': 'http', 'method': 'GET', 'path': '/api/stream/', 'headers': list(headers)}
+        return scope, receive, send, sent, disconnect
+
+    async def wait_for_body(self, sent, needle):
+        for _ in range(200):
+            if needle in b''.join(message.get('body', b'') for message in sent):
+                return
+            await asyncio.sleep(0.01)
+        self.fail(f'{needle!r} never arrived')
+
+    async def test_change_notification(self):
+        scope, receive, send, sent, disconnect = self.make_client()
+        task = asyncio.create_task(application(scope, receive, send))
+        await asyncio.sleep(0.05)
+        
+        await ToolCategory.objects.acreate(name="Design")
+        version = await sync_to_async(changelog.current_version)()
+        await self.wait_for_body(sent, f'"collection":"tool-categories","version":{version}'.encode())
+        
+        disconnect.set()
+        await task
+        self.assertEqual(sent[0]['status'], 200)
+        self.assertIn((b'content-type', b'text/event-stream'), sent[0]['headers'])
+        self.assertEqual(stream.broker.subscribers, set())
+
+    async def test_heartbeat_when_idle(self):
+        scope, receive, send, sent, disconnect = self.make_client()
+        task = asyncio.create_task(application(scope, receive, send))
+        
+        await self.wait_for_body(sent, b': heartbeat')
+        disconnect.set()
+        await task
+
+    async def test_last_event_id_replays_missed_collections(self):
+        await ToolCategory.objects.acreate(name="Design")
+        version = await sync_to_async(changelog.current_version)()
+        scope, receive, send, sent, disconnect = self.make_client([(b'last-event-id', str(version - 1).encode())])
+        task = asyncio.create_task(application(scope, receive, send))
+        
+        await self.wait_for_body(sent, f'id: {version}\nevent: change'.encode())
+        disconnect.set()
+        await task
+
+    def test_slow_subscriber_coalesces(self):
+        subscription = stream.Subscription()
+        subscription.push('tools', 3)
+        subscription.push('roles', 4)
+        subscription.push('tools', 7)
+        
+        self.assertEqual(subscription.drain(), [('roles', 4), ('tools', 7)])
+        self.assertEqual(subscription.drain(), [])
+
+
+class BootstrapAPITest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        category = ToolCategory.objects.create(name="Design")
+        Tool.objects.create(name='Figma', description='Design tool', link='https://figma.com', category=category)
+        link_category = LinkCategory.objects.create(name="Documentation")
+        ImportantLinks.objects.create(label='Django Docs', link='https://docs.djangoproject.com', category=link_category)
+        role = Role.objects.create(name="Designer")
+        TeamMember.objects.create(name="Alice", email="alice@example.com", contact_number="555-000-0000", role=role)
+        target = SyntheticEventTarget.objects.create(name="Homepage")
+        event_type = SyntheticEventType.objects.create(name="Smoke Test", description="Basic checks")
+        SyntheticEvent.objects.create(name="Homepage Load", description="Load test", target=target, event_type=event_type)
+
+    def test_bootstrap_matches_individual_endpoints(self):
+        response = self.client.get(reverse('bootstrap'))
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(list(data), ['tools', 'important-links', 'team-members', 'synthetic-events'])
+        self.assertEqual(data['tools'], self.client.get(reverse('tool-categories')).json())
+        self.assertEqual(data['important-links'], self.client.get(reverse('important-links')).json())
+        self.assertEqual(data['team-members'], self.client.get(reverse('team-members')).json())
+        self.assertEqual(data['synthetic-events'], self.client.get(reverse('synthetic-events')).json())
+
+    def test_bootstrap_ignores_query_parameters(self):
+        response = self.client.get(reverse('bootstrap'), {'category': 0})
+        
+        self.assertEqual(len(response.json()['tools']), 1)
+
+    def test_bootstrap_is_cached_as_one_unit(self):
+        first = self.client.get(reverse('bootstrap'))
+        
+        with self.assertNumQueries(1):
+            second = self.client.get(reverse('bootstrap'))
+        self.assertEqual(first.content, second.content)
+
+    def test_bootstrap_cache_follows_changes(self):
+        self.client.get(reverse('bootstrap'))
+        member = TeamMember.objects.get(name="Alice")
+        member.name = "Alice Johnson"
+        member.save()
+        
+        response = self.client.get(reverse('bootstrap'))
+        self.assertEqual(response.json()['team-members'][0]['name'], 'Alice Johnson')
+
+
+class BootstrapConcurrencyTest(TransactionTestCase):
+    def tearDown(self):
+        # Write out the audit entries this test committed while the tables exist.
+        audit.writer.stop()
+
+    def test_concurrent_build_matches_serial_build(self):
+        category = ToolCategory.objects.create(name="Design")
+        Tool.objects.create(name='Figma', description='Design tool', link='https://figma.com', category=category)
+        request = RequestFactory().get('/api/bootstrap/')
+        
+        with override_settings(BOOTSTRAP_CONCURRENT=True):
+            concurrent = bootstrap.build(request)
+        with override_settings(BOOTSTRAP_CONCURRENT=False):
+            serial = bootstrap.build(request)
+        
+        self.assertEqual(concurrent, serial)
+        self.assertEqual(json.loads(concurrent['tools'])[0]['tools'][0]['name'], 'Figma')
+
+    def test_sqlite_builds_in_this_thread(self):
+        request = RequestFactory().get('/api/bootstrap/')
+        
+        with mock.patch.object(bootstrap._executor, 'submit') as submit:
+            bootstrap.build(request)
+        
+        submit.assert_not_called()
+
+
+class BatchAPITest(APITestCase):
+    def setUp(self):
+        self.category = ToolCategory.objects.create(name="Design")
+        Tool.objects.create(name='Figma', description='Design tool', link='https://figma.com', category=self.category)
+        ToolCategory.objects.create(name="Testing")
+        role = Role.objects.create(name="Designer")
+        TeamMember.objects.create(name="Alice", email="alice@example.com", contact_number="555-000-0000", role=role)
+
+    def post_batch(self, urls):
+        return self.client.post(reverse('batch'), {'requests': urls}, format='json')
+
+    def test_batch_dispatches_each_url(self):
+        response = self.post_batch(['/api/tools/', f'/api/tools/?category={self.category.id}', '/api/team-members/'])
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        responses = response.data['responses']
+        self.assertEqual([item['status'] for item in responses], [200, 200, 200])
+        self.assertEqual(responses[0]['body'], self.client.get(reverse('tool-categories')).data)
+        self.assertEqual([category['name'] for category in responses[1]['body']], ['Design'])
+        self.assertEqual(responses[2]['body'][0]['name'], 'Alice')
+
+    def test_batch_reports_errors_per_request(self):
+        response = self.post_batch(['/api/unknown/', '/api/tools/?ordering=link'])
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['responses'][0]['status'], 404)
+        self.assertEqual(response.data['responses'][1]['status'], 400)
+        self.assertIn('ordering', response.data['responses'][1]['body'])
+
+    def test_batch_calls_act_as_the_batch_user(self):
+        url = reverse('history', args=['tool-categories', self.category.pk])
+        
+        self.assertEqual(self.post_batch([url]).data['responses'][0]['status'], 403)
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+        self.assertEqual(self.post_batch([url]).data['responses'][0]['status'], 200)
+
+    def test_batch_refuses_binary_bodies(self):
+        def binary(request):
+            return HttpResponse(b'\x89PNG\xff', content_type='image/png')
+        
+        with mock.patch.object(dispatch, 'resolve', return_value=ResolverMatch(binary, (), {})):
+            item = self.post_batch(['/api/tools/']).data['responses'][0]
+        
+        self.assertEqual(item['status'], 406)
+        self.assertIn('binary', item['body']['detail'])
+
+    def test_batch_includes_bootstrap(self):
+        response = self.post_batch(['/api/bootstrap/'])
+        
+        self.assertEqual(response.data['responses'][0]['status'], 200)
+        self.assertIn('tools', response.data['responses'][0]['body'])
+
+    def test_batch_rejects_disallowed_urls(self):
+        for url in ['https://example.com/api/tools/', '/admin/', '/api/batch/', 42]:
+            response = self.post_batch([url])
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, url)
+
+    @override_settings(BATCH_MAX_REQUESTS=2)
+    def test_batch_size_limit(self):
+        response = self.post_batch(['/api/tools/'] * 3)
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_batch_requires_request_list(self):
+        response = self.client.post(reverse('batch'), {'requests': '/api/tools/'}, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ScalableAdminTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.force_login(self.user)
+        self.categories = [ToolCategory.objects.create(name=f"Category {index:02d}") for index in range(5)]
+        for index in range(12):
+            Tool.objects.create(
+                name=f'Tool {index}', description='Tool', link='https://example.com', category=self.categories[0]
+            )
+
+    @override_settings(ADMIN_EXACT_COUNT_LIMIT=20)
+    def test_paginator_counts_exactly_below_limit(self):
+        paginator = EstimatedCountPaginator(Tool.objects.order_by('pk'), 5)
+        
+        self.assertEqual(paginator.count, 12)
+
+    @override_settings(ADMIN_EXACT_COUNT_LIMIT=5)
+    def test_paginator_estimates_above_limit(self):
+        Tool.objects.filter(name='Tool 3').delete()
+        paginator = EstimatedCountPaginator(Tool.objects.order_by('pk'), 5)
+        
+        self.assertEqual(paginator.count, 12)
+
+    @override_settings(ADMIN_EXACT_COUNT_LIMIT=5)
+    def test_filtered_changelist_reports_lower_bound(self):
+        Tool.objects.create(name='Other', description='Tool', link='https://example.com', category=self.categories[1])
+        for index in range(30):
+            Tool.objects.create(name=f'Spare {index}', description='Tool', link='https://example.com', category=self.categories[1])
+        Tool.objects.filter(name__startswith='Spare').delete()
+        url = reverse('admin:general_tool_changelist')
+        response = self.client.get(url, {'category__id__exact': self.categories[0].id})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.context['cl'].result_count, 6)
+        self.assertContains(response, 'more than 5 tools')
+        
+        paginator = EstimatedCountPaginator(Tool.objects.filter(category=self.categories[0]).order_by('pk'), 5)
+        
+        self.assertEqual(paginator.num_pages, 2)
+        self.assertEqual(len(paginator.page(2)), 5)
+        self.assertEqual(len(paginator.page(3)), 2)
+        self.assertEqual(len(paginator.page(9)), 0)
+
+    def test_filter_ignores_invalid_values(self):
+        url = reverse('admin:general_tool_changelist')
+        response = self.client.get(url, {'category__id__exact': 'abc'})
+        
+        self.assertRedirects(response, f'{url}?e=1', fetch_redirect_response=False)
+
+    @override_settings(ADMIN_FILTER_CHOICES_LIMIT=2)
+    def test_filter_sidebar_is_bounded(self):
+        url = reverse('admin:general_tool_changelist')
+        response = self.client.get(url, {'category__id__exact': self.categories[4].id})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        spec = response.context['cl'].filter_specs[0]
+        self.assertEqual(
+            [label for pk, label in spec.lookup_choices],
+            ['Category 00', 'Category 01', 'Category 04']
+        )
+
+    def test_changelist_skips_full_count(self):
+        Tool.objects.create(name='Figma', description='Design tool', link='https://figma.com', category=self.categories[1])
+        response = self.client.get(reverse('admin:general_tool_changelist'), {'q': 'fig'})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.context['cl'].full_result_count)
+        self.assertEqual(response.context['cl'].result_count, 1)
+
+    def test_prefix_search_uses_nocase_index(self):
+        queryset = Tool.objects.filter(name__istartswith='tool 1')
+        
+        self.assertIn('tool_name_nocase_idx', queryset.explain())
+
+    def test_autocomplete_widget_for_foreign_keys(self):
+        response = self.client.get(reverse('admin:general_tool_add'))
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertContains(response, 'admin-autocomplete')
+
+
+class CachedMediaURLTest(TestCase):
+    def setUp(self):
+        media_storage.clear()
+        role = Role.objects.create(name="Designer")
+        for index in range(3):
+            TeamMember.objects.create(
+                name=f"Member {index}", email=f"member{index}@example.com", contact_number="555-000-0000",
+                role=role, image=f'team_members/member{index}.png'
+            )
+
+    def test_urls_are_generated_once_per_object(self):
+        members = TeamMember.objects.select_related('role')
+        with mock.patch.object(FileSystemStorage, 'url', autospec=True, side_effect=FileSystemStorage.url) as url:
+            first = TeamMemberSerializer(members, many=True).data
+            second = TeamMemberSerializer(members, many=True).data
+        
+        self.assertEqual(url.call_count, 3)
+        self.assertEqual(first, second)
+        self.assertEqual(first[0]['image'], '/media/team_members/member0.png')
+
+    def test_new_upload_gets_a_new_url(self):
+        member = TeamMember.objects.first()
+        TeamMemberSerializer(member).data
+        member.image = 'team_members/replacement.png'
+        
+        self.assertEqual(TeamMemberSerializer(member).data['image'], '/media/team_members/replacement.png')
+
+    def test_signed_urls_expire_early(self):
+        signed = mock.Mock(querystring_auth=True, querystring_expire=600)
+        
+        self.assertEqual(media_storage.url_timeout(signed), 300)
+        self.assertEqual(media_storage.url_timeout(FileSystemStorage()), 3600)
+
+
+@skipUnless(ThreadedMotoServer is not None, "moto is not installed")
+class S3MediaStorageTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)
+        cls.server = ThreadedMotoServer(ip_address='127.0.0.1', port=0, verbose=False)
+        cls.server.start()
+        cls.addClassCleanup(cls.server.stop)
+        host, port = cls.server.get_host_and_port()
+        cls.options = {
+            'bucket_name': 'renovators-media',
+            'endpoint_url': f'http://{host}:{port}',
+            'access_key': 'testing',
+            'secret_key': 'testing',
+            'region_name': 'us-east-1',
+            'querystring_auth': True,
+            'file_overwrite': False,
+        }
+        boto3.client(
+            's3', endpoint_url=cls.options['endpoint_url'], region_name='us-east-1',
+            aws_access_key_id='testing', aws_secret_access_key='testing',
+        ).create_bucket(Bucket='renovators-media')
+
+    def setUp(self):
+        media_storage.clear()
+        storages_override = {
+            'default': {'BACKEND': 'storages.backends.s3.S3Storage', 'OPTIONS': self.options},
+            'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+        }
+        self.enterContext(override_settings(STORAGES=storages_override))
+
+    def test_upload_and_signed_url_memo(self):
+        category = ToolCategory.objects.create(name="Design")
+        with self.assertLogs('core.images', 'WARNING'):  # no metadata for an invalid image
+            tool = Tool.objects.create(
+                name='Figma', description='Design tool', link='https://figma.com', category=category,
+                image=SimpleUploadedFile('figma.png', b'not really a png', content_type='image/png'),
+            )
+        self.assertTrue(default_storage.exists(tool.image.name))
+        
+        with mock.patch.object(S3Storage, 'url', autospec=True, side_effect=S3Storage.url) as url:
+            first = ToolSerializer(tool).data['image']
+            second = ToolSerializer(tool).data['image']
+        
+        self.assertEqual(url.call_count, 1)
+        self.assertEqual(first, second)
+        self.assertTrue(first.startswith(self.options['endpoint_url']))
+        self.assertIn('Signature=', first)
+
+    def test_uploads_never_overwrite(self):
+        first = default_storage.save('tools/logo.png', ContentFile(b'one'))
+        second = default_storage.save('tools/logo.png', ContentFile(b'two'))
+        
+        self.assertNotEqual(first, second)
+
+
+class MediaServingTest(TestCase):
+    def setUp(self):
+        media_root = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+        self.storage = HashedFileSystemStorage(location=media_root)
+        self.logo = self.storage.save('tools/logo.png', ContentFile(b'0123456789'))
+        os.makedirs(os.path.join(media_root, 'private'))
+        with open(os.path.join(media_root, 'private', 'notes.txt'), 'wb') as f:
+            f.write(b'secret')
+        with open(os.path.join(media_root, 'tools', 'plain.txt'), 'wb') as f:
+            f.write(b'plain')
+
+    def get(self, path, **extra):
+        return self.client.get('/media/' + path, **extra)
+
+    def test_hashed_names_are_content_addressed(self):
+        self.assertRegex(self.logo, r'^tools/logo\.[0-9a-f]{12}\.png$')
+        self.assertEqual(self.storage.save('tools/logo.png', ContentFile(b'0123456789')), self.logo)
+        self.assertNotEqual(self.storage.save('tools/logo.png', ContentFile(b'other')), self.logo)
+
+    def test_hashed_file_is_immutable(self):
+        response = self.get(self.logo)
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'0123456789')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=31536000, immutable')
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+
+    def test_unhashed_file_gets_short_max_age(self):
+        response = self.get('tools/plain.txt')
+        
+        self.assertEqual(response['Cache-Control'], 'public, max-age=3600')
+
+    def test_range_request(self):
+        response = self.get(self.logo, HTTP_RANGE='bytes=2-5')
+        
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join(response.streaming_content), b'2345')
+        self.assertEqual(response['Content-Range'], 'bytes 2-5/10')
+        self.assertEqual(response['Content-Length'], '4')
+
+    def test_suffix_range_request(self):
+        response = self.get(self.logo, HTTP_RANGE='bytes=-3')
+        
+        self.assertEqual(b''.join(response.streaming_content), b'789')
+        self.assertEqual(response['Content-Range'], 'bytes 7-9/10')
+
+    def test_unsatisfiable_range(self):
+        response = self.get(self.logo, HTTP_RANGE='bytes=20-')
+        
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */10')
+
+    def test_not_modified(self):
+        last_modified = self.get(self.logo)['Last-Modified']
+        response = self.get(self.logo, HTTP_IF_MODIFIED_SINCE=last_modified)
+        
+        self.assertEqual(response.status_code, 304)
+
+    @override_settings(MEDIA_ACCEL_REDIRECT_PREFIX='/protected-media/')
+    def test_accel_redirect(self):
+        response = self.get(self.logo)
+        
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/' + self.logo)
+        self.assertEqual(response.content, b'')
+
+    @override_settings(MEDIA_SENDFILE_HEADER='X-Sendfile')
+    def test_sendfile_header(self):
+        response = self.get(self.logo)
+        
+        self.assertEqual(response['X-Sendfile'], os.path.join(settings.MEDIA_ROOT, self.logo))
+
+    def test_private_files_require_staff(self):
+        self.assertEqual(self.get('private/notes.txt').status_code, 404)
+        
+        self.client.force_login(User.objects.create_user('staff', is_staff=True))
+        self.assertEqual(self.get('private/notes.txt').status_code, 200)
+
+    def test_path_traversal_and_missing_files(self):
+        self.assertEqual(self.get('tools/../../etc/passwd').status_code, 404)
+        self.assertEqual(self.get('tools//plain.txt').status_code, 200)
+        self.assertEqual(self.get('tools/missing.png').status_code, 404)
+        self.assertEqual(self.get('tools/').status_code, 404)
+
+    def test_public_prefix_cannot_be_walked_out_of(self):
+        for path in ['tools/../private/notes.txt', 'tools/%2e%2e/private/notes.txt', 'tools/%2E%2E/private/notes.txt',
+                     'tools/./../private/notes.txt', 'tools/..%2fprivate/notes.txt', 'tools%2f..%2fprivate/notes.txt']:
+            self.assertEqual(self.get(path).status_code, 404, path)
+
+    def test_only_safe_methods(self):
+        self.assertEqual(self.client.post('/media/' + self.logo).status_code, 405)
+
+
+class StaticFilesTest(TestCase):
+    def setUp(self):
+        source = self.enterContext(tempfile.TemporaryDirectory())
+        self.root = self.enterContext(tempfile.TemporaryDirectory())
+        with open(os.path.join(source, 'app.css'), 'w') as f:
+            f.write('body { color: #333; }\n' * 100)
+        with open(os.path.join(source, 'logo.png'), 'wb') as f:
+            f.write(b'\x89PNG' + bytes(300))
+        self.enterContext(override_settings(
+            STATICFILES_DIRS=[source],
+            STATIC_ROOT=self.root,
+            STATICFILES_FINDERS=['django.contrib.staticfiles.finders.FileSystemFinder'],
+            STORAGES={
+                'default': {'BACKEND': 'core.storage.HashedFileSystemStorage'},
+                'staticfiles': {'BACKEND': 'core.staticfiles.CompressedManifestStaticFilesStorage'},
+            },
+        ))
+        call_command('collectstatic', interactive=False, verbosity=0)
+        self.hashed_css = staticfiles_storage.stored_name('app.css')
+        self.middleware = StaticFilesMiddleware(lambda request: HttpResponse('application'))
+
+    def get(self, path, **extra):
+        return self.middleware(RequestFactory().get(path, **extra))
+
+    def test_collectstatic_writes_hashed_and_compressed_files(self):
+        self.assertRegex(self.hashed_css, r'^app\.[0-9a-f]{12}\.css$')
+        self.assertTrue(os.path.exists(os.path.join(self.root, self.hashed_css + '.gz')))
+        self.assertFalse(os.path.exists(os.path.join(self.root, staticfiles_storage.stored_name('logo.png') + '.gz')))
+
+    def test_hashed_file_is_served_compressed_and_immutable(self):
+        response = self.get('/static/' + self.hashed_css, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=31536000, immutable')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        body = gzip.decompress(b''.join(response.streaming_content))
+        self.assertTrue(body.startswith(b'body { color: #333; }'))
+        self.assertEqual(int(response['Content-Length']), os.path.getsize(os.path.join(self.root, self.hashed_css + '.gz')))
+
+    def test_uncompressed_when_not_accepted(self):
+        response = self.get('/static/' + self.hashed_css)
+        
+        self.assertNotIn('Content-Encoding', response)
+        self.assertTrue(b''.join(response.streaming_content).startswith(b'body'))
+
+    def test_unhashed_name_gets_short_max_age(self):
+        response = self.get('/static/app.css')
+        
+        self.assertEqual(response['Cache-Control'], 'public, max-age=60')
+
+    def test_encoding_follows_q_values(self):
+        path = '/static/' + self.hashed_css
+        
+        self.assertNotIn('Content-Encoding', self.get(path, HTTP_ACCEPT_ENCODING='gzip;q=0'))
+        self.assertNotIn('Content-Encoding', self.get(path, HTTP_ACCEPT_ENCODING='x-gzip'))
+        self.assertNotIn('Content-Encoding', self.get(path, HTTP_ACCEPT_ENCODING='gzip;q=0.5, identity'))
+        self.assertEqual(self.get(path, HTTP_ACCEPT_ENCODING='*')['Content-Encoding'], 'gzip')
+        self.assertEqual(self.get(path, HTTP_ACCEPT_ENCODING='deflate, GZIP;q=0.8')['Content-Encoding'], 'gzip')
+        self.assertNotIn('Content-Encoding', self.get(path, HTTP_ACCEPT_ENCODING='*;q=0'))
+
+    def test_etag_revalidation(self):
+        path = '/static/' + self.hashed_css
+        plain = self.get(path)
+        compressed = self.get(path, HTTP_ACCEPT_ENCODING='gzip')
+        
+        self.assertNotEqual(plain['ETag'], compressed['ETag'])
+        self.assertEqual(self.get(path, HTTP_IF_NONE_MATCH=plain['ETag']).status_code, 304)
+        self.assertEqual(self.get(path, HTTP_IF_NONE_MATCH=plain['ETag'], HTTP_ACCEPT_ENCODING='gzip').status_code, 200)
+        not_modified = self.get(path, HTTP_IF_NONE_MATCH=f'"other", {compressed["ETag"]}', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified['Vary'], 'Accept-Encoding')
+
+    def test_unknown_paths_fall_through(self):
+        self.assertEqual(self.get('/static/missing.css').content, b'application')
+        self.assertEqual(self.get('/api/tools/').content, b'application')
+
+    def test_not_used_without_collected_files(self):
+        with override_settings(STATIC_ROOT=os.path.join(self.root, 'missing')):
+            with self.assertRaises(MiddlewareNotUsed):
+                StaticFilesMiddleware(lambda request: HttpResponse())
+
+
+class ProfileStartupTest(SimpleTestCase):
+    def test_parse_importtime(self):
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   django.utils\n"
+            "import time:       300 |        420 | django\n"
+            "import time:        80 |         80 | decouple\n"
+        )
+        rows = parse_importtime(output)
+        
+        self.assertEqual(rows, [('django.utils', 120, 120, 1), ('django', 300, 420, 0), ('decouple', 80, 80, 0)])
+        self.assertEqual(by_package(rows), [('django', 420), ('decouple', 80)])
+
+    def test_api_role_boots_without_admin(self):
+        stdout, stderr = StringIO(), StringIO()
+        call_command(
+            'profile_startup', role='api', runs=1, top=3, path='/admin/', budget=60000,
+            stdout=stdout, stderr=stderr,
+        )
+        
+        output = stdout.getvalue()
+        self.assertIn('Import time for renovators.wsgi (role api)', output)
+        self.assertIn('status 404', output)
+        self.assertIn('admin not installed', output)
+
+    def test_boot_does_not_import_pillow(self):
+        code = "import sys, renovators.wsgi; print(sorted(name for name in ('PIL', 'boto3') if name in sys.modules))"
+        result = subprocess.run(
+            [sys.executable, '-c', code], cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+            env={**os.environ, 'DJANGO_SETTINGS_MODULE': 'renovators.settings', 'SERVER_ROLE': 'api'},
+        )
+        
+        self.assertEqual(result.stdout.strip(), '[]')
+
+    def test_budget_is_enforced(self):
+        with self.assertRaisesMessage(CommandError, 'exceeds the 1 ms budget'):
+            call_command('profile_startup', runs=1, top=1, path='/api/missing/', budget=1, stdout=StringIO(), stderr=StringIO())
+
+
+class LightMiddlewareTest(APITestCase):
+    def test_anonymous_api_reads_skip_session_auth_and_messages(self):
+        response = self.client.get('/api/tools/')
+        
+        self.assertEqual(response.status_code, 200)
+        request = response.wsgi_request
+        self.assertFalse(hasattr(request, 'session'))
+        self.assertFalse(hasattr(request, '_messages'))
+        self.assertTrue(request.user.is_anonymous)  # set by DRF, not the middleware
+        self.assertNotIn('Cookie', response.get('Vary', ''))
+
+    def test_requests_with_a_session_get_the_full_stack(self):
+        user = User.objects.create_user('reader', password='secret')
+        self.client.force_login(user)
+        
+        response = self.client.get('/api/tools/')
+        
+        self.assertEqual(response.wsgi_request.user, user)
+
+    def test_writes_and_admin_get_the_full_stack(self):
+        batch = self.client.post('/api/batch/', {'requests': ['/api/tools/']}, format='json')
+        admin = self.client.get('/admin/login/')
+        
+        self.assertTrue(batch.wsgi_request.user.is_anonymous)
+        self.assertTrue(hasattr(admin.wsgi_request, 'session'))
+        self.assertIn('csrftoken', admin.cookies)
+
+
+class TokenBucketStoreTest(SimpleTestCase):
+    def setUp(self):
+        path = os.path.join(self.enterContext(tempfile.TemporaryDirectory()), 'ratelimit.sqlite3')
+        self.workers = [TokenBucketStore(path), TokenBucketStore(path)]
+        for store in self.workers:
+            self.addCleanup(store.close)
+
+    def test_bucket_is_shared_between_workers_and_refills(self):
+        first, second = self.workers
+        
+        self.assertEqual(first.take('ip:1', capacity=2, rate=1, now=100), (True, 1))
+        self.assertEqual(second.take('ip:1', capacity=2, rate=1, now=100), (True, 0))
+        self.assertEqual(first.take('ip:1', capacity=2, rate=1, now=100.5), (False, 0.5))
+        self.assertEqual(second.take('ip:1', capacity=2, rate=1, now=101), (True, 0))
+        self.assertEqual(first.take('ip:2', capacity=2, rate=1, now=101), (True, 1))
+
+    def test_refill_is_capped_at_capacity(self):
+        store = self.workers[0]
+        store.take('ip:1', capacity=2, rate=1, now=0)
+        
+        self.assertEqual(store.take('ip:1', capacity=2, rate=1, now=1000), (True, 1))
+
+
+class RateLimitTest(APITestCase):
+    rates = {'ip': '3/min', 'bootstrap': '120/min', 'batch': '1/min'}
+
+    def setUp(self):
+        path = os.path.join(self.enterContext(tempfile.TemporaryDirectory()), 'ratelimit.sqlite3')
+        rest_framework = {**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': self.rates}
+        self.enterContext(override_settings(RATELIMIT_DATABASE=path, REST_FRAMEWORK=rest_framework))
+        self.addCleanup(throttling.get_store().close)
+
+    def test_ip_limit_returns_429_with_retry_after(self):
+        for _ in range(3):
+            self.assertEqual(self.client.get('/api/tools/').status_code, 200)
+        
+        response = self.client.get('/api/important-links/')
+        
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn(int(response['Retry-After']), (19, 20))
+        self.assertEqual(self.client.get('/api/tools/', REMOTE_ADDR='10.0.0.2').status_code, 200)
+
+    def test_forwarded_for_is_ignored_without_trusted_proxies(self):
+        for index in range(3):
+            self.client.get('/api/tools/', HTTP_X_FORWARDED_FOR=f'10.1.0.{index}')
+        
+        response = self.client.get('/api/tools/', HTTP_X_FORWARDED_FOR='10.1.0.9')
+        
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_route_limit_only_applies_to_its_route(self):
+        batch = {'requests': ['/api/changes/']}
+        
+        self.assertEqual(self.client.post('/api/batch/', batch, format='json').status_code, 200)
+        self.assertEqual(self.client.post('/api/batch/', batch, format='json').status_code, 429)
+        self.assertEqual(self.client.get('/api/changes/', REMOTE_ADDR='10.0.0.3').status_code, 200)
+
+
+class WarmupTest(TestCase):
+    def setUp(self):
+        warmup.reset()
+        self.addCleanup(warmup.reset)
+
+    def test_warm_runs_every_list_endpoint(self):
+        stdout = StringIO()
+        call_command('warm', stdout=stdout)
+        
+        self.assertTrue(warmup.is_warm())
+        for path in settings.WARM_PATHS:
+            self.assertRegex(stdout.getvalue(), rf'GET {path} +200 ')
+        self.assertIn('template admin/core/move_selected.html', stdout.getvalue())
+
+    def test_errors_keep_the_worker_unready(self):
+        answers = {'/api/summary/': (500, {})}
+        with mock.patch.object(dispatch, 'dispatch', side_effect=lambda request, path: answers.get(path, (200, []))):
+            with self.assertLogs('core.warmup', 'WARNING'):
+                results = warmup.warm()
+            with self.assertRaisesMessage(CommandError, 'GET /api/summary/'), self.assertLogs('core.warmup', 'WARNING'):
+                call_command('warm', stdout=StringIO())
+        
+        self.assertEqual(warmup.failures(results), ['GET /api/summary/'])
+        self.assertFalse(warmup.is_warm())
+        with mock.patch.object(warmup, 'start'):
+            self.assertEqual(self.client.get('/ready').status_code, 503)
+
+    def test_live_never_touches_the_database(self):
+        with self.assertNumQueries(0):
+            response = self.client.get('/live')
+        
+        self.assertEqual(response.json(), {'status': 'alive'})
+
+    def test_ready_only_after_warming(self):
+        with mock.patch.object(warmup, 'start') as start:
+            response = self.client.get('/ready')
+        
+        self.assertEqual(response.status_code, 503)
+        start.assert_called_once_with()
+        
+        warmup.warm()
+        
+        self.assertEqual(self.client.get('/ready').json(), {'status': 'ready'})
+
+
+class LoadTestTest(TestCase):
+    async def test_clients_share_the_request_budget(self):
+        await sync_to_async(loadtest.seed)(5)
+        mix = {'/api/tools/': 2, '/api/missing/': 1}
+        
+        with self.assertLogs('django.request', 'WARNING'):
+            stats, elapsed = await loadtest.run(application, mix, concurrency=5, requests=30)
+        
+        tools, missing = stats['/api/tools/'], stats['/api/missing/']
+        self.assertEqual(tools.requests + missing.requests, 30)
+        self.assertEqual(tools.errors, 0)
+        self.assertEqual(missing.errors, missing.requests)
+        self.assertGreater(missing.requests, 0)
+
+    def test_summarize(self):
+        summary = loadtest.summarize([n / 1000 for n in range(1, 101)], errors=5, elapsed=2.0)
+        
+        self.assertEqual(summary['requests'], 100)
+        self.assertEqual(summary['throughput'], 50)
+        self.assertEqual(summary['error_rate'], 0.05)
+        self.assertAlmostEqual(summary['p50'], 50.5)
+        self.assertAlmostEqual(summary['p99'], 99.01)
+
+    def test_parse_route(self):
+        self.assertEqual(loadtest.parse_route('4:/api/tools/'), ('/api/tools/', 4))
+        self.assertEqual(loadtest.parse_route('/api/changes/?since=0'), ('/api/changes/?since=0', 1))
+
+
+class SummaryAPITest(APITestCase):
+    def test_counts_come_from_the_parent_tables(self):
+        design = ToolCategory.objects.create(name="Design")
+        ToolCategory.objects.create(name="Empty")
+        Tool.objects.create(name='Figma', description='Design', link='https://figma.com', category=design)
+        Role.objects.create(name="Engineer")
+        
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('summary'))
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['tool-categories'], [
+            {'id': design.pk, 'name': 'Design', 'count': 1},
+            {'id': design.pk + 1, 'name': 'Empty', 'count': 0},
+        ])
+        self.assertEqual(response.data['roles'][0]['count'], 0)
+        self.assertEqual(set(response.data), {'tool-categories', 'link-categories', 'roles', 'synthetic-event-targets'})
+
+
+@override_settings(AUDIT_WRITER_THREAD=False)
+class AuditTest(APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Write out anything earlier tests left queued before this class's
+        # transaction starts.
+        audit.writer.stop()
+        super().setUpClass()
+
+    def setUp(self):
+        self.category = ToolCategory.objects.create(name="Design")
+        self.user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+
+    def history(self, collection, object_id):
+        return list(audit.history(collection, object_id).values_list('action', 'changes', 'username'))
+
+    def test_changes_are_queued_until_flushed(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            tool = Tool.objects.create(name='Figma', description='Design', link='https://figma.com', category=self.category)
+        with self.captureOnCommitCallbacks(execute=True):
+            tool.name = 'Figma Pro'
+            tool.save()
+        
+        self.assertFalse(AuditEntry.objects.exists())
+        self.assertEqual(audit.writer.flush(), 2)
+        (update, changes, username), (insert, created, _) = self.history('tools', tool.pk)
+        self.assertEqual((update, insert, username), ('update', 'insert', ''))
+        self.assertEqual(changes, {'name': ['Figma', 'Figma Pro']})
+        self.assertEqual(created['category'], [None, self.category.pk])
+
+    def test_unchanged_save_and_rollback_are_not_recorded(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.save()
+        try:
+            with self.captureOnCommitCallbacks(execute=True), transaction.atomic():
+                self.category.delete()
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        
+        audit.writer.flush()
+        self.assertFalse(AuditEntry.objects.exists())
+
+    def test_admin_changes_record_the_user_and_redact_passwords(self):
+        environment = TestingAccountEnvironment.objects.create(name="Staging")
+        account = TestingAccount.objects.create(
+            label='Account', description='Account', username='user', password='old', environment=environment
+        )
+        self.client.force_login(self.user)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('admin:technical_information_testingaccount_change', args=[account.pk]), {
+                'label': 'Account', 'description': 'Account', 'username': 'user', 'password': 'new',
+                'environment': environment.pk, 'is_active': 'on',
+            })
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('admin:technical_information_testingaccount_changelist'), {
+                'action': 'deactivate_accounts', ACTION_CHECKBOX_NAME: [account.pk],
+            })
+        
+        audit.writer.flush()
+        (deactivated, flags, _), (changed, changes, username) = self.history('testing-accounts', account.pk)
+        self.assertEqual((deactivated, changed, username), ('update', 'update', 'admin'))
+        self.assertEqual(changes, {'password': ['[redacted]', '[redacted]']})
+        self.assertEqual(flags, {'is_active': [True, False]})
+
+    def test_admin_clones_record_the_user(self):
+        target = SyntheticEventTarget.objects.create(name="Homepage")
+        event_type = SyntheticEventType.objects.create(name="Smoke Test", description="Basic checks")
+        event = SyntheticEvent.objects.create(name="Load", description="Load test", target=target, event_type=event_type)
+        self.client.force_login(self.user)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('admin:technical_information_syntheticevent_changelist'), {
+                'action': 'clone_events', ACTION_CHECKBOX_NAME: [event.pk],
+            })
+        
+        audit.writer.flush()
+        clone = SyntheticEvent.objects.get(name="Load (copy)")
+        [(action, changes, username)] = self.history('synthetic-events', clone.pk)
+        self.assertEqual((action, username), ('insert', 'admin'))
+        self.assertEqual(changes['name'], [None, "Load (copy)"])
+        self.assertEqual(changes['target'], [None, target.pk])
+
+    def test_full_batch_is_written_inline(self):
+        with override_settings(AUDIT_BATCH_SIZE=2), self.captureOnCommitCallbacks(execute=True):
+            ToolCategory.objects.create(name="Office")
+            self.assertEqual(AuditEntry.objects.count(), 0)
+            ToolCategory.objects.create(name="Media")
+        
+        self.assertEqual(AuditEntry.objects.count(), 2)
+
+    def test_background_writer(self):
+        writer = audit.AuditWriter()
+        with override_settings(AUDIT_WRITER_THREAD=True, AUDIT_FLUSH_INTERVAL=0.01), \
+                mock.patch.object(AuditEntry.objects, 'bulk_create') as bulk_create:
+            writer.put(AuditEntry(collection='tools', object_id=1, action='insert'))
+            for _ in range(500):
+                if bulk_create.called:
+                    break
+                time.sleep(0.01)
+            writer.put(AuditEntry(collection='tools', object_id=2, action='insert'))
+            writer.stop()
+        
+        self.assertFalse(writer.queue)
+        self.assertEqual(sum(len(call.args[0]) for call in bulk_create.call_args_list), 2)
+
+    @override_settings(AUDIT_WRITER_THREAD=False, AUDIT_BATCH_SIZE=2, AUDIT_MAX_QUEUE=3)
+    def test_failed_batches_are_retried(self):
+        writer = audit.AuditWriter()
+        writer.queue.extend(AuditEntry(collection='tools', object_id=pk, action='insert') for pk in range(1, 5))
+        with mock.patch.object(AuditEntry.objects, 'bulk_create', side_effect=DatabaseError), \
+                self.assertLogs('core.audit', 'ERROR') as logs:
+            self.assertEqual(writer.flush(), 0)
+        
+        self.assertIn('Dropped 1 audit entries', logs.output[-1])
+        self.assertEqual(writer.flush(), 3)
+        self.assertEqual(sorted(AuditEntry.objects.values_list('object_id', flat=True)), [2, 3, 4])
+
+    def test_history_endpoint(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for name in ['One', 'Two', 'Three']:
+                self.category.name = name
+                self.category.save()
+        audit.writer.flush()
+        url = reverse('history', args=['tool-categories', self.category.pk])
+        
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+        self.client.force_login(self.user)
+        with mock.patch('core.views.HistoryPagination.page_size', 2):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([entry['changes']['name'][1] for entry in response.data['results']], ['Three', 'Two'])
+        response = self.client.get(response.data['next'])
+        self.assertEqual([entry['changes']['name'][1] for entry in response.data['results']], ['One'])
+        self.assertEqual(
+            self.client.get(reverse('history', args=['nope', 1])).status_code, status.HTTP_404_NOT_FOUND
+        )
+
+
+JOB_CALLS = []
+
+
+@jobs.task
+def remember(value):
+    JOB_CALLS.append(value)
+    return value
+
+
+@jobs.task
+def explode():
+    raise RuntimeError("boom")
+
+
+class JobsTest(APITestCase):
+    def setUp(self):
+        JOB_CALLS.clear()
+
+    def test_burst_worker_runs_due_jobs(self):
+        done = [jobs.enqueue(remember, value=n) for n in range(5)]
+        later = jobs.enqueue(remember, run_at=timezone.now() + timedelta(hours=1), value='later')
+        
+        processed = jobs.Worker(concurrency=2, poll_interval=0.01, burst=True).run()
+        
+        self.assertEqual(processed, 5)
+        self.assertEqual(sorted(JOB_CALLS), [0, 1, 2, 3, 4])
+        self.assertEqual(
+            set(Job.objects.filter(pk__in=[job.pk for job in done]).values_list('status', 'attempts')), {('done', 1)}
+        )
+        later.refresh_from_db()
+        self.assertEqual(later.status, 'queued')
+
+    def test_max_jobs(self):
+        for n in range(3):
+            jobs.enqueue(remember, value=n)
+        
+        self.assertEqual(jobs.Worker(concurrency=4, poll_interval=0.01, max_jobs=2).run(), 2)
+        self.assertEqual(Job.objects.filter(status='queued').count(), 1)
+
+    def test_claims_are_exclusive(self):
+        for n in range(3):
+            jobs.enqueue(remember, value=n)
+        
+        first = jobs.claim('a', 2)
+        second = jobs.claim('b', 5)
+        
+        self.assertEqual(len(first), 2)
+        self.assertEqual(len(second), 1)
+        self.assertEqual(jobs.claim('c', 5), [])
+        self.assertTrue(all(job.status == 'running' and job.locked_by.startswith('a:') for job in first))
+
+    def test_lapsed_claims_are_taken_over_then_reaped(self):
+        job = jobs.enqueue(remember, max_attempts=2, value=1)
+        jobs.claim('dead', 1)
+        Job.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+        
+        [retaken] = jobs.claim('alive', 1)
+        self.assertEqual((retaken.pk, retaken.attempts), (job.pk, 2))
+        Job.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(jobs.claim('other', 1), [])
+        self.assertEqual(jobs.reap(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+
+    @override_settings(JOBS_BACKOFF_BASE=60)
+    def test_failures_are_retried_with_backoff(self):
+        job = jobs.enqueue(explode, max_attempts=2)
+        with self.assertLogs('core.jobs', 'WARNING'):
+            jobs.Worker(poll_interval=0.01, burst=True).run()
+        
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('queued', 1))
+        self.assertIn('RuntimeError: boom', job.last_error)
+        self.assertTrue(30 <= (job.run_at - job.finished_at).total_seconds() <= 60)
+        
+        Job.objects.update(run_at=timezone.now())
+        with self.assertLogs('core.jobs', 'WARNING'):
+            jobs.Worker(poll_interval=0.01, burst=True).run()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('failed', 2))
+
+    def test_unknown_tasks_fail_without_retry(self):
+        job = jobs.enqueue('core.tests.missing')
+        with self.assertLogs('core.jobs', 'WARNING'):
+            jobs.Worker(poll_interval=0.01, burst=True).run()
+        
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('failed', 1))
+
+    def test_metrics(self):
+        jobs.enqueue(remember, value=1)
+        jobs.Worker(poll_interval=0.01, burst=True).run()
+        jobs.enqueue(remember, run_at=timezone.now() - timedelta(seconds=30), value=2)
+        jobs.enqueue(remember, run_at=timezone.now() + timedelta(hours=1), value=3)
+        
+        metrics = jobs.metrics()
+        
+        self.assertEqual((metrics['queued'], metrics['due'], metrics['done'], metrics['failed']), (2, 1, 1, 0))
+        self.assertGreaterEqual(metrics['lag_seconds'], 30)
+        self.assertGreaterEqual(metrics['runtime_seconds'], 0)
+        
+        out = StringIO()
+        call_command('run_worker', '--stats', stdout=out)
+        self.assertIn('"due": 1', out.getvalue())
+
+    def test_metrics_endpoint_is_for_staff(self):
+        url = reverse('job-metrics')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+        
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['queued'], 0)
+
+
+class WebhookReceiver(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        self.server.received.append((dict(self.headers), body))
+        self.send_response(self.server.status)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@override_settings(WEBHOOK_DEBOUNCE_SECONDS=30, WEBHOOK_MAX_DELAY_SECONDS=300)
+class WebhookTest(TransactionTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        jobs.autodiscover()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), WebhookReceiver)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.addClassCleanup(cls.server.server_close)
+        cls.addClassCleanup(cls.server.shutdown)
+
+    def setUp(self):
+        self.server.received = []
+        self.server.status = 204
+        host, port = self.server.server_address
+        self.webhook = Webhook.objects.create(name="Frontend", url=f'http://{host}:{port}/rebuild')
+        self.category = ToolCategory.objects.create(name="Design")
+
+    def tearDown(self):
+        # Write out the audit entries the commit callbacks queued while the tables exist.
+        audit.writer.stop()
+
+    def save_tool(self, name):
+        # Each save commits on its own, as separate admin saves do.
+        Tool.objects.create(name=name, description='Design', link='https://example.com', category=self.category)
+
+    def deliveries(self):
+        return Job.objects.filter(name=webhooks.DELIVERY_TASK)
+
+    def test_bulk_edit_ends_in_one_signed_delivery(self):
+        for n in range(5):
+            self.save_tool(f'Tool {n}')
+        self.assertEqual(self.deliveries().count(), 1)
+        
+        self.deliveries().update(run_at=timezone.now())
+        jobs.Worker(poll_interval=0.01, burst=True).run()
+        
+        [(headers, body)] = self.server.received
+        timestamp = headers['X-Webhook-Timestamp']
+        expected = hmac.new(self.webhook.secret.encode(), f'{timestamp}.'.encode() + body, hashlib.sha256).hexdigest()
+        self.assertEqual(headers['X-Webhook-Signature'], f'sha256={expected}')
+        data = json.loads(body)
+        self.assertEqual(data['collections']['tools']['changes'], 5)
+        self.assertEqual(data['version'], changelog.current_version())
+        self.webhook.refresh_from_db()
+        self.assertEqual(self.webhook.delivered_version, data['version'])
+        self.assertEqual(self.deliveries().get().status, 'done')
+
+    def test_changes_push_the_delivery_back_up_to_the_max_delay(self):
+        self.save_tool('First')
+        first_run = self.deliveries().get().run_at
+        
+        self.save_tool('Second')
+        pushed = self.deliveries().get().run_at
+        self.assertGreaterEqual(pushed, first_run)
+        
+        self.deliveries().update(created_at=timezone.now() - timedelta(seconds=280))
+        self.save_tool('Third')
+        self.assertEqual(self.deliveries().get().run_at, pushed)
+
+    def test_only_watched_collections_trigger(self):
+        self.webhook.collections = ['roles']
+        self.webhook.save()
+        self.deliveries().delete()
+        
+        self.save_tool('Figma')
+        self.assertFalse(self.deliveries().exists())
+        Role.objects.create(name="Engineer")
+        self.assertEqual(self.deliveries().count(), 1)
+
+    def test_failed_deliveries_are_retried(self):
+        self.server.status = 500
+        self.save_tool('Figma')
+        self.deliveries().update(run_at=timezone.now())
+        
+        with self.assertLogs('core.jobs', 'WARNING'):
+            jobs.Worker(poll_interval=0.01, burst=True).run()
+        
+        job = self.deliveries().get()
+        self.assertEqual((job.status, job.attempts), ('queued', 1))
+        self.assertIn('HTTP Error 500', job.last_error)
+        self.webhook.refresh_from_db()
+        self.assertIsNone(self.webhook.delivered_at)
+
+    def test_nothing_new_sends_nothing(self):
+        Webhook.objects.update(delivered_version=changelog.current_version())
+        
+        self.assertIsNone(webhooks.deliver(self.webhook.pk))
+        self.assertEqual(self.server.received, [])
+
+    def test_collections_are_validated(self):
+        self.webhook.collections = ['tools', 'nope']
+        
+        with self.assertRaisesMessage(ValidationError, 'Unknown collections: nope.'):
+            self.webhook.full_clean()
+
+
+class ExportStaticTest(TestCase):
+    def setUp(self):
+        self.root = self.enterContext(tempfile.TemporaryDirectory())
+        self.category = ToolCategory.objects.create(name="Design")
+        for n in range(10):
+            Tool.objects.create(
+                name=f'Tool {n}', description='A design tool', link='https://example.com',
+                image=f'tools/tool{n}.png', category=self.category,
+            )
+        Role.objects.create(name="Engineer")
+
+    def export(self, origin='https://testserver', *extra):
+        out = StringIO()
+        call_command('export_static', '--output', self.root, '--origin', origin, *extra, stdout=out)
+        return dict(line.split() for line in out.getvalue().splitlines()[:-1])
+
+    def read(self, path, suffix=''):
+        with open(os.path.join(self.root, path.strip('/'), 'index.json' + suffix), 'rb') as f:
+            return f.read()
+
+    def test_files_match_the_api(self):
+        self.assertEqual(set(self.export().values()), {'written'})
+        
+        for path in export.ENDPOINTS:
+            body = self.read(path)
+            self.assertEqual(json.loads(body), json.loads(self.client.get(path, secure=True).content), path)
+        tools = self.read('/api/tools/')
+        self.assertIn(b'https://testserver/media/tools/tool0.png', tools)
+        self.assertEqual(gzip.decompress(self.read('/api/tools/', '.gz')), tools)
+        self.assertEqual(os.stat(os.path.join(self.root, 'api/tools/index.json')).st_mode & 0o777, 0o644)
+        self.assertFalse([name for name in os.listdir(os.path.join(self.root, 'api/tools')) if name.endswith('.tmp')])
+
+    def test_credentials_are_not_exported(self):
+        environment = TestingAccountEnvironment.objects.create(name="Staging")
+        TestingAccount.objects.create(
+            label='Account', description='Account', username='user', password='hunter2', environment=environment
+        )
+        self.export()
+        
+        self.assertFalse(os.path.exists(os.path.join(self.root, 'api/testing-accounts')))
+        for path in export.ENDPOINTS:
+            self.assertNotIn(b'hunter2', self.read(path), path)
+
+    def test_only_changed_collections_are_rendered_again(self):
+        self.export()
+        tool = Tool.objects.first()
+        tool.name = 'Renamed'
+        tool.save()
+        
+        with mock.patch.object(export, 'render', wraps=export.render) as render:
+            outcome = self.export()
+        
+        self.assertEqual(outcome['/api/tools/'], 'written')
+        self.assertEqual(outcome['/api/team-members/'], 'skipped')
+        self.assertEqual(
+            sorted(call.args[0] for call in render.call_args_list), ['/api/bootstrap/', '/api/summary/', '/api/tools/']
+        )
+        self.assertIn(b'Renamed', self.read('/api/tools/'))
+
+    def test_same_content_is_not_rewritten(self):
+        self.export()
+        written = os.stat(os.path.join(self.root, 'api/tools/index.json')).st_mtime_ns
+        Tool.objects.first().save()
+        
+        outcome = self.export()
+        
+        self.assertEqual(outcome['/api/tools/'], 'unchanged')
+        self.assertEqual(os.stat(os.path.join(self.root, 'api/tools/index.json')).st_mtime_ns, written)
+
+    def test_new_origin_or_force_rewrites_everything(self):
+        self.export()
+        
+        self.assertEqual(set(self.export('http://testserver').values()), {'written'})
+        self.assertIn(b'http://testserver/media/', self.read('/api/tools/'))
+        self.assertEqual(set(self.export('http://testserver', '--force').values()), {'written'})
+
+    def test_rejects_bad_origin(self):
+        with self.assertRaisesMessage(CommandError, '--origin must look like https://host.'):
+            self.export('testserver')
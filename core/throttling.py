@@ -0,0 +1,169 @@
+"""
+Token-bucket throttles whose buckets live in a SQLite file shared by every
+worker process on the host, so a limit holds no matter which worker a
+request lands on.
+
+Each check is a single UPSERT ... RETURNING on the bucket's primary key: it
+refills the bucket for the time elapsed since the last request, takes a token
+if one is available and reports the outcome, atomically and without reading
+any other row. Rates use DRF's "<requests>/<period>" format; the bucket holds
+<requests> tokens and refills at <requests>/<period> per second.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+logger = logging.getLogger(__name__)
+
+# Buckets idle for longer than this are full again for any rate up to
+# n/day, so pruning them never lets a client through early.
+IDLE_TIMEOUT = 86400
+PRUNE_EVERY = 10000
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS buckets (
+    key TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated REAL NOT NULL,
+    allowed INTEGER NOT NULL
+) WITHOUT ROWID
+'''
+
+TAKE = '''
+INSERT INTO buckets (key, tokens, updated, allowed) VALUES (:key, :capacity - 1, :now, 1)
+ON CONFLICT (key) DO UPDATE SET
+    tokens = min(:capacity, tokens + max(:now - updated, 0) * :rate)
+        - (min(:capacity, tokens + max(:now - updated, 0) * :rate) >= 1),
+    allowed = min(:capacity, tokens + max(:now - updated, 0) * :rate) >= 1,
+    updated = max(:now, updated)
+RETURNING allowed, tokens
+'''
+
+
+class TokenBucketStore:
+    def __init__(self, path):
+        self.path = str(path)
+        self.local = threading.local()
+        self.takes = 0
+
+    def connection(self):
+        # One connection per thread, re-opened after a fork.
+        pid = os.getpid()
+        if getattr(self.local, 'pid', None) != pid:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=OFF')
+            connection.execute(SCHEMA)
+            self.local.connection, self.local.pid = connection, pid
+        return self.local.connection
+
+    def take(self, key, capacity, rate, now=None):
+        """Take one token from `key`'s bucket; return (allowed, tokens left)."""
+        now = time.time() if now is None else now
+        connection = self.connection()
+        allowed, tokens = connection.execute(
+            TAKE, {'key': key, 'capacity': capacity, 'rate': rate, 'now': now},
+        ).fetchone()
+        self.takes += 1
+        if self.takes % PRUNE_EVERY == 0:
+            connection.execute('DELETE FROM buckets WHERE updated < ?', (now - IDLE_TIMEOUT,))
+        return bool(allowed), tokens
+
+    def clear(self):
+        self.connection().execute('DELETE FROM buckets')
+
+    def close(self):
+        connection = getattr(self.local, 'connection', None)
+        if connection is not None:
+            connection.close()
+        self.local = threading.local()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = TokenBucketStore(settings.RATELIMIT_DATABASE)
+    return _store
+
+
+@receiver(setting_changed)
+def reset_store(setting, **kwargs):
+    global _store
+    if setting == 'RATELIMIT_DATABASE' and _store is not None:
+        _store.close()
+        _store = None
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    SimpleRateThrottle with its per-worker cache history swapped for a
+    shared token bucket. Subclasses define `scope` and `get_cache_key()`.
+    """
+
+    def get_rate(self):
+        # Read the rates on every check (not once at import like DRF) so they
+        # follow settings overrides.
+        self.THROTTLE_RATES = api_settings.DEFAULT_THROTTLE_RATES
+        return super().get_rate()
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        try:
+            allowed, self.tokens = get_store().take(self.key, self.num_requests, self.num_requests / self.duration)
+        except sqlite3.Error:
+            # A broken limiter must not take the API down with it.
+            logger.exception("Rate limit store unavailable; allowing request.")
+            return True
+        return allowed
+
+    def wait(self):
+        return max(1 - self.tokens, 0) * self.duration / self.num_requests
+
+
+class IPRateThrottle(TokenBucketThrottle):
+    """One bucket per client IP, shared by every API route."""
+    scope = 'ip'
+
+    def get_cache_key(self, request, view):
+        return f'{self.scope}:{self.get_ident(request)}'
+
+
+class RouteRateThrottle(TokenBucketThrottle):
+    """
+    One bucket per client IP and route, for views that set `throttle_scope`
+    to a key of DEFAULT_THROTTLE_RATES. Views without one are not limited.
+    """
+    scope_attr = 'throttle_scope'
+
+    def __init__(self):
+        # The rate depends on the view, so it is resolved in allow_request().
+        pass
+
+    def allow_request(self, request, view):
+        self.scope = getattr(view, self.scope_attr, None)
+        if not self.scope:
+            return True
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
+
+    def get_cache_key(self, request, view):
+        return f'{self.scope}:{self.get_ident(request)}'
@@ -0,0 +1,189 @@
+import mimetypes
+import os
+import posixpath
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified, JsonResponse
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+from django.views.static import was_modified_since
+from rest_framework import generics
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import CursorPagination
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from . import audit, bootstrap, changelog, counters, dispatch, jobs, media, warmup
+from .registry import COLLECTIONS
+from .serializers import AuditEntrySerializer
+from .storage import is_hashed_name
+
+
+class ChangesView(APIView):
+    default_limit = 500
+    max_limit = 5000
+
+    def get(self, request, *args, **kwargs):
+        cursor = self.get_int_param('since', 0)
+        limit = min(self.get_int_param('limit', self.default_limit), self.max_limit)
+        if limit < 1:
+            raise ValidationError({'limit': 'Expected a positive integer.'})
+        return Response(changelog.changes_since(cursor, limit, context={'request': request}))
+
+    def get_int_param(self, name, default):
+        raw = self.request.query_params.get(name)
+        if raw is None:
+            return default
+        try:
+            value = int(raw)
+        except ValueError:
+            raise ValidationError({name: 'Expected an integer.'})
+        if value < 0:
+            raise ValidationError({name: 'Expected a non-negative integer.'})
+        return value
+
+
+class BootstrapView(APIView):
+    throttle_scope = 'bootstrap'
+
+    def get(self, request, *args, **kwargs):
+        return HttpResponse(bootstrap.get_content(request), content_type='application/json')
+
+
+class SummaryView(APIView):
+    def get(self, request, *args, **kwargs):
+        return Response(counters.summary())
+
+
+class HistoryPagination(CursorPagination):
+    ordering = '-id'
+    page_size = 50
+
+
+class HistoryView(generics.ListAPIView):
+    """Audit trail of one object, newest first, for staff."""
+    permission_classes = [IsAdminUser]
+    serializer_class = AuditEntrySerializer
+    pagination_class = HistoryPagination
+
+    def get_queryset(self):
+        if self.kwargs['collection'] not in COLLECTIONS:
+            raise NotFound(f"Unknown collection '{self.kwargs['collection']}'.")
+        return audit.history(self.kwargs['collection'], self.kwargs['object_id'])
+
+
+class JobMetricsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        return Response(jobs.metrics())
+
+
+class BatchView(APIView):
+    throttle_scope = 'batch'
+
+    def post(self, request, *args, **kwargs):
+        urls = request.data.get('requests') if isinstance(request.data, dict) else None
+        if not isinstance(urls, list) or not urls:
+            raise ValidationError({'requests': 'Expected a non-empty list of relative URLs.'})
+        if len(urls) > settings.BATCH_MAX_REQUESTS:
+            raise ValidationError({'requests': f'At most {settings.BATCH_MAX_REQUESTS} requests per batch.'})
+        for url in urls:
+            try:
+                dispatch.validate_url(url)
+            except dispatch.DispatchError as exc:
+                raise ValidationError({'requests': str(exc)})
+
+        responses = []
+        for url in urls:
+            status_code, body = dispatch.dispatch(request, url)
+            responses.append({'url': url, 'status': status_code, 'body': body})
+        return Response({'responses': responses})
+
+
+@require_safe
+def serve_media(request, path):
+    """
+    Authorize a media request in Django and hand the transfer to the front
+    proxy when one is configured, or stream the file with FileResponse.
+    """
+    # `path` is already percent-decoded. Dot segments are refused outright, so
+    # the prefix check below sees the same path the file is read from.
+    if '\\' in path or '\x00' in path or any(segment in ('.', '..') for segment in path.split('/')):
+        raise Http404
+    path = posixpath.normpath(path)
+    if path.startswith('/'):
+        raise Http404
+    if not path.startswith(settings.MEDIA_PUBLIC_PREFIXES):
+        user = getattr(request, 'user', None)
+        if user is None or not user.is_staff:
+            raise Http404
+    try:
+        fullpath = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404
+    try:
+        stat = os.stat(fullpath)
+    except (FileNotFoundError, NotADirectoryError):
+        raise Http404
+    if not os.path.isfile(fullpath):
+        raise Http404
+
+    if is_hashed_name(path):
+        cache_control = 'public, max-age=31536000, immutable'
+    else:
+        cache_control = f'public, max-age={settings.MEDIA_CACHE_MAX_AGE}'
+    if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), stat.st_mtime):
+        response = HttpResponseNotModified()
+        response['Cache-Control'] = cache_control
+        return response
+
+    content_type = mimetypes.guess_type(fullpath)[0] or 'application/octet-stream'
+    if settings.MEDIA_ACCEL_REDIRECT_PREFIX:
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = settings.MEDIA_ACCEL_REDIRECT_PREFIX + quote(path)
+    elif settings.MEDIA_SENDFILE_HEADER:
+        response = HttpResponse(content_type=content_type)
+        response[settings.MEDIA_SENDFILE_HEADER] = fullpath
+    else:
+        try:
+            byte_range = media.parse_range(request.META.get('HTTP_RANGE'), stat.st_size)
+        except media.UnsatisfiableRange:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{stat.st_size}'
+            return response
+        if byte_range is None:
+            response = FileResponse(open(fullpath, 'rb'), content_type=content_type)
+        else:
+            start, end = byte_range
+            length = end - start + 1
+            response = FileResponse(
+                media.RangeFile(open(fullpath, 'rb'), start, length), content_type=content_type, status=206
+            )
+            response['Content-Length'] = length
+            response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+        response['Accept-Ranges'] = 'bytes'
+
+    response['Cache-Control'] = cache_control
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    return response
+
+
+def live(request):
+    """Liveness probe: the process is up. Never touches the database."""
+    return JsonResponse({'status': 'alive'}, headers={'Cache-Control': 'no-store'})
+
+
+def ready(request):
+    """
+    Readiness probe: 503 until this worker has been warmed. The first probe
+    starts warming if WARM_ON_STARTUP hasn't already.
+    """
+    if not warmup.is_warm():
+        warmup.start()
+        return JsonResponse({'status': 'warming'}, status=503, headers={'Cache-Control': 'no-store'})
+    return JsonResponse({'status': 'ready'}, headers={'Cache-Control': 'no-store'})
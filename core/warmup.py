@@ -0,0 +1,114 @@
+"""
+Pre-executes the list endpoints of a fresh worker so the first real requests
+don't pay for cold imports, serializer construction, URL resolver population,
+key derivation for encrypted fields or template compilation.
+
+`warm()` runs everything inline. `start()` runs it on a background thread,
+which is what WARM_ON_STARTUP and the /ready probe use: the worker answers
+/live straight away and only reports ready once warming has finished and
+every endpoint answered without an error. WARM_ON_STARTUP is honoured by the
+WSGI and ASGI entry points only, so management commands never warm.
+"""
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest
+from django.template import engines
+from django.template.loader import get_template
+from django.urls import get_resolver
+
+from . import crypto, dispatch
+
+logger = logging.getLogger(__name__)
+
+_warm = threading.Event()
+_lock = threading.Lock()
+_thread = None
+
+
+def is_warm():
+    return _warm.is_set()
+
+
+def reset():
+    _warm.clear()
+
+
+def warm_request():
+    host = dispatch.default_host()
+    request = HttpRequest()
+    request.method = 'GET'
+    request.META = {'SERVER_NAME': host, 'SERVER_PORT': '80', 'HTTP_HOST': host, 'REMOTE_ADDR': '127.0.0.1'}
+    return request
+
+
+def timed(results, label, func):
+    started = time.perf_counter()
+    outcome = func()
+    results.append((label, outcome, (time.perf_counter() - started) * 1000))
+
+
+def derive_key():
+    crypto.get_fernet()
+    return 'derived'
+
+
+def compile_template(name):
+    get_template(name)
+    return 'compiled'
+
+
+def failures(results):
+    """The warmed endpoints that answered with an error status."""
+    return [label for label, outcome, ms in results if label.startswith('GET ') and outcome >= 400]
+
+
+def warm():
+    """Warm this process and return [(step, outcome, ms)]; only a clean run marks it warm."""
+    results = []
+    resolver = get_resolver()
+    timed(results, 'url patterns', lambda: len(resolver.reverse_dict))
+    timed(results, 'field encryption key', derive_key)
+
+    request = warm_request()
+    for path in settings.WARM_PATHS:
+        timed(results, f'GET {path}', lambda: dispatch.dispatch(request, path)[0])
+
+    if engines.all():
+        for name in settings.WARM_TEMPLATES:
+            timed(results, f'template {name}', lambda: compile_template(name))
+
+    failed = failures(results)
+    if failed:
+        logger.warning("Warming failed (%s); staying unready.", ', '.join(failed))
+    else:
+        _warm.set()
+    return results
+
+
+def warm_in_background():
+    try:
+        warm()
+    except Exception:
+        logger.exception("Warming failed; /ready will retry.")
+    finally:
+        connections.close_all()
+
+
+def start():
+    """Warm on a background thread unless this process is warm or warming."""
+    global _thread
+    with _lock:
+        if _warm.is_set() or (_thread is not None and _thread.is_alive()):
+            return
+        _thread = threading.Thread(target=warm_in_background, name='warmup', daemon=True)
+        _thread.start()
+
+
+def start_on_boot():
+    """Called by the server entry points once the application is loaded."""
+    if settings.WARM_ON_STARTUP:
+        start()
@@ -0,0 +1,123 @@
+"""
+Outgoing webhooks, e.g. to rebuild the static frontend when content changes.
+
+Every committed change notifies the webhooks watching its collection. A
+webhook has at most one queued delivery job: each change pushes it back to
+WEBHOOK_DEBOUNCE_SECONDS from now, but never past WEBHOOK_MAX_DELAY_SECONDS
+after it was queued, so a bulk edit ends in one delivery and a steady stream
+of edits still delivers regularly.
+
+A delivery POSTs what changed since the last successful one, per
+collection, read from the change log:
+
+    {"webhook": "Frontend", "since": 120, "version": 164,
+     "collections": {"tools": {"changes": 3, "version": 164}}}
+
+It is signed with the webhook's secret:
+X-Webhook-Signature = "sha256=" + hex HMAC-SHA256 of "<X-Webhook-Timestamp>.<body>".
+X-Webhook-Delivery names the range of changes the body covers. Failures are
+retried by the job worker with backoff, and its concurrency bounds how many
+deliveries are in flight at once.
+"""
+import hashlib
+import hmac
+import json
+import logging
+import time
+import urllib.request
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from . import changelog, jobs
+from .models import ChangeLogEntry, Job, Webhook
+
+logger = logging.getLogger(__name__)
+
+DELIVERY_TASK = 'core.tasks.deliver_webhook'
+
+
+def pending_delivery(webhook_id):
+    return Job.objects.filter(name=DELIVERY_TASK, status=Job.QUEUED, kwargs__webhook_id=webhook_id)
+
+
+def schedule(webhook_id):
+    """Queue a delivery for the webhook, or push back the one already queued."""
+    now = timezone.now()
+    debounce = settings.WEBHOOK_DEBOUNCE_SECONDS
+    pending = pending_delivery(webhook_id)
+    # A delivery queued long enough ago keeps its time, so it isn't starved.
+    young = pending.filter(created_at__gt=now - timedelta(seconds=settings.WEBHOOK_MAX_DELAY_SECONDS - debounce))
+    if young.update(run_at=now + timedelta(seconds=debounce)) or pending.exists():
+        return
+    jobs.enqueue(
+        DELIVERY_TASK, run_at=now + timedelta(seconds=debounce),
+        max_attempts=settings.WEBHOOK_MAX_ATTEMPTS, webhook_id=webhook_id,
+    )
+
+
+def notify(collection):
+    """Schedule the webhooks watching `collection`; runs after a commit."""
+    try:
+        for webhook in Webhook.objects.filter(is_active=True).only('id', 'collections'):
+            if webhook.watches(collection):
+                schedule(webhook.pk)
+    except DatabaseError:
+        # The change itself is committed; the next one schedules the delivery.
+        logger.exception("Could not schedule webhooks for %s.", collection)
+
+
+def payload(webhook, version):
+    entries = ChangeLogEntry.objects.filter(id__gt=webhook.delivered_version, id__lte=version)
+    if webhook.collections:
+        entries = entries.filter(collection__in=webhook.collections)
+    rows = entries.order_by().values('collection').annotate(changes=Count('object_id', distinct=True), version=Max('id'))
+    return {
+        'webhook': webhook.name,
+        'since': webhook.delivered_version,
+        'version': version,
+        'collections': {
+            row['collection']: {'changes': row['changes'], 'version': row['version']}
+            for row in sorted(rows, key=lambda row: row['collection'])
+        },
+    }
+
+
+def sign(secret, timestamp, body):
+    digest = hmac.new(secret.encode(), f'{timestamp}.'.encode() + body, hashlib.sha256).hexdigest()
+    return f'sha256={digest}'
+
+
+def post(webhook, body, delivery_id):
+    timestamp = str(int(time.time()))
+    request = urllib.request.Request(webhook.url, data=body, method='POST', headers={
+        'Content-Type': 'application/json',
+        'User-Agent': 'renovators-webhooks',
+        'X-Webhook-Delivery': delivery_id,
+        'X-Webhook-Timestamp': timestamp,
+        'X-Webhook-Signature': sign(webhook.secret, timestamp, body),
+    })
+    # Non-2xx answers raise HTTPError, so the job is retried.
+    with urllib.request.urlopen(request, timeout=settings.WEBHOOK_TIMEOUT) as response:
+        return response.status
+
+
+def deliver(webhook_id):
+    """Send the webhook everything it hasn't been told about; return the HTTP status."""
+    webhook = Webhook.objects.filter(pk=webhook_id, is_active=True).first()
+    if webhook is None:
+        return None
+    version = changelog.current_version()
+    data = payload(webhook, version)
+    status = None
+    if data['collections']:
+        body = json.dumps(data, separators=(',', ':')).encode()
+        status = post(webhook, body, f'{webhook.pk}-{webhook.delivered_version}-{version}')
+        logger.info("Delivered changes %d..%d to %s.", webhook.delivered_version, version, webhook)
+    Webhook.objects.filter(pk=webhook.pk, delivered_version__lt=version).update(
+        delivered_version=version, delivered_at=timezone.now(),
+    )
+    return status
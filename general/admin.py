@@ -1,38 +1,44 @@
 from django.contrib import admin
+from core.admin import BoundedRelatedFieldListFilter, ScalableModelAdmin, move_action
 from .models import Tool, ToolCategory, ImportantLinks, LinkCategory, Role, TeamMember
 
 @admin.register(ToolCategory)
-class ToolCategoryAdmin(admin.ModelAdmin):
-    list_display = ('name',)
-    search_fields = ('name',)
+class ToolCategoryAdmin(ScalableModelAdmin):
+    list_display = ('name', 'tool_count')
+    search_fields = ('^name',)
 
 @admin.register(Tool)
-class ToolAdmin(admin.ModelAdmin):
+class ToolAdmin(ScalableModelAdmin):
     list_display = ('name', 'category', 'link')
-    list_filter = ('category',)
-    search_fields = ('name', 'description')
+    list_filter = (('category', BoundedRelatedFieldListFilter),)
+    search_fields = ('^name',)
     list_select_related = ('category',)
+    autocomplete_fields = ('category',)
+    actions = [move_action('category', 'Move selected to another category')]
 
 @admin.register(LinkCategory)
-class LinkCategoryAdmin(admin.ModelAdmin):
-    list_display = ('name',)
-    search_fields = ('name',)
+class LinkCategoryAdmin(ScalableModelAdmin):
+    list_display = ('name', 'link_count')
+    search_fields = ('^name',)
 
 @admin.register(ImportantLinks)
-class ImportantLinksAdmin(admin.ModelAdmin):
+class ImportantLinksAdmin(ScalableModelAdmin):
     list_display = ('label', 'category', 'link')
-    list_filter = ('category',)
-    search_fields = ('label',)
+    list_filter = (('category', BoundedRelatedFieldListFilter),)
+    search_fields = ('^label',)
     list_select_related = ('category',)
+    autocomplete_fields = ('category',)
+    actions = [move_action('category', 'Move selected to another category')]
 
 @admin.register(Role)
-class RoleAdmin(admin.ModelAdmin):
-    list_display = ('name',)
-    search_fields = ('name',)
+class RoleAdmin(ScalableModelAdmin):
+    list_display = ('name', 'member_count')
+    search_fields = ('^name',)
 
 @admin.register(TeamMember)
-class TeamMemberAdmin(admin.ModelAdmin):
+class TeamMemberAdmin(ScalableModelAdmin):
     list_display = ('name', 'email', 'contact_number', 'image', 'role')
-    list_filter = ('role',)
-    search_fields = ('name', 'email')
+    list_filter = (('role', BoundedRelatedFieldListFilter),)
+    search_fields = ('^name', '^email')
     list_select_related = ('role',)
+    autocomplete_fields = ('role',)
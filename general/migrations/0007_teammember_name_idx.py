@@ -0,0 +1,17 @@
+# Generated by Django 6.1.2 on 2026-10-19 05:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('general', '0006_teammember_image'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='teammember',
+            index=models.Index(fields=['name'], name='teammember_name_idx'),
+        ),
+    ]
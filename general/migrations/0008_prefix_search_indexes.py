@@ -0,0 +1,30 @@
+# Generated by Django 6.1.2 on 2026-10-19 05:49
+
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('general', '0007_teammember_name_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='importantlinks',
+            index=models.Index(django.db.models.functions.comparison.Collate('label', 'NOCASE'), name='importantlink_label_nocase_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teammember',
+            index=models.Index(django.db.models.functions.comparison.Collate('name', 'NOCASE'), name='teammember_name_nocase_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teammember',
+            index=models.Index(django.db.models.functions.comparison.Collate('email', 'NOCASE'), name='teammember_email_nocase_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tool',
+            index=models.Index(django.db.models.functions.comparison.Collate('name', 'NOCASE'), name='tool_name_nocase_idx'),
+        ),
+    ]
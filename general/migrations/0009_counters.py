@@ -0,0 +1,51 @@
+# Generated by Django 6.1.2 on 2026-10-19 06:13
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_subquery(child_model, fk_name):
+    # Frozen here rather than imported from core.counters, so later changes
+    # to the live helper never change what this migration does.
+    counts = (
+        child_model._default_manager.filter(**{fk_name: OuterRef('pk')})
+        .order_by().values(fk_name).annotate(count=Count('pk')).values('count')
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+def count_children(apps, schema_editor):
+    for parent, child, fk_name, counter in [
+        ('ToolCategory', 'Tool', 'category', 'tool_count'),
+        ('LinkCategory', 'ImportantLinks', 'category', 'link_count'),
+        ('Role', 'TeamMember', 'role', 'member_count'),
+    ]:
+        child_model = apps.get_model('general', child)
+        apps.get_model('general', parent).objects.update(**{counter: count_subquery(child_model, fk_name)})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('general', '0008_prefix_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='linkcategory',
+            name='link_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='role',
+            name='member_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='toolcategory',
+            name='tool_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_children, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,167 @@
+# Generated by Django 6.1.2 on 2026-10-19 06:29
+
+import logging
+import math
+
+from django.db import migrations, models
+from PIL import Image, ImageOps
+
+# A frozen copy of core.images as it was when this migration was written, so
+# later changes to the live module never change what this migration does.
+
+logger = logging.getLogger('core.images')
+
+EMPTY = {'width': None, 'height': None, 'color': '', 'blurhash': ''}
+SAMPLE_SIZE = 32
+PALETTE_SIZE = 8
+COMPONENTS = (4, 3)
+BASE83 = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~'
+TRANSPOSED = {5, 6, 7, 8}
+
+
+def encode83(value, length):
+    return ''.join(BASE83[value // 83 ** (length - index) % 83] for index in range(1, length + 1))
+
+
+def to_linear(value):
+    value /= 255
+    return value / 12.92 if value <= 0.04045 else ((value + 0.055) / 1.055) ** 2.4
+
+
+def to_srgb(value):
+    value = max(0.0, min(1.0, value))
+    if value <= 0.0031308:
+        return int(value * 12.92 * 255 + 0.5)
+    return int((1.055 * value ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def blurhash(image, x_components=COMPONENTS[0], y_components=COMPONENTS[1]):
+    width, height = image.size
+    linear = [tuple(to_linear(channel) for channel in pixel) for pixel in image.getdata()]
+    factors = []
+    for j in range(y_components):
+        row_basis = [math.cos(math.pi * j * y / height) for y in range(height)]
+        for i in range(x_components):
+            column_basis = [math.cos(math.pi * i * x / width) for x in range(width)]
+            red = green = blue = 0.0
+            for y in range(height):
+                for x in range(width):
+                    basis = row_basis[y] * column_basis[x]
+                    r, g, b = linear[y * width + x]
+                    red += basis * r
+                    green += basis * g
+                    blue += basis * b
+            scale = (1 if i == j == 0 else 2) / (width * height)
+            factors.append((red * scale, green * scale, blue * scale))
+
+    dc, ac = factors[0], factors[1:]
+    result = encode83((x_components - 1) + (y_components - 1) * 9, 1)
+    if ac:
+        quantised_max = int(max(0, min(82, math.floor(max(abs(c) for factor in ac for c in factor) * 166 - 0.5))))
+        maximum = (quantised_max + 1) / 166
+        result += encode83(quantised_max, 1)
+    else:
+        maximum = 1
+        result += encode83(0, 1)
+    result += encode83((to_srgb(dc[0]) << 16) + (to_srgb(dc[1]) << 8) + to_srgb(dc[2]), 4)
+
+    def quantise(value):
+        return int(max(0, min(18, math.floor(math.copysign(abs(value / maximum) ** 0.5, value) * 9 + 9.5))))
+
+    for r, g, b in ac:
+        result += encode83(quantise(r) * 19 * 19 + quantise(g) * 19 + quantise(b), 2)
+    return result
+
+
+def dominant_color(image):
+    quantised = image.quantize(colors=PALETTE_SIZE)
+    count, index = max(quantised.getcolors())
+    red, green, blue = quantised.getpalette()[index * 3:index * 3 + 3]
+    return f'#{red:02x}{green:02x}{blue:02x}'
+
+
+def image_metadata(file):
+    with Image.open(file) as image:
+        width, height = image.size
+        if image.getexif().get(0x0112) in TRANSPOSED:
+            width, height = height, width
+        image.draft('RGB', (SAMPLE_SIZE * 2, SAMPLE_SIZE * 2))
+        sample = ImageOps.exif_transpose(image)
+        sample.thumbnail((SAMPLE_SIZE, SAMPLE_SIZE))
+        if sample.mode in ('RGBA', 'LA', 'P', 'PA'):
+            sample = sample.convert('RGBA')
+            background = Image.new('RGB', sample.size, (255, 255, 255))
+            background.paste(sample, mask=sample.getchannel('A'))
+            sample = background
+        sample = sample.convert('RGB')
+        return {'width': width, 'height': height, 'color': dominant_color(sample), 'blurhash': blurhash(sample)}
+
+
+def read_metadata(fieldfile):
+    try:
+        with fieldfile.storage.open(fieldfile.name, 'rb') as content:
+            return image_metadata(content)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        logger.warning("Could not read image metadata from %s.", fieldfile.name, exc_info=True)
+        return EMPTY
+
+
+def read_stored_images(apps, schema_editor):
+    for model_name in ['Tool', 'TeamMember']:
+        model = apps.get_model('general', model_name)
+        rows = list(model.objects.exclude(image='').exclude(image__isnull=True))
+        for row in rows:
+            for key, value in read_metadata(row.image).items():
+                setattr(row, f'image_{key}', value)
+        model.objects.bulk_update(rows, ['image_width', 'image_height', 'image_color', 'image_blurhash'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('general', '0009_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='teammember',
+            name='image_blurhash',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='teammember',
+            name='image_color',
+            field=models.CharField(blank=True, editable=False, max_length=7),
+        ),
+        migrations.AddField(
+            model_name='teammember',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='teammember',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='tool',
+            name='image_blurhash',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='tool',
+            name='image_color',
+            field=models.CharField(blank=True, editable=False, max_length=7),
+        ),
+        migrations.AddField(
+            model_name='tool',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='tool',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(read_stored_images, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,10 @@
 from django.db import models
+from django.db.models.functions import Collate
 
 
 class ToolCategory(models.Model):
     name = models.CharField(max_length=100)
+    tool_count = models.PositiveIntegerField(default=0, editable=False)
     
     def __str__(self):
         return self.name
@@ -17,13 +19,23 @@ class Tool(models.Model):
     image = models.ImageField(upload_to='tools/', blank=True, null=True)
     link = models.URLField()
     category = models.ForeignKey(ToolCategory, on_delete=models.CASCADE, related_name='tools')
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_color = models.CharField(max_length=7, blank=True, editable=False)
+    image_blurhash = models.CharField(max_length=64, blank=True, editable=False)
     
     def __str__(self):
         return self.name
+    
+    class Meta:
+        indexes = [
+            models.Index(Collate('name', 'NOCASE'), name='tool_name_nocase_idx'),
+        ]
 
 
 class LinkCategory(models.Model):
     name = models.CharField(max_length=100)
+    link_count = models.PositiveIntegerField(default=0, editable=False)
     
     def __str__(self):
         return self.name
@@ -42,10 +54,14 @@ class ImportantLinks(models.Model):
     
     class Meta:
         verbose_name_plural = "Important Links"
+        indexes = [
+            models.Index(Collate('label', 'NOCASE'), name='importantlink_label_nocase_idx'),
+        ]
 
 
 class Role(models.Model):
     name = models.CharField(max_length=100, unique=True)
+    member_count = models.PositiveIntegerField(default=0, editable=False)
     
     def __str__(self):
         return self.name
@@ -57,6 +73,17 @@ class TeamMember(models.Model):
     contact_number = models.CharField(max_length=20)
     image = models.ImageField(upload_to='team_members/', blank=True, null=True)
     role = models.ForeignKey(Role, on_delete=models.CASCADE, related_name='team_members')
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_color = models.CharField(max_length=7, blank=True, editable=False)
+    image_blurhash = models.CharField(max_length=64, blank=True, editable=False)
     
     def __str__(self):
         return self.name
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['name'], name='teammember_name_idx'),
+            models.Index(Collate('name', 'NOCASE'), name='teammember_name_nocase_idx'),
+            models.Index(Collate('email', 'NOCASE'), name='teammember_email_nocase_idx'),
+        ]
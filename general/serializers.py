@@ -1,11 +1,14 @@
 from rest_framework import serializers
+from core.serializers import CachedURLImageField
 from .models import ToolCategory, Tool, LinkCategory, ImportantLinks, Role, TeamMember
 
 
 class ToolSerializer(serializers.ModelSerializer):
+    image = CachedURLImageField(required=False, allow_null=True)
+    
     class Meta:
         model = Tool
-        fields = ['id', 'name', 'description', 'image', 'link']
+        fields = ['id', 'name', 'description', 'image', 'image_width', 'image_height', 'image_color', 'image_blurhash', 'link']
 
 
 class ToolCategorySerializer(serializers.ModelSerializer):
@@ -38,7 +41,11 @@ class RoleSerializer(serializers.ModelSerializer):
 
 class TeamMemberSerializer(serializers.ModelSerializer):
     role = RoleSerializer(read_only=True)
+    image = CachedURLImageField(required=False, allow_null=True)
     
     class Meta:
         model = TeamMember
-        fields = ['id', 'name', 'email', 'contact_number', 'image', 'role']
\ No newline at end of file
+        fields = [
+            'id', 'name', 'email', 'contact_number',
+            'image', 'image_width', 'image_height', 'image_color', 'image_blurhash', 'role',
+        ]
\ No newline at end of file
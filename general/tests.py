@@ -1,4 +1,13 @@
-from django.test import TestCase
+import io
+import json
+import os
+import tempfile
+from unittest import mock
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from PIL import Image
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
@@ -530,3 +539,239 @@ class TeamMemberAPITest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 0)
         self.assertEqual(response.data, [])
+
+
+class TeamMemberAPIFilterTest(APITestCase):
+    def setUp(self):
+        self.role1 = Role.objects.create(name="Frontend Developer")
+        self.role2 = Role.objects.create(name="Backend Developer")
+        
+        TeamMember.objects.create(name="Sarah Connor", email="sarah@example.com", contact_number="555-111-2222", role=self.role1)
+        TeamMember.objects.create(name="John Connor", email="john@example.com", contact_number="555-333-4444", role=self.role2)
+        TeamMember.objects.create(name="Kyle Reese", email="kyle@example.com", contact_number="555-555-6666", role=self.role1)
+
+    def test_filter_by_role(self):
+        response = self.client.get(reverse('team-members'), {'role': self.role1.id})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 2)
+        self.assertTrue(all(member['role']['id'] == self.role1.id for member in response.data))
+
+    def test_filter_by_multiple_roles(self):
+        response = self.client.get(reverse('team-members'), {'role': f'{self.role1.id},{self.role2.id}'})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 3)
+
+    def test_ordering(self):
+        response = self.client.get(reverse('team-members'), {'ordering': '-name'})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([member['name'] for member in response.data], ['Sarah Connor', 'Kyle Reese', 'John Connor'])
+
+    def test_invalid_filter_value(self):
+        response = self.client.get(reverse('team-members'), {'role': 'designer'})
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('role', response.data)
+
+    def test_ordering_outside_allow_list(self):
+        response = self.client.get(reverse('team-members'), {'ordering': 'email'})
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('ordering', response.data)
+
+
+class CategoryAPIFilterTest(APITestCase):
+    def setUp(self):
+        self.tool_category1 = ToolCategory.objects.create(name="Design")
+        self.tool_category2 = ToolCategory.objects.create(name="Testing")
+        Tool.objects.create(name='Figma', description='Design tool', link='https://figma.com', category=self.tool_category1)
+        
+        self.link_category1 = LinkCategory.objects.create(name="Documentation")
+        self.link_category2 = LinkCategory.objects.create(name="Tools")
+        ImportantLinks.objects.create(label='Django Docs', link='https://docs.djangoproject.com', category=self.link_category1)
+
+    def test_tool_categories_filter_by_category(self):
+        response = self.client.get(reverse('tool-categories'), {'category': self.tool_category1.id})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]['name'], 'Design')
+        self.assertEqual(len(response.data[0]['tools']), 1)
+
+    def test_important_links_filter_by_category(self):
+        response = self.client.get(reverse('important-links'), {'category': self.link_category2.id})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'Tools': []})
+
+
+class CounterTest(TestCase):
+    def setUp(self):
+        self.design = ToolCategory.objects.create(name="Design")
+        self.development = ToolCategory.objects.create(name="Development")
+
+    def counts(self):
+        return dict(ToolCategory.objects.values_list('name', 'tool_count'))
+
+    def test_create_move_and_delete_keep_counts(self):
+        tool = Tool.objects.create(name='Figma', description='Design', link='https://figma.com', category=self.design)
+        Tool.objects.create(name='Sketch', description='Design', link='https://sketch.com', category=self.design)
+        self.assertEqual(self.counts(), {'Design': 2, 'Development': 0})
+        
+        tool.category = self.development
+        tool.save()
+        self.assertEqual(self.counts(), {'Design': 1, 'Development': 1})
+        
+        tool.delete()
+        self.assertEqual(self.counts(), {'Design': 1, 'Development': 0})
+
+    def test_saves_that_do_not_touch_the_foreign_key_skip_the_counters(self):
+        tool = Tool.objects.create(name='Figma', description='Design', link='https://figma.com', category=self.design)
+        tool.name = 'Figma 2'
+        
+        with self.assertNumQueries(3):  # the audit snapshot, the UPDATE and its change log entry
+            tool.save(update_fields=['name'])
+        
+        self.assertEqual(self.counts()['Design'], 1)
+
+    def test_fixture_loads_are_counted(self):
+        path = os.path.join(self.enterContext(tempfile.TemporaryDirectory()), 'tools.json')
+        with open(path, 'w') as f:
+            json.dump([
+                # Children before their parent, and a stale counter on the parent.
+                {'model': 'general.tool', 'pk': 100, 'fields': {
+                    'name': 'Figma', 'description': 'Design', 'link': 'https://figma.com', 'category': 100,
+                }},
+                {'model': 'general.tool', 'pk': 101, 'fields': {
+                    'name': 'Sketch', 'description': 'Design', 'link': 'https://sketch.com', 'category': 100,
+                }},
+                {'model': 'general.toolcategory', 'pk': 100, 'fields': {'name': 'Loaded', 'tool_count': 0}},
+            ], f)
+        call_command('loaddata', path, verbosity=0)
+        self.assertEqual(self.counts()['Loaded'], 2)
+        
+        Tool.objects.get(pk=100).delete()
+        Tool.objects.get(pk=101).delete()
+        self.assertEqual(self.counts()['Loaded'], 0)
+
+    def test_other_parents(self):
+        links = LinkCategory.objects.create(name="Docs")
+        role = Role.objects.create(name="Engineer")
+        ImportantLinks.objects.create(label='Wiki', link='https://wiki.example.com', category=links)
+        TeamMember.objects.create(name='Ada', email='ada@example.com', contact_number='1', role=role)
+        
+        links.refresh_from_db()
+        role.refresh_from_db()
+        self.assertEqual((links.link_count, role.member_count), (1, 1))
+
+
+class SQLJSONEngineTest(APITestCase):
+    def setUp(self):
+        design = ToolCategory.objects.create(name="Design \u2028 \"Tools\"")
+        ToolCategory.objects.create(name="Empty")
+        office = ToolCategory.objects.create(name="Bürö")
+        Tool.objects.create(
+            name='Figma', description='Line one\nline two\t\x01 ☃', link='https://figma.com',
+            image='tools/figma.3f2a9c1b7d4e.png', category=design,
+        )
+        Tool.objects.create(name='Sketch', description='', link='https://sketch.com', image='', category=design)
+        Tool.objects.create(name='Sheets', description='Spreadsheets', link='https://sheets.example.com', category=office)
+        docs = LinkCategory.objects.create(name="Docs")
+        LinkCategory.objects.create(name="Nothing yet")
+        ImportantLinks.objects.create(label='Wiki \\ "home"', link='https://wiki.example.com', category=docs)
+        ImportantLinks.objects.create(label='Runbooks', link='https://runbooks.example.com', category=docs)
+
+    def get(self, url_name, engine, params=None):
+        with override_settings(JSON_ENGINE=engine):
+            return self.client.get(reverse(url_name), params or {})
+
+    def assertSameBody(self, url_name, params=None, queries=1):
+        expected = self.get(url_name, 'python', params)
+        with self.assertNumQueries(queries):
+            actual = self.get(url_name, 'sqlite', params)
+        
+        self.assertEqual(actual.status_code, status.HTTP_200_OK)
+        self.assertEqual(actual['Content-Type'], expected['Content-Type'])
+        self.assertEqual(actual.content, expected.content)
+        return actual
+
+    def test_tools_match_the_serializer(self):
+        response = self.assertSameBody('tool-categories')
+        self.assertEqual(response.json()[0]['tools'][0]['image'], 'http://testserver/media/tools/figma.3f2a9c1b7d4e.png')
+        self.assertIn(b'\\u2028', response.content)
+
+    def test_tools_filtered_and_ordered(self):
+        self.assertSameBody('tool-categories', {'ordering': '-name'})
+        self.assertSameBody('tool-categories', {'category': f'{Tool.objects.first().category_id}'})
+
+    def test_links_match_the_view(self):
+        self.assertSameBody('important-links')
+        self.assertSameBody('important-links', {'ordering': 'name'})
+        self.assertSameBody('important-links', {'category': '999'})
+
+    def test_falls_back_for_names_sql_cannot_reproduce(self):
+        Tool.objects.filter(name='Sheets').update(image='tools/tabellen blätter.png')
+        LinkCategory.objects.create(name="Docs")
+        
+        # The fallback serializes: one query for the JSON, then the list and its prefetch.
+        self.assertSameBody('tool-categories', queries=3)
+        self.assertSameBody('important-links', queries=3)
+
+
+class ImageMetadataTest(APITestCase):
+    def setUp(self):
+        self.enterContext(override_settings(MEDIA_ROOT=self.enterContext(tempfile.TemporaryDirectory())))
+        self.category = ToolCategory.objects.create(name="Design")
+
+    def upload(self, name='figma.png', size=(120, 80), color=(200, 30, 30), mode='RGB', format='PNG'):
+        content = io.BytesIO()
+        Image.new(mode, size, color).save(content, format)
+        return SimpleUploadedFile(name, content.getvalue(), content_type='image/png')
+
+    def create(self, image):
+        return Tool.objects.create(name='Figma', description='Design', link='https://figma.com', image=image, category=self.category)
+
+    def test_upload_stores_size_colour_and_blurhash(self):
+        tool = self.create(self.upload())
+        tool.refresh_from_db()
+        
+        self.assertEqual((tool.image_width, tool.image_height, tool.image_color), (120, 80, '#c81e1e'))
+        self.assertRegex(tool.image_blurhash, r'^[0-9A-Za-z#$%*+,\-.:;=?@\[\]^_{|}~]{28}$')
+
+    def test_transparent_pixels_are_painted_on_white(self):
+        tool = self.create(self.upload(mode='RGBA', color=(0, 0, 255, 0)))
+        
+        self.assertEqual(tool.image_color, '#ffffff')
+
+    def test_api_returns_the_metadata_without_opening_files(self):
+        tool = self.create(self.upload())
+        
+        with mock.patch.object(FileSystemStorage, 'open') as opened:
+            data = self.client.get(reverse('tool-categories')).json()[0]['tools'][0]
+            tool.save()
+        
+        opened.assert_not_called()
+        self.assertEqual(
+            {key: data[key] for key in ('image_width', 'image_height', 'image_color')},
+            {'image_width': 120, 'image_height': 80, 'image_color': '#c81e1e'},
+        )
+        self.assertEqual(data['image_blurhash'], tool.image_blurhash)
+
+    def test_replacing_and_clearing_the_image(self):
+        tool = self.create(self.upload())
+        tool.image = self.upload('wide.png', size=(300, 100), color=(10, 200, 10))
+        tool.save()
+        self.assertEqual((tool.image_width, tool.image_height, tool.image_color), (300, 100, '#0ac80a'))
+        
+        tool.image = None
+        tool.save()
+        self.assertEqual((tool.image_width, tool.image_height, tool.image_color, tool.image_blurhash), (None, None, '', ''))
+
+    def test_unreadable_images_leave_the_metadata_empty(self):
+        with self.assertLogs('core.images', 'WARNING'):
+            tool = self.create(SimpleUploadedFile('broken.png', b'not really a png', content_type='image/png'))
+        
+        self.assertTrue(tool.image)
+        self.assertEqual((tool.image_width, tool.image_color, tool.image_blurhash), (None, '', ''))
@@ -1,20 +1,65 @@
+from django.db.models import Exists, OuterRef, Subquery, TextField, Value
+from django.db.models.functions import Coalesce, JSONObject
 from rest_framework import generics
 from rest_framework.response import Response
-from .models import ToolCategory, LinkCategory, TeamMember
+from core import sqljson
+from core.filters import AllowListFilter, AllowListOrderingFilter
+from .models import ToolCategory, Tool, LinkCategory, ImportantLinks, TeamMember
 from .serializers import ToolCategorySerializer, LinkCategorySerializer, TeamMemberSerializer
 
 
 class ToolCategoryListView(generics.ListAPIView):
     queryset = ToolCategory.objects.prefetch_related('tools').all()
     serializer_class = ToolCategorySerializer
+    filter_backends = [AllowListFilter, AllowListOrderingFilter]
+    filter_params = {'category': 'id'}
+    ordering_fields = ['id', 'name']
+    
+    def list(self, request, *args, **kwargs):
+        if sqljson.enabled(ToolCategory):
+            content = self.get_json_content(self.filter_queryset(self.get_queryset()))
+            if content is not None:
+                return sqljson.response(content)
+        return super().list(request, *args, **kwargs)
+    
+    def get_json_content(self, queryset):
+        """The ToolCategorySerializer list built by SQLite, or None to serialize instead."""
+        image = sqljson.media_url(self.request, Tool, 'image')
+        if image is None:
+            return None
+        tools = (
+            Tool.objects.filter(category=OuterRef('pk')).order_by().values('category')
+            .annotate(items=sqljson.JSONGroupArray(JSONObject(
+                id='id', name='name', description='description', image=image,
+                image_width='image_width', image_height='image_height',
+                image_color='image_color', image_blurhash='image_blurhash', link='link',
+            )))
+            .values('items')
+        )
+        categories = queryset.annotate(
+            item=JSONObject(
+                id='id', name='name',
+                tools=sqljson.JSON(Coalesce(Subquery(tools), Value('[]'), output_field=TextField())),
+            ),
+            unsafe=Exists(Tool.objects.filter(sqljson.unsafe_name('image'), category=OuterRef('pk'))),
+        ).values('item', 'unsafe')
+        content, unsafe = sqljson.fetch(categories, 'json_group_array(json("item"))', 'max("unsafe")')
+        return None if unsafe else content
 
 
 class ImportantLinksListView(generics.ListAPIView):
     queryset = LinkCategory.objects.prefetch_related('important_links').all()
     serializer_class = LinkCategorySerializer
+    filter_backends = [AllowListFilter, AllowListOrderingFilter]
+    filter_params = {'category': 'id'}
+    ordering_fields = ['id', 'name']
     
     def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
+        queryset = self.filter_queryset(self.get_queryset())
+        if sqljson.enabled(LinkCategory):
+            content = self.get_json_content(queryset)
+            if content is not None:
+                return sqljson.response(content)
         serializer = self.get_serializer(queryset, many=True)
         
         result = {}
@@ -22,8 +67,26 @@ class ImportantLinksListView(generics.ListAPIView):
             result[category_data['name']] = category_data['important_links']
         
         return Response(result)
+    
+    def get_json_content(self, queryset):
+        """The links keyed by category name, built by SQLite, or None if names repeat."""
+        links = (
+            ImportantLinks.objects.filter(category=OuterRef('pk')).order_by().values('category')
+            .annotate(items=sqljson.JSONGroupArray(JSONObject(id='id', label='label', link='link')))
+            .values('items')
+        )
+        categories = queryset.annotate(items=Coalesce(Subquery(links), Value('[]'), output_field=TextField())).values('name', 'items')
+        # A repeated name keeps its first position but its last value in the
+        # dict built above; json_group_object() would write both.
+        content, repeated = sqljson.fetch(
+            categories, 'json_group_object("name", json("items"))', 'count(*) - count(DISTINCT "name")',
+        )
+        return None if repeated else content
 
 
 class TeamMemberListView(generics.ListAPIView):
     queryset = TeamMember.objects.select_related('role').all()
     serializer_class = TeamMemberSerializer
+    filter_backends = [AllowListFilter, AllowListOrderingFilter]
+    filter_params = {'role': 'role_id'}
+    ordering_fields = ['id', 'name']
@@ -13,4 +13,14 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'renovators.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported after Django is set up; serves /api/stream/ next to the Django app.
+from core.stream import StreamRouter  # noqa: E402
+
+application = StreamRouter(django_application)
+
+# Only server processes warm at boot; management commands never import this.
+from core import warmup  # noqa: E402
+
+warmup.start_on_boot()
@@ -12,6 +12,9 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 
+from decouple import config
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -22,6 +25,17 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = 'django-insecure-=l4eb9!s402lyn@2+-1!tpkip54sklpn!fzio^z76=zcaf6(_f'
 
+# Key material for encrypted model fields (TestingAccount.password). The
+# Fernet key is derived from it once per process. Required, and separate from
+# SECRET_KEY, so rotating SECRET_KEY never makes stored passwords unreadable.
+FIELD_ENCRYPTION_KEY = config('FIELD_ENCRYPTION_KEY', default='')
+if not FIELD_ENCRYPTION_KEY:
+    raise ImproperlyConfigured(
+        "FIELD_ENCRYPTION_KEY is not set. Set it in the environment or in a .env file "
+        "(see .env.example) to a long random string that is not SECRET_KEY."
+    )
+FIELD_ENCRYPTION_KDF_ITERATIONS = 600000
+
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
 
@@ -41,26 +55,61 @@ INSTALLED_APPS = [
     'corsheaders',
     'general',
     'technical_information',
+    'core',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'core.staticfiles.StaticFilesMiddleware',
+    'core.middleware.LightSessionMiddleware',
     'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
+    'core.middleware.LightCsrfViewMiddleware',
+    'core.middleware.LightAuthenticationMiddleware',
+    'core.audit.AuditMiddleware',
+    'core.middleware.LightMessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# GET/HEAD/OPTIONS requests under these prefixes that carry no session cookie
+# skip the session, CSRF, auth and message middleware (core.middleware).
+LIGHT_MIDDLEWARE_PREFIXES = ('/api/',)
+
+# API rate limits: token buckets per client IP ('ip', every route) and per IP
+# and route for views with a `throttle_scope`, kept in a SQLite file shared by
+# all workers on the host (core.throttling). Exceeding one returns 429 with
+# Retry-After. Clients are told apart by REMOTE_ADDR; behind N trusted
+# reverse proxies set RATELIMIT_NUM_PROXIES=N to use X-Forwarded-For instead,
+# which clients can otherwise forge.
+RATELIMIT_ENABLED = config('RATELIMIT_ENABLED', default=True, cast=bool)
+RATELIMIT_DATABASE = config('RATELIMIT_DATABASE', default=str(BASE_DIR / 'ratelimit.sqlite3'))
+
 REST_FRAMEWORK = {
     'DEFAULT_RENDERER_CLASSES': [
         'rest_framework.renderers.JSONRenderer',
         # Remove this line to disable browsable API entirely:
         # 'rest_framework.renderers.BrowsableAPIRenderer',
     ],
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        # Nested calls made by /api/batch/ act as the batch's user.
+        'core.dispatch.DispatchedUserAuthentication',
+        'rest_framework.authentication.SessionAuthentication',
+        'rest_framework.authentication.BasicAuthentication',
+    ],
+    'DEFAULT_THROTTLE_CLASSES': [
+        'core.throttling.IPRateThrottle',
+        'core.throttling.RouteRateThrottle',
+    ] if RATELIMIT_ENABLED else [],
+    'NUM_PROXIES': config('RATELIMIT_NUM_PROXIES', default=0, cast=int),
+    'DEFAULT_THROTTLE_RATES': {
+        'ip': '1200/min',
+        'bootstrap': '120/min',
+        'batch': '120/min',
+    },
 }
 
+# Runs the tests with their rate limit buckets in a throwaway file.
+TEST_RUNNER = 'core.testing.TestRunner'
+
 ROOT_URLCONF = 'renovators.urls'
 
 TEMPLATES = [
@@ -78,8 +127,41 @@ TEMPLATES = [
     },
 ]
 
+# SERVER_ROLE=api runs a worker that only serves /api/: no admin, sessions,
+# messages, CORS app or templates, which cuts boot time and time-to-first-
+# request (measure with `manage.py profile_startup --role api`). The default
+# 'full' role serves everything.
+SERVER_ROLE = config('SERVER_ROLE', default='full')
+
+if SERVER_ROLE == 'api':
+    INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in (
+        'django.contrib.admin',
+        'django.contrib.sessions',
+        'django.contrib.messages',
+        'corsheaders',
+    )]
+    MIDDLEWARE = [middleware for middleware in MIDDLEWARE if middleware not in (
+        'core.middleware.LightSessionMiddleware',
+        'core.middleware.LightCsrfViewMiddleware',
+        'core.middleware.LightAuthenticationMiddleware',
+        'core.middleware.LightMessageMiddleware',
+    )]
+    TEMPLATES = []
+
+# Target for the median time from process start to the first /api/tools/
+# response; `manage.py profile_startup` fails above it. Measured with SQLite
+# and WSGI: ~730 ms for the full role, ~630 ms for the api role.
+STARTUP_BUDGET_MS = 1000
+
 WSGI_APPLICATION = 'renovators.wsgi.application'
 
+ASGI_APPLICATION = 'renovators.asgi.application'
+
+# Change stream (/api/stream/, ASGI only): how often each worker polls the
+# change log, and how long an idle connection waits before a heartbeat.
+STREAM_POLL_INTERVAL = 1.0
+STREAM_HEARTBEAT_INTERVAL = 15.0
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
@@ -92,6 +174,104 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# /api/bootstrap/ caches the whole payload; the cache key carries the change
+# log version of every collection. On a miss, the sections are rendered on a
+# thread pool when BOOTSTRAP_CONCURRENT is True, one after the other when it
+# is False, and with None only when the database is not SQLite.
+BOOTSTRAP_CONCURRENT = None
+BOOTSTRAP_CACHE_TIMEOUT = 300
+
+# JSON_ENGINE=sqlite has /api/tools/ and /api/important-links/ build their
+# response body in a single SQLite query (core.sqljson) instead of
+# serializing rows in Python; the output is identical.
+JSON_ENGINE = config('JSON_ENGINE', default='python')
+
+# Warming (core.warmup): `manage.py warm` runs it inline; with WARM_ON_STARTUP
+# every server worker (WSGI/ASGI, not management commands) warms itself on a
+# background thread at boot, and /ready answers 503 until every endpoint has
+# answered without an error. /live never touches the database.
+WARM_ON_STARTUP = config('WARM_ON_STARTUP', default=False, cast=bool)
+WARM_PATHS = (
+    '/api/tools/',
+    '/api/important-links/',
+    '/api/team-members/',
+    '/api/testing-accounts/',
+    '/api/synthetic-events/',
+    '/api/changes/',
+    '/api/bootstrap/',
+    '/api/summary/',
+)
+WARM_TEMPLATES = (
+    'admin/index.html',
+    'admin/change_list.html',
+    'admin/change_form.html',
+    'admin/core/move_selected.html',
+)
+
+# /api/batch/ dispatches up to BATCH_MAX_REQUESTS GET calls per request.
+BATCH_MAX_REQUESTS = 20
+BATCH_ALLOWED_PREFIXES = ('/api/',)
+BATCH_EXCLUDED_PATHS = ('/api/batch/', '/api/stream/')
+
+# Synthetic events older than this many days, and inactive ones, move to the
+# archive table (`manage.py archive_events`), ARCHIVE_BATCH_SIZE rows per
+# transaction.
+SYNTHETIC_EVENT_RETENTION_DAYS = config('SYNTHETIC_EVENT_RETENTION_DAYS', default=90, cast=int)
+ARCHIVE_BATCH_SIZE = 500
+
+# Audit trail (core.audit): entries are queued in memory after commit and
+# inserted AUDIT_BATCH_SIZE at a time by a background writer thread, at least
+# every AUDIT_FLUSH_INTERVAL seconds and always at exit. Without the thread,
+# a full batch is written inline by the request that fills it. Batches that
+# fail are retried, with at most AUDIT_MAX_QUEUE entries kept waiting.
+AUDIT_WRITER_THREAD = config('AUDIT_WRITER_THREAD', default=True, cast=bool)
+AUDIT_FLUSH_INTERVAL = 1.0
+AUDIT_BATCH_SIZE = 500
+AUDIT_MAX_QUEUE = 50000
+
+# Background jobs (core.jobs), run by `manage.py run_worker`. A claimed job
+# is taken over by another worker if its claim isn't renewed within
+# JOBS_LEASE_SECONDS; failures are retried after JOBS_BACKOFF_BASE * 2^n
+# seconds (with jitter, at most JOBS_BACKOFF_MAX). Finished jobs are kept for
+# JOBS_KEEP_DONE_DAYS.
+JOBS_POOL = config('JOBS_POOL', default='thread')
+JOBS_CONCURRENCY = config('JOBS_CONCURRENCY', default=4, cast=int)
+JOBS_POLL_INTERVAL = 1.0
+JOBS_LEASE_SECONDS = 300
+JOBS_MAX_ATTEMPTS = 5
+JOBS_BACKOFF_BASE = 10
+JOBS_BACKOFF_MAX = 3600
+JOBS_KEEP_DONE_DAYS = 7
+
+# Outgoing webhooks (core.webhooks): changes are coalesced per webhook and
+# delivered by the job worker WEBHOOK_DEBOUNCE_SECONDS after the last one,
+# or at most WEBHOOK_MAX_DELAY_SECONDS after the first.
+WEBHOOK_DEBOUNCE_SECONDS = config('WEBHOOK_DEBOUNCE_SECONDS', default=30, cast=int)
+WEBHOOK_MAX_DELAY_SECONDS = config('WEBHOOK_MAX_DELAY_SECONDS', default=300, cast=int)
+WEBHOOK_TIMEOUT = 10
+WEBHOOK_MAX_ATTEMPTS = 8
+
+# `manage.py export_static` writes the public read endpoints here as JSON
+# (plus .gz/.br) for nginx or a CDN, with absolute URLs for EXPORT_ORIGIN.
+EXPORT_STATIC_ROOT = config('EXPORT_STATIC_ROOT', default=str(BASE_DIR / 'export'))
+EXPORT_ORIGIN = config('EXPORT_ORIGIN', default='')
+
+
+# Admin changelists count exactly up to this many rows, then estimate, and
+# list at most this many related objects per filter sidebar.
+ADMIN_EXACT_COUNT_LIMIT = 10000
+ADMIN_FILTER_CHOICES_LIMIT = 50
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -127,11 +307,67 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
 
 STATIC_URL = 'static/'
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# Serve collected static files from STATIC_ROOT in-process
+# (core.staticfiles.StaticFilesMiddleware). Hashed names are cached forever;
+# anything else for STATIC_MAX_AGE seconds.
+STATIC_SERVE = config('STATIC_SERVE', default=True, cast=bool)
+STATIC_MAX_AGE = 60
 
 # Media files (user uploads)
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Where uploads live: 'filesystem' (MEDIA_ROOT) or 's3' for any S3-compatible
+# object store; point AWS_S3_ENDPOINT_URL at MinIO or moto to run locally.
+MEDIA_STORAGE = config('MEDIA_STORAGE', default='filesystem')
+
+if MEDIA_STORAGE == 's3':
+    DEFAULT_STORAGE = {
+        'BACKEND': 'core.s3.HashedS3Storage',
+        'OPTIONS': {
+            'bucket_name': config('AWS_STORAGE_BUCKET_NAME'),
+            'endpoint_url': config('AWS_S3_ENDPOINT_URL', default=None),
+            'access_key': config('AWS_S3_ACCESS_KEY_ID', default=None),
+            'secret_key': config('AWS_S3_SECRET_ACCESS_KEY', default=None),
+            'region_name': config('AWS_S3_REGION_NAME', default=None),
+            'custom_domain': config('AWS_S3_CUSTOM_DOMAIN', default=None),
+            'querystring_auth': config('AWS_QUERYSTRING_AUTH', default=True, cast=bool),
+            'querystring_expire': config('AWS_QUERYSTRING_EXPIRE', default=3600, cast=int),
+            'file_overwrite': False,
+        },
+    }
+else:
+    DEFAULT_STORAGE = {
+        'BACKEND': 'core.storage.HashedFileSystemStorage',
+    }
+
+STORAGES = {
+    'default': DEFAULT_STORAGE,
+    'staticfiles': {
+        # Hashed, precompressed copies only make sense for collected builds.
+        'BACKEND': (
+            'django.contrib.staticfiles.storage.StaticFilesStorage' if DEBUG
+            else 'core.staticfiles.CompressedManifestStaticFilesStorage'
+        ),
+    },
+}
+
+# How long serializers re-use a generated media URL (capped at half the
+# lifetime of signed S3 URLs).
+MEDIA_URL_CACHE_TIMEOUT = 3600
+
+# Filesystem media is served by core.views.serve_media. Paths under
+# MEDIA_PUBLIC_PREFIXES are public, anything else is staff-only. Set
+# MEDIA_ACCEL_REDIRECT_PREFIX (nginx internal location) or
+# MEDIA_SENDFILE_HEADER ('X-Sendfile' for Apache/lighttpd) to hand the bytes
+# to the front proxy; otherwise Django streams them with FileResponse.
+MEDIA_PUBLIC_PREFIXES = ('tools/', 'team_members/')
+MEDIA_ACCEL_REDIRECT_PREFIX = config('MEDIA_ACCEL_REDIRECT_PREFIX', default='')
+MEDIA_SENDFILE_HEADER = config('MEDIA_SENDFILE_HEADER', default='')
+MEDIA_CACHE_MAX_AGE = 3600
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -14,21 +14,38 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from django.contrib import admin
-from django.urls import path, include
+import re
+
+from django.apps import apps
+from django.urls import path, re_path, include
 from django.conf import settings
-from django.conf.urls.static import static
 from general.views import ImportantLinksListView, TeamMemberListView
-from technical_information.views import SyntheticEventsListView
+from technical_information.views import ArchivedSyntheticEventsListView, SyntheticEventsListView
+from core.views import BatchView, BootstrapView, ChangesView, HistoryView, JobMetricsView, SummaryView, live, ready, serve_media
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
     path('api/tools/', include('general.urls')),
     path('api/important-links/', ImportantLinksListView.as_view(), name='important-links'),
     path('api/team-members/', TeamMemberListView.as_view(), name='team-members'),
     path('api/testing-accounts/', include('technical_information.urls')),
     path('api/synthetic-events/', SyntheticEventsListView.as_view(), name='synthetic-events'),
+    path('api/synthetic-events/archive/', ArchivedSyntheticEventsListView.as_view(), name='archived-synthetic-events'),
+    path('api/changes/', ChangesView.as_view(), name='changes'),
+    path('api/bootstrap/', BootstrapView.as_view(), name='bootstrap'),
+    path('api/batch/', BatchView.as_view(), name='batch'),
+    path('api/summary/', SummaryView.as_view(), name='summary'),
+    path('api/history/<str:collection>/<int:object_id>/', HistoryView.as_view(), name='history'),
+    path('api/jobs/metrics/', JobMetricsView.as_view(), name='job-metrics'),
+    path('live', live, name='live'),
+    path('ready', ready, name='ready'),
 ]
 
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+if apps.is_installed('django.contrib.admin'):
+    from django.contrib import admin
+
+    urlpatterns += [path('admin/', admin.site.urls)]
+
+if settings.MEDIA_STORAGE == 'filesystem':
+    urlpatterns += [
+        re_path(r'^%s(?P<path>.+)$' % re.escape(settings.MEDIA_URL.lstrip('/')), serve_media, name='media'),
+    ]
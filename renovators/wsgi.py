@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'renovators.settings')
 
 application = get_wsgi_application()
+
+# Only server processes warm at boot; management commands never import this.
+from core import warmup  # noqa: E402
+
+warmup.start_on_boot()
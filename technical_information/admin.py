@@ -1,40 +1,95 @@
 from django.contrib import admin
+from core import audit, changelog, counters
+from core.admin import BoundedRelatedFieldListFilter, ScalableModelAdmin, move_action, update_selected
+from core.models import ChangeLogEntry
 from .models import (
     TestingAccountEnvironment, TestingAccount,
-    SyntheticEventTarget, SyntheticEventType, SyntheticEvent
+    SyntheticEventTarget, SyntheticEventType, SyntheticEvent, ArchivedSyntheticEvent
 )
 
 
 @admin.register(TestingAccountEnvironment)
-class TestingAccountEnvironmentAdmin(admin.ModelAdmin):
+class TestingAccountEnvironmentAdmin(ScalableModelAdmin):
     list_display = ('name',)
-    search_fields = ('name',)
+    search_fields = ('^name',)
 
 
 @admin.register(TestingAccount)
-class TestingAccountAdmin(admin.ModelAdmin):
+class TestingAccountAdmin(ScalableModelAdmin):
     list_display = ('label', 'username', 'environment', 'is_active')
-    list_filter = ('environment', 'is_active')
-    search_fields = ('label', 'username', 'description')
+    list_filter = (('environment', BoundedRelatedFieldListFilter), 'is_active')
+    search_fields = ('^label', '^username')
     list_select_related = ('environment',)
-    list_editable = ('is_active',)
+    autocomplete_fields = ('environment',)
+    actions = ['activate_accounts', 'deactivate_accounts', move_action('environment', 'Move selected to another environment')]
+
+    @admin.action(description='Activate selected testing accounts')
+    def activate_accounts(self, request, queryset):
+        updated = update_selected(queryset, is_active=True)
+        self.message_user(request, f"Activated {updated} testing accounts.")
+
+    @admin.action(description='Deactivate selected testing accounts')
+    def deactivate_accounts(self, request, queryset):
+        updated = update_selected(queryset, is_active=False)
+        self.message_user(request, f"Deactivated {updated} testing accounts.")
 
 
 @admin.register(SyntheticEventTarget)
-class SyntheticEventTargetAdmin(admin.ModelAdmin):
-    list_display = ('name',)
-    search_fields = ('name',)
+class SyntheticEventTargetAdmin(ScalableModelAdmin):
+    list_display = ('name', 'event_count')
+    search_fields = ('^name',)
 
 
 @admin.register(SyntheticEventType)
-class SyntheticEventTypeAdmin(admin.ModelAdmin):
+class SyntheticEventTypeAdmin(ScalableModelAdmin):
     list_display = ('name', 'description')
-    search_fields = ('name', 'description')
+    search_fields = ('^name',)
 
 
 @admin.register(SyntheticEvent)
-class SyntheticEventAdmin(admin.ModelAdmin):
-    list_display = ('name', 'event_type', 'target')
-    list_filter = ('event_type', 'target')
-    search_fields = ('name', 'description')
+class SyntheticEventAdmin(ScalableModelAdmin):
+    list_display = ('name', 'event_type', 'target', 'created_at', 'is_active')
+    list_filter = (('event_type', BoundedRelatedFieldListFilter), ('target', BoundedRelatedFieldListFilter), 'is_active')
+    search_fields = ('^name',)
     list_select_related = ('event_type', 'target')
+    autocomplete_fields = ('event_type', 'target')
+    actions = [
+        move_action('target', 'Move selected to another target'),
+        move_action('event_type', 'Move selected to another event type'),
+        'clone_events',
+    ]
+
+    @admin.action(description='Clone selected synthetic events')
+    def clone_events(self, request, queryset):
+        clones = SyntheticEvent.objects.bulk_create([
+            SyntheticEvent(
+                name=f"{event.name} (copy)",
+                description=event.description,
+                target_id=event.target_id,
+                event_type_id=event.event_type_id,
+                event_type_name=event.event_type_name,
+                # An inactive source stays inactive, so retention treats both alike.
+                is_active=event.is_active,
+            )
+            for event in queryset.select_related(None).only(
+                'name', 'description', 'target_id', 'event_type_id', 'event_type_name', 'is_active',
+            )
+        ])
+        changelog.record(SyntheticEvent, [clone.pk for clone in clones], ChangeLogEntry.INSERT)
+        audit.record_created(SyntheticEvent, clones)
+        counters.recount_parents(SyntheticEvent, [clone.pk for clone in clones])
+        self.message_user(request, f"Cloned {len(clones)} synthetic events.")
+
+
+@admin.register(ArchivedSyntheticEvent)
+class ArchivedSyntheticEventAdmin(ScalableModelAdmin):
+    list_display = ('name', 'event_type', 'target', 'created_at', 'archived_at')
+    list_filter = (('event_type', BoundedRelatedFieldListFilter), ('target', BoundedRelatedFieldListFilter))
+    search_fields = ('^name',)
+    list_select_related = ('event_type', 'target')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
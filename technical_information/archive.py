@@ -0,0 +1,65 @@
+"""
+Retention for synthetic events: events created more than
+SYNTHETIC_EVENT_RETENTION_DAYS ago, and inactive events, move from the live
+table to ArchivedSyntheticEvent.
+
+Expired rows are walked by primary key, and each batch of ARCHIVE_BATCH_SIZE
+rows is copied and deleted in its own short transaction, so the write lock is
+released between batches and concurrent writers only ever wait for one of
+them. Moving a row is not a user's delete: the batch is recorded in the change
+log once and its targets recounted once, with no per-row signal handling.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core import changelog, counters, signals
+from core.models import ChangeLogEntry
+from .models import ArchivedSyntheticEvent, SyntheticEvent
+
+ARCHIVED_FIELDS = [
+    'id', 'name', 'description', 'target_id', 'event_type_id', 'event_type_name', 'created_at', 'is_active',
+]
+
+
+def default_cutoff():
+    return timezone.now() - timedelta(days=settings.SYNTHETIC_EVENT_RETENTION_DAYS)
+
+
+def expired(cutoff=None):
+    """Live events the retention policy archives."""
+    cutoff = default_cutoff() if cutoff is None else cutoff
+    return SyntheticEvent.objects.filter(Q(created_at__lt=cutoff) | Q(is_active=False))
+
+
+def archive_batch(ids, archived_at):
+    with transaction.atomic():
+        rows = SyntheticEvent.objects.filter(pk__in=ids).order_by().values(*ARCHIVED_FIELDS)
+        ArchivedSyntheticEvent.objects.bulk_create([
+            ArchivedSyntheticEvent(archived_at=archived_at, **row) for row in rows
+        ])
+        with counters.recounting(SyntheticEvent, ids), signals.quiet_deletes(SyntheticEvent):
+            SyntheticEvent.objects.filter(pk__in=ids).delete()
+        changelog.record(SyntheticEvent, ids, ChangeLogEntry.DELETE)
+
+
+def archive_events(cutoff=None, batch_size=None, pause=0.0):
+    """Archive every expired event, one batch per transaction; return how many moved."""
+    batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+    queryset = expired(cutoff).order_by('pk').values_list('pk', flat=True)
+    archived_at = timezone.now()
+    moved, last_id = 0, 0
+    while True:
+        # Seek past the last batch instead of re-scanning from the start.
+        ids = list(queryset.filter(pk__gt=last_id)[:batch_size])
+        if not ids:
+            return moved
+        archive_batch(ids, archived_at)
+        moved += len(ids)
+        last_id = ids[-1]
+        if pause:
+            time.sleep(pause)
@@ -0,0 +1,32 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from technical_information import archive
+
+
+class Command(BaseCommand):
+    help = (
+        "Move synthetic events older than SYNTHETIC_EVENT_RETENTION_DAYS, and inactive "
+        "ones, to the archive table in small batches, one transaction each."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help="Retention in days (default: SYNTHETIC_EVENT_RETENTION_DAYS).")
+        parser.add_argument('--batch-size', type=int, help="Rows per transaction (default: ARCHIVE_BATCH_SIZE).")
+        parser.add_argument('--pause', type=float, default=0.0, help="Seconds to sleep between batches.")
+        parser.add_argument('--dry-run', action='store_true', help="Only report how many events would move.")
+
+    def handle(self, *args, **options):
+        if options['days'] is not None and options['days'] < 0:
+            raise CommandError("--days must not be negative.")
+        if options['batch_size'] is not None and options['batch_size'] < 1:
+            raise CommandError("--batch-size must be positive.")
+        cutoff = None if options['days'] is None else timezone.now() - timedelta(days=options['days'])
+
+        if options['dry_run']:
+            self.stdout.write(f"{archive.expired(cutoff).count()} synthetic events would be archived.")
+            return
+        moved = archive.archive_events(cutoff, options['batch_size'], options['pause'])
+        self.stdout.write(f"Archived {moved} synthetic events.")
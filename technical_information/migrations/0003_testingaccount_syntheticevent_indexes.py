@@ -0,0 +1,29 @@
+# Generated by Django 6.1.2 on 2026-10-19 05:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('technical_information', '0002_syntheticeventtarget_syntheticeventtype_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='syntheticevent',
+            index=models.Index(fields=['target', 'event_type'], name='syntheticevent_target_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='syntheticevent',
+            index=models.Index(fields=['name'], name='syntheticevent_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testingaccount',
+            index=models.Index(fields=['is_active', 'environment'], name='testingaccount_active_env_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testingaccount',
+            index=models.Index(fields=['label'], name='testingaccount_label_idx'),
+        ),
+    ]
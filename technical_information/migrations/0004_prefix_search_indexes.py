@@ -0,0 +1,26 @@
+# Generated by Django 6.1.2 on 2026-10-19 05:49
+
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('technical_information', '0003_testingaccount_syntheticevent_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='syntheticevent',
+            index=models.Index(django.db.models.functions.comparison.Collate('name', 'NOCASE'), name='syntheticevent_name_nocase_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testingaccount',
+            index=models.Index(django.db.models.functions.comparison.Collate('label', 'NOCASE'), name='testingacct_label_nocase_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testingaccount',
+            index=models.Index(django.db.models.functions.comparison.Collate('username', 'NOCASE'), name='testingacct_user_nocase_idx'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 6.1.2 on 2026-10-19 05:51
+
+import core.fields
+from core import crypto
+from django.db import migrations, models
+from django.db.models import Value
+
+
+def encrypt_passwords(apps, schema_editor):
+    TestingAccount = apps.get_model('technical_information', 'TestingAccount')
+    rows = TestingAccount.objects.values_list('pk', 'password')
+    for pk, password in rows.iterator():
+        # A plaintext can look like a token, so only one that decrypts counts.
+        if password is not None and not crypto.is_token(password):
+            TestingAccount.objects.filter(pk=pk).update(password=str(password))
+
+
+def decrypt_passwords(apps, schema_editor):
+    # Runs before the column goes back to CharField(max_length=100), which
+    # neither holds a token nor would let anything read one.
+    TestingAccount = apps.get_model('technical_information', 'TestingAccount')
+    rows = TestingAccount.objects.values_list('pk', 'password')
+    for pk, password in rows.iterator():
+        if password is not None and crypto.is_token(password):
+            # A plain Value skips the field's encryption on the way in.
+            TestingAccount.objects.filter(pk=pk).update(
+                password=Value(crypto.decrypt(password), output_field=models.CharField()),
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('technical_information', '0004_prefix_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='testingaccount',
+            name='password',
+            field=core.fields.EncryptedCharField(max_length=255),
+        ),
+        migrations.RunPython(encrypt_passwords, decrypt_passwords),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 6.1.2 on 2026-10-19 06:13
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_subquery(child_model, fk_name):
+    # Frozen here rather than imported from core.counters, so later changes
+    # to the live helper never change what this migration does.
+    counts = (
+        child_model._default_manager.filter(**{fk_name: OuterRef('pk')})
+        .order_by().values(fk_name).annotate(count=Count('pk')).values('count')
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+def count_events(apps, schema_editor):
+    SyntheticEvent = apps.get_model('technical_information', 'SyntheticEvent')
+    apps.get_model('technical_information', 'SyntheticEventTarget').objects.update(
+        event_count=count_subquery(SyntheticEvent, 'target'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('technical_information', '0005_encrypt_testingaccount_password'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='syntheticeventtarget',
+            name='event_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_events, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 6.1.2 on 2026-10-19 06:16
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('technical_information', '0006_syntheticeventtarget_event_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='syntheticevent',
+            name='created_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='syntheticevent',
+            name='is_active',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.CreateModel(
+            name='ArchivedSyntheticEvent',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=200)),
+                ('description', models.TextField()),
+                ('created_at', models.DateTimeField()),
+                ('is_active', models.BooleanField()),
+                ('archived_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('event_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_events', to='technical_information.syntheticeventtype')),
+                ('target', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_events', to='technical_information.syntheticeventtarget')),
+            ],
+            options={
+                'verbose_name_plural': 'Archived Synthetic Events',
+                'indexes': [models.Index(fields=['target', 'event_type'], name='archivedevent_target_type_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 6.1.2 on 2026-10-19 06:33
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def name_subquery(parent_model, source, outer_ref):
+    # Frozen here rather than imported from core.display, so later changes to
+    # the live module never change what this migration does.
+    return Subquery(parent_model._default_manager.filter(pk=OuterRef(outer_ref)).values(source)[:1])
+
+
+def copy_names(apps, schema_editor):
+    Environment = apps.get_model('technical_information', 'TestingAccountEnvironment')
+    EventType = apps.get_model('technical_information', 'SyntheticEventType')
+    apps.get_model('technical_information', 'TestingAccount').objects.update(
+        environment_name=name_subquery(Environment, 'name', 'environment_id'),
+    )
+    for model_name in ['SyntheticEvent', 'ArchivedSyntheticEvent']:
+        apps.get_model('technical_information', model_name).objects.update(
+            event_type_name=name_subquery(EventType, 'name', 'event_type_id'),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('technical_information', '0007_synthetic_event_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedsyntheticevent',
+            name='event_type_name',
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='syntheticevent',
+            name='event_type_name',
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='testingaccount',
+            name='environment_name',
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+        migrations.RunPython(copy_names, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,7 @@
 from django.db import models
+from django.db.models.functions import Collate
+from django.utils import timezone
+from core.fields import EncryptedCharField
 
 
 class TestingAccountEnvironment(models.Model):
@@ -15,19 +18,28 @@ class TestingAccount(models.Model):
     label = models.CharField(max_length=200)
     description = models.TextField()
     username = models.CharField(max_length=100)
-    password = models.CharField(max_length=100)
+    password = EncryptedCharField(max_length=255)
     environment = models.ForeignKey(TestingAccountEnvironment, on_delete=models.CASCADE, related_name='testing_accounts')
+    # Copy of environment.name, kept by core.display.
+    environment_name = models.CharField(max_length=100, blank=True, editable=False)
     is_active = models.BooleanField(default=True)
     
     def __str__(self):
-        return f"{self.label} ({self.environment.name})"
+        return f"{self.label} ({self.environment_name})"
     
     class Meta:
         verbose_name_plural = "Testing Accounts"
+        indexes = [
+            models.Index(fields=['is_active', 'environment'], name='testingaccount_active_env_idx'),
+            models.Index(fields=['label'], name='testingaccount_label_idx'),
+            models.Index(Collate('label', 'NOCASE'), name='testingacct_label_nocase_idx'),
+            models.Index(Collate('username', 'NOCASE'), name='testingacct_user_nocase_idx'),
+        ]
 
 
 class SyntheticEventTarget(models.Model):
     name = models.CharField(max_length=100)
+    event_count = models.PositiveIntegerField(default=0, editable=False)
     
     def __str__(self):
         return self.name
@@ -52,9 +64,40 @@ class SyntheticEvent(models.Model):
     description = models.TextField()
     target = models.ForeignKey(SyntheticEventTarget, on_delete=models.CASCADE, related_name='synthetic_events')
     event_type = models.ForeignKey(SyntheticEventType, on_delete=models.CASCADE, related_name='synthetic_events')
+    # Copy of event_type.name, kept by core.display.
+    event_type_name = models.CharField(max_length=100, blank=True, editable=False)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+    is_active = models.BooleanField(default=True)
     
     def __str__(self):
-        return f"{self.name} ({self.event_type.name})"
+        return f"{self.name} ({self.event_type_name})"
     
     class Meta:
         verbose_name_plural = "Synthetic Events"
+        indexes = [
+            models.Index(fields=['target', 'event_type'], name='syntheticevent_target_type_idx'),
+            models.Index(fields=['name'], name='syntheticevent_name_idx'),
+            models.Index(Collate('name', 'NOCASE'), name='syntheticevent_name_nocase_idx'),
+        ]
+
+
+class ArchivedSyntheticEvent(models.Model):
+    # Keeps the id the event had in the live table.
+    id = models.BigIntegerField(primary_key=True)
+    name = models.CharField(max_length=200)
+    description = models.TextField()
+    target = models.ForeignKey(SyntheticEventTarget, on_delete=models.CASCADE, related_name='archived_events')
+    event_type = models.ForeignKey(SyntheticEventType, on_delete=models.CASCADE, related_name='archived_events')
+    event_type_name = models.CharField(max_length=100, blank=True, editable=False)
+    created_at = models.DateTimeField()
+    is_active = models.BooleanField()
+    archived_at = models.DateTimeField(default=timezone.now, db_index=True)
+    
+    def __str__(self):
+        return f"{self.name} ({self.event_type_name})"
+    
+    class Meta:
+        verbose_name_plural = "Archived Synthetic Events"
+        indexes = [
+            models.Index(fields=['target', 'event_type'], name='archivedevent_target_type_idx'),
+        ]
@@ -1,7 +1,8 @@
 from rest_framework import serializers
+from core.fields import decrypt_instances
 from .models import (
     TestingAccountEnvironment, TestingAccount,
-    SyntheticEventTarget, SyntheticEventType, SyntheticEvent
+    SyntheticEventTarget, SyntheticEventType, SyntheticEvent, ArchivedSyntheticEvent
 )
 
 
@@ -11,12 +12,20 @@ class TestingAccountEnvironmentSerializer(serializers.ModelSerializer):
         fields = ['id', 'name']
 
 
+class TestingAccountListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        accounts = list(data.all() if hasattr(data, 'all') else data)
+        decrypt_instances(accounts, 'password')
+        return super().to_representation(accounts)
+
+
 class TestingAccountSerializer(serializers.ModelSerializer):
     environment = TestingAccountEnvironmentSerializer(read_only=True)
     
     class Meta:
         model = TestingAccount
         fields = ['id', 'label', 'description', 'username', 'password', 'environment', 'is_active']
+        list_serializer_class = TestingAccountListSerializer
 
 
 class TestingAccountEnvironmentWithAccountsSerializer(serializers.ModelSerializer):
@@ -45,4 +54,13 @@ class SyntheticEventSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = SyntheticEvent
-        fields = ['id', 'name', 'description', 'target', 'event_type']
\ No newline at end of file
+        fields = ['id', 'name', 'description', 'target', 'event_type']
+
+
+class ArchivedSyntheticEventSerializer(serializers.ModelSerializer):
+    target = SyntheticEventTargetSerializer(read_only=True)
+    event_type = SyntheticEventTypeSerializer(read_only=True)
+    
+    class Meta:
+        model = ArchivedSyntheticEvent
+        fields = ['id', 'name', 'description', 'target', 'event_type', 'created_at', 'is_active', 'archived_at']
@@ -0,0 +1,12 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from core.jobs import task
+from . import archive
+
+
+@task
+def archive_synthetic_events(days=None, batch_size=None):
+    cutoff = None if days is None else timezone.now() - timedelta(days=days)
+    return archive.archive_events(cutoff, batch_size)
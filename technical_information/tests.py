@@ -1,10 +1,22 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.contrib.auth.models import User
+from django.db import connection
+from django.core.management import call_command
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework.test import APITestCase
 from rest_framework import status
+from core import changelog, crypto
+from core.models import ChangeLogEntry
+from . import archive
 from .models import (
     TestingAccountEnvironment, TestingAccount,
-    SyntheticEventTarget, SyntheticEventType, SyntheticEvent
+    SyntheticEventTarget, SyntheticEventType, SyntheticEvent, ArchivedSyntheticEvent
 )
 from .serializers import (
     TestingAccountSerializer, TestingAccountEnvironmentSerializer, TestingAccountEnvironmentWithAccountsSerializer,
@@ -274,6 +286,29 @@ class ActiveTestingAccountsAPITest(APITestCase):
         self.assertEqual(len(response.data), 0)
         self.assertEqual(response.data, [])
 
+    def test_active_testing_accounts_api_filter_by_environment(self):
+        url = reverse('active-testing-accounts')
+        response = self.client.get(url, {'environment': self.env1.id})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([account['label'] for account in response.data], ['Active Dev Account'])
+
+    def test_active_testing_accounts_api_ordering(self):
+        url = reverse('active-testing-accounts')
+        response = self.client.get(url, {'ordering': '-label'})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [account['label'] for account in response.data],
+            ['Active Staging Account', 'Active Dev Account']
+        )
+
+    def test_active_testing_accounts_api_rejects_unknown_ordering(self):
+        url = reverse('active-testing-accounts')
+        response = self.client.get(url, {'ordering': 'password'})
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
 
 class SyntheticEventTargetModelTest(TestCase):
     def setUp(self):
@@ -553,3 +588,407 @@ class SyntheticEventsAPITest(APITestCase):
         
         type2_events = [event for event in response.data if event['event_type']['id'] == self.type2.id]
         self.assertEqual(len(type2_events), 2)
+
+    def test_synthetic_events_api_filter_by_target(self):
+        url = reverse('synthetic-events')
+        response = self.client.get(url, {'target': self.target1.id})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 2)
+        self.assertTrue(all(event['target']['id'] == self.target1.id for event in response.data))
+
+    def test_synthetic_events_api_filter_by_target_and_event_type(self):
+        url = reverse('synthetic-events')
+        response = self.client.get(url, {'target': self.target1.id, 'event_type': self.type2.id})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([event['name'] for event in response.data], ['Homepage Navigation Test'])
+
+    def test_synthetic_events_api_ordering(self):
+        url = reverse('synthetic-events')
+        response = self.client.get(url, {'ordering': 'name'})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [event['name'] for event in response.data],
+            ['Homepage Load Test', 'Homepage Navigation Test', 'Search Functionality Test']
+        )
+
+    def test_synthetic_events_api_rejects_invalid_filter(self):
+        url = reverse('synthetic-events')
+        response = self.client.get(url, {'target': 'homepage'})
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('target', response.data)
+
+    def test_synthetic_events_api_rejects_out_of_range_ids(self):
+        url = reverse('synthetic-events')
+        for value in ['99999999999999999999999', f'1,{2 ** 63}', '0', '-1']:
+            response = self.client.get(url, {'target': value})
+            
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, value)
+            self.assertIn('target', response.data)
+        
+        batch = self.client.post(reverse('batch'), {'requests': [f'{url}?target=99999999999999999999999']}, format='json')
+        
+        self.assertEqual(batch.data['responses'][0]['status'], 400)
+
+
+class TestingAccountAdminActionsTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.force_login(self.user)
+        self.env1 = TestingAccountEnvironment.objects.create(name="Development")
+        self.env2 = TestingAccountEnvironment.objects.create(name="Staging")
+        self.accounts = [
+            TestingAccount.objects.create(
+                label=f'Account {index}', description='Account', username=f'user{index}',
+                password='pass', environment=self.env1, is_active=False
+            )
+            for index in range(3)
+        ]
+        self.url = reverse('admin:technical_information_testingaccount_changelist')
+
+    def post_action(self, action, accounts, **extra):
+        data = {'action': action, ACTION_CHECKBOX_NAME: [account.pk for account in accounts], **extra}
+        return self.client.post(self.url, data)
+
+    def test_activate_is_a_single_update(self):
+        version = changelog.current_version()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post_action('activate_accounts', self.accounts[:2])
+        
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(TestingAccount.objects.filter(is_active=True).count(), 2)
+        updates = [query for query in queries if query['sql'].startswith('UPDATE "technical_information_testingaccount"')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(
+            ChangeLogEntry.objects.filter(id__gt=version, collection='testing-accounts').count(), 2
+        )
+
+    def test_deactivate(self):
+        TestingAccount.objects.update(is_active=True)
+        self.post_action('deactivate_accounts', self.accounts)
+        
+        self.assertFalse(TestingAccount.objects.filter(is_active=True).exists())
+
+    def test_move_shows_intermediate_page(self):
+        response = self.post_action('move_to_environment', self.accounts)
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'admin/core/move_selected.html')
+        self.assertContains(response, 'admin-autocomplete')
+
+    def test_move_to_environment(self):
+        response = self.post_action('move_to_environment', self.accounts[:2], apply='yes', destination=self.env2.pk)
+        
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(
+            list(TestingAccount.objects.filter(environment=self.env2).order_by('pk')),
+            self.accounts[:2]
+        )
+
+
+class SyntheticEventAdminActionsTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.force_login(self.user)
+        self.target1 = SyntheticEventTarget.objects.create(name="Homepage")
+        self.target2 = SyntheticEventTarget.objects.create(name="Search Page")
+        self.event_type = SyntheticEventType.objects.create(name="Smoke Test", description="Basic checks")
+        self.event = SyntheticEvent.objects.create(
+            name="Homepage Load", description="Load test", target=self.target1, event_type=self.event_type
+        )
+        self.url = reverse('admin:technical_information_syntheticevent_changelist')
+
+    def test_clone_events(self):
+        version = changelog.current_version()
+        response = self.client.post(self.url, {'action': 'clone_events', ACTION_CHECKBOX_NAME: [self.event.pk]})
+        
+        self.assertEqual(response.status_code, 302)
+        clone = SyntheticEvent.objects.exclude(pk=self.event.pk).get()
+        self.assertEqual(clone.name, "Homepage Load (copy)")
+        self.assertEqual(clone.target, self.target1)
+        entry = ChangeLogEntry.objects.get(id__gt=version, collection='synthetic-events')
+        self.assertEqual((entry.object_id, entry.action), (clone.pk, 'insert'))
+        self.target1.refresh_from_db()
+        self.assertEqual(self.target1.event_count, 2)
+
+    def test_clones_keep_is_active(self):
+        SyntheticEvent.objects.filter(pk=self.event.pk).update(is_active=False)
+        self.client.post(self.url, {'action': 'clone_events', ACTION_CHECKBOX_NAME: [self.event.pk]})
+        
+        self.assertFalse(SyntheticEvent.objects.get(name="Homepage Load (copy)").is_active)
+
+    def test_move_to_target(self):
+        self.client.post(self.url, {
+            'action': 'move_to_target', ACTION_CHECKBOX_NAME: [self.event.pk],
+            'apply': 'yes', 'destination': self.target2.pk,
+        })
+        
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.target, self.target2)
+        self.assertEqual(
+            list(SyntheticEventTarget.objects.order_by('pk').values_list('event_count', flat=True)), [0, 1]
+        )
+
+
+class TestingAccountPasswordEncryptionTest(APITestCase):
+    def setUp(self):
+        self.environment = TestingAccountEnvironment.objects.create(name="Staging")
+        self.account = TestingAccount.objects.create(
+            label='Staging Account', description='Staging account', username='stageuser',
+            password='stagepass123', environment=self.environment
+        )
+
+    def stored_password(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT password FROM technical_information_testingaccount WHERE id = %s', [self.account.id]
+            )
+            return cursor.fetchone()[0]
+
+    def test_password_is_encrypted_at_rest(self):
+        stored = self.stored_password()
+        
+        self.assertNotIn('stagepass123', stored)
+        self.assertTrue(stored.startswith('gAAAAA'))
+
+    def test_password_is_decrypted_on_read(self):
+        self.assertEqual(TestingAccount.objects.get(pk=self.account.pk).password, 'stagepass123')
+
+    def test_resave_without_reading_keeps_password(self):
+        account = TestingAccount.objects.get(pk=self.account.pk)
+        account.label = 'Renamed'
+        account.save()
+        
+        self.assertEqual(TestingAccount.objects.get(pk=self.account.pk).password, 'stagepass123')
+
+    def test_list_endpoint_decrypts_in_one_batch(self):
+        TestingAccount.objects.create(
+            label='Second Account', description='Second account', username='second',
+            password='secondpass', environment=self.environment
+        )
+        
+        with mock.patch('core.crypto.decrypt_many', wraps=crypto.decrypt_many) as decrypt_many:
+            response = self.client.get(reverse('active-testing-accounts'))
+        
+        self.assertEqual(decrypt_many.call_count, 1)
+        self.assertEqual(len(decrypt_many.call_args.args[0]), 2)
+        self.assertEqual(
+            sorted(account['password'] for account in response.data),
+            ['secondpass', 'stagepass123']
+        )
+
+    def test_plaintext_that_looks_like_a_token(self):
+        self.account.password = 'gAAAAAlookalike'
+        self.account.save()
+        stored = TestingAccount.objects.filter(pk=self.account.pk).values_list('password', flat=True).get()
+        
+        self.assertFalse(crypto.is_token('gAAAAAlookalike'))
+        self.assertTrue(crypto.is_token(stored))
+        self.assertEqual(TestingAccount.objects.get(pk=self.account.pk).password, 'gAAAAAlookalike')
+
+    def test_key_is_derived_once(self):
+        crypto.get_fernet.cache_clear()
+        
+        with mock.patch('core.crypto.PBKDF2HMAC', wraps=crypto.PBKDF2HMAC) as kdf:
+            for _ in range(3):
+                TestingAccount.objects.get(pk=self.account.pk).password
+        
+        self.assertEqual(kdf.call_count, 1)
+
+
+class SyntheticEventArchiveTest(APITestCase):
+    def setUp(self):
+        self.target1 = SyntheticEventTarget.objects.create(name="Homepage")
+        self.target2 = SyntheticEventTarget.objects.create(name="Search Page")
+        self.event_type = SyntheticEventType.objects.create(name="Smoke Test", description="Basic checks")
+        old = timezone.now() - timedelta(days=400)
+        self.old_events = [
+            SyntheticEvent.objects.create(
+                name=f"Old {index}", description="Old", target=self.target1,
+                event_type=self.event_type, created_at=old
+            )
+            for index in range(3)
+        ]
+        self.inactive = SyntheticEvent.objects.create(
+            name="Retired", description="Retired", target=self.target2, event_type=self.event_type, is_active=False
+        )
+        self.current = SyntheticEvent.objects.create(
+            name="Current", description="Current", target=self.target2, event_type=self.event_type
+        )
+
+    def test_archives_old_and_inactive_events(self):
+        moved = archive.archive_events()
+        
+        self.assertEqual(moved, 4)
+        self.assertEqual(list(SyntheticEvent.objects.all()), [self.current])
+        archived = ArchivedSyntheticEvent.objects.order_by('pk')
+        self.assertEqual(
+            [event.pk for event in archived],
+            [event.pk for event in self.old_events] + [self.inactive.pk]
+        )
+        self.assertEqual(archived[0].name, "Old 0")
+        self.assertEqual(archived[0].created_at, self.old_events[0].created_at)
+        self.assertFalse(archived[3].is_active)
+
+    def test_one_transaction_per_batch(self):
+        with mock.patch('technical_information.archive.archive_batch', wraps=archive.archive_batch) as archive_batch:
+            archive.archive_events(batch_size=3)
+        
+        self.assertEqual([len(call.args[0]) for call in archive_batch.call_args_list], [3, 1])
+
+    def test_batches_seek_past_the_last_one(self):
+        with CaptureQueriesContext(connection) as queries:
+            archive.archive_events(batch_size=3)
+        
+        seeks = [query['sql'] for query in queries if query['sql'].startswith('SELECT "technical_information_syntheticevent"."id" AS "pk"')]
+        self.assertEqual(len(seeks), 3)
+        self.assertIn(f'"id" > {self.old_events[2].pk}', seeks[1])
+
+    def test_later_deletes_are_still_recorded(self):
+        archive.archive_events()
+        version = changelog.current_version()
+        SyntheticEvent.objects.get(pk=self.current.pk).delete()
+        
+        self.assertTrue(ChangeLogEntry.objects.filter(id__gt=version, object_id=self.current.pk).exists())
+        self.assertEqual(SyntheticEventTarget.objects.get(pk=self.target2.pk).event_count, 0)
+
+    def test_records_deletes_and_recounts_targets(self):
+        version = changelog.current_version()
+        archive.archive_events()
+        
+        deleted = ChangeLogEntry.objects.filter(id__gt=version, collection='synthetic-events')
+        self.assertEqual(
+            sorted(deleted.values_list('object_id', flat=True)),
+            sorted(event.pk for event in self.old_events + [self.inactive])
+        )
+        self.assertEqual(set(deleted.values_list('action', flat=True)), {'delete'})
+        self.assertEqual(
+            list(SyntheticEventTarget.objects.order_by('pk').values_list('event_count', flat=True)), [0, 1]
+        )
+
+    def test_command(self):
+        out = StringIO()
+        call_command('archive_events', '--dry-run', stdout=out)
+        self.assertIn('4 synthetic events would be archived', out.getvalue())
+        self.assertEqual(ArchivedSyntheticEvent.objects.count(), 0)
+        
+        call_command('archive_events', '--days', '0', '--batch-size', '2', stdout=out)
+        self.assertIn('Archived 5 synthetic events', out.getvalue())
+        self.assertFalse(SyntheticEvent.objects.exists())
+
+    def test_archive_endpoint(self):
+        archive.archive_events()
+        
+        response = self.client.get(reverse('archived-synthetic-events'), {'target': self.target1.id, 'page_size': 2})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([event['name'] for event in response.data['results']], ['Old 2', 'Old 1'])
+        self.assertEqual(response.data['results'][0]['target']['name'], 'Homepage')
+        self.assertIn('archived_at', response.data['results'][0])
+        
+        response = self.client.get(response.data['next'])
+        self.assertEqual([event['name'] for event in response.data['results']], ['Old 0'])
+        self.assertIsNone(response.data['next'])
+
+    def test_live_endpoint_excludes_archived_events(self):
+        archive.archive_events()
+        
+        response = self.client.get(reverse('synthetic-events'))
+        
+        self.assertEqual([event['name'] for event in response.data], ['Current'])
+
+
+class DisplayNameTest(TestCase):
+    def setUp(self):
+        self.development = TestingAccountEnvironment.objects.create(name="Development")
+        self.staging = TestingAccountEnvironment.objects.create(name="Staging")
+        self.smoke = SyntheticEventType.objects.create(name="Smoke Test", description="Basic checks")
+        self.load = SyntheticEventType.objects.create(name="Load Test", description="Heavy traffic")
+        self.target = SyntheticEventTarget.objects.create(name="Homepage")
+        for index in range(3):
+            TestingAccount.objects.create(
+                label=f'Account {index}', description='Account', username=f'user{index}',
+                password='pass', environment=self.development,
+            )
+            SyntheticEvent.objects.create(
+                name=f"Event {index}", description="Event", target=self.target, event_type=self.smoke,
+            )
+
+    def test_str_of_a_list_needs_no_extra_queries(self):
+        accounts = list(TestingAccount.objects.order_by('pk'))
+        events = list(SyntheticEvent.objects.order_by('pk'))
+        
+        with self.assertNumQueries(0):
+            self.assertEqual([str(account) for account in accounts][0], "Account 0 (Development)")
+            self.assertEqual({str(event) for event in events}, {f"Event {index} (Smoke Test)" for index in range(3)})
+
+    def test_saving_with_a_loaded_foreign_key_reads_nothing(self):
+        account = TestingAccount.objects.first()
+        account.environment = self.staging
+        
+        with CaptureQueriesContext(connection) as queries:
+            account.save()
+        
+        self.assertFalse([query for query in queries if 'testingaccountenvironment' in query['sql']])
+        self.assertEqual(TestingAccount.objects.get(pk=account.pk).environment_name, "Staging")
+
+    def test_saving_a_bare_foreign_key_id(self):
+        event = SyntheticEvent.objects.first()
+        event.event_type_id = self.load.pk
+        event.save()
+        
+        self.assertEqual(str(SyntheticEvent.objects.get(pk=event.pk)), f"{event.name} (Load Test)")
+
+    def test_saving_only_the_foreign_key_writes_the_copy(self):
+        account = TestingAccount.objects.first()
+        account.environment = self.staging
+        account.save(update_fields=['environment'])
+        event = SyntheticEvent.objects.first()
+        event.event_type_id = self.load.pk
+        event.save(update_fields=['event_type', 'event_type_name'])
+        
+        self.assertEqual(TestingAccount.objects.get(pk=account.pk).environment_name, "Staging")
+        self.assertEqual(SyntheticEvent.objects.get(pk=event.pk).event_type_name, "Load Test")
+
+    def test_renaming_the_parent_updates_its_children(self):
+        version = changelog.current_version()
+        self.development.name = "Dev"
+        self.development.save()
+        
+        self.assertEqual(set(TestingAccount.objects.values_list('environment_name', flat=True)), {"Dev"})
+        self.assertEqual(
+            ChangeLogEntry.objects.filter(id__gt=version, collection='testing-accounts').count(), 3
+        )
+        
+        with CaptureQueriesContext(connection) as queries:
+            self.smoke.save(update_fields=['description'])
+            self.staging.save(update_fields=['name'])
+        
+        # Only the rename looks for stale copies, and finds none to update.
+        children = [query['sql'] for query in queries if 'FROM "technical_information_testingaccount"' in query['sql']]
+        self.assertEqual(len(children), 1)
+        self.assertFalse([query for query in queries if query['sql'].startswith('UPDATE "technical_information_syntheticevent"')])
+
+    def test_admin_move_updates_the_copy(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+        events = list(SyntheticEvent.objects.order_by('pk')[:2])
+        self.client.post(reverse('admin:technical_information_syntheticevent_changelist'), {
+            'action': 'move_to_event_type', ACTION_CHECKBOX_NAME: [event.pk for event in events],
+            'apply': 'yes', 'destination': self.load.pk,
+        })
+        
+        self.assertEqual(
+            list(SyntheticEvent.objects.order_by('pk').values_list('event_type_name', flat=True)),
+            ["Load Test", "Load Test", "Smoke Test"],
+        )
+
+    def test_archived_events_keep_the_name(self):
+        SyntheticEvent.objects.update(is_active=False)
+        archive.archive_events()
+        
+        with self.assertNumQueries(1):
+            names = [str(event) for event in ArchivedSyntheticEvent.objects.order_by('pk')]
+        self.assertEqual(names[0], "Event 0 (Smoke Test)")
@@ -1,13 +1,37 @@
 from rest_framework import generics
-from .models import TestingAccount, SyntheticEvent
-from .serializers import TestingAccountSerializer, SyntheticEventSerializer
+from rest_framework.pagination import CursorPagination
+from core.filters import AllowListFilter, AllowListOrderingFilter
+from .models import TestingAccount, SyntheticEvent, ArchivedSyntheticEvent
+from .serializers import TestingAccountSerializer, SyntheticEventSerializer, ArchivedSyntheticEventSerializer
 
 
 class ActiveTestingAccountsListView(generics.ListAPIView):
     queryset = TestingAccount.objects.filter(is_active=True).select_related('environment')
     serializer_class = TestingAccountSerializer
+    filter_backends = [AllowListFilter, AllowListOrderingFilter]
+    filter_params = {'environment': 'environment_id'}
+    ordering_fields = ['id', 'label', 'username']
 
 
 class SyntheticEventsListView(generics.ListAPIView):
     queryset = SyntheticEvent.objects.select_related('event_type', 'target').all()
     serializer_class = SyntheticEventSerializer
+    filter_backends = [AllowListFilter, AllowListOrderingFilter]
+    filter_params = {'target': 'target_id', 'event_type': 'event_type_id'}
+    ordering_fields = ['id', 'name']
+
+
+class ArchivePagination(CursorPagination):
+    ordering = '-id'
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+
+class ArchivedSyntheticEventsListView(generics.ListAPIView):
+    # The archive only grows, so it is paged by cursor, newest events first.
+    queryset = ArchivedSyntheticEvent.objects.select_related('event_type', 'target')
+    serializer_class = ArchivedSyntheticEventSerializer
+    filter_backends = [AllowListFilter]
+    filter_params = {'target': 'target_id', 'event_type': 'event_type_id'}
+    pagination_class = ArchivePagination